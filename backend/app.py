@@ -1,7 +1,9 @@
 # app.py
+import time
+IMPORT_STARTED_AT = time.monotonic()
 
 print("[DEBUG] Starting import: Flask")
-from flask import Flask, request, jsonify, send_from_directory, render_template, redirect, url_for, flash, session
+from flask import Flask, request, jsonify, send_from_directory, render_template, redirect, url_for, flash, session, Response, stream_with_context
 print("[DEBUG] Imported Flask")
 
 print("[DEBUG] Starting import: Flask-Cors")
@@ -46,8 +48,17 @@ except Exception as e:
 
 print("[DEBUG] Starting import: json")
 import json
+from urllib.parse import quote
 print("[DEBUG] Imported json")
 
+try:
+    print("[DEBUG] Starting import: numpy")
+    import numpy as np
+    print("[DEBUG] Imported numpy")
+except Exception as e:
+    print(f"[ERROR] Failed to import numpy: {e}")
+    raise
+
 print("[DEBUG] Starting import: typing")
 from typing import Dict, List, Optional, Any
 print("[DEBUG] Imported typing")
@@ -82,10 +93,48 @@ except Exception as e:
 
 print("[DEBUG] Starting import: requests")
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 print("[DEBUG] Imported requests")
 
+print("[DEBUG] Starting import: threading")
+import threading
+import time
+print("[DEBUG] Imported threading")
+
+try:
+    print("[DEBUG] Starting import: fcntl")
+    import fcntl
+    print("[DEBUG] Imported fcntl")
+except ImportError:
+    print("[WARNING] fcntl not available, file locks disabled")
+    fcntl = None
+
+print("[DEBUG] Starting import: uuid")
+import uuid
+import copy
+import abc
+print("[DEBUG] Imported uuid")
+
+print("[DEBUG] Starting import: hashlib")
+import hashlib
+print("[DEBUG] Imported hashlib")
+
+print("[DEBUG] Starting import: sqlite3")
+import sqlite3
+import struct
+import mmap
+import random
+from contextlib import closing
+from collections.abc import Sequence
+print("[DEBUG] Imported sqlite3")
+
+print("[DEBUG] Starting import: concurrent.futures")
+from concurrent.futures import ThreadPoolExecutor
+print("[DEBUG] Imported concurrent.futures")
+
 print("[DEBUG] Starting import: functools")
-from functools import wraps
+from functools import wraps, cached_property
 print("[DEBUG] Imported functools")
 
 try:
@@ -106,88 +155,302 @@ print("[DEBUG] Loaded environment variables from .env")
 logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-print("[DEBUG] Starting Google Sheets Auth scope definition")
+# Shared HTTP client layer
+# Outbound calls go through long-lived sessions so connections (and TLS) are
+# reused, every request has a timeout, transient failures are retried with
+# jittered backoff, and a circuit breaker makes calls fail fast for a while once
+# an upstream keeps failing instead of tying up workers waiting on it.
+ELEVENLABS_TIMEOUT = (3.05, float(os.getenv("ELEVENLABS_TIMEOUT", "20")))
+SHEETS_TIMEOUT = (3.05, float(os.getenv("SHEETS_TIMEOUT", "30")))
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures; lets one trial call through after reset_timeout."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def check(self):
+        """Raise CircuitOpenError if calls to the upstream should fail fast."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.error(f"Circuit breaker for {self.name} opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+
+def mount_retry_adapter(http_session: requests.Session, retries: int = 2, pool_size: int = 10,
+                        allowed_methods: Optional[frozenset] = None) -> requests.Session:
+    """Give a session pooled keep-alive connections and bounded, jittered retries."""
+    retry_options = dict(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=allowed_methods or Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    try:
+        retry = Retry(backoff_jitter=0.5, **retry_options)
+    except TypeError:
+        # urllib3 < 2 has no backoff_jitter
+        retry = Retry(**retry_options)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    http_session.mount("https://", adapter)
+    http_session.mount("http://", adapter)
+    return http_session
+
+elevenlabs_session = mount_retry_adapter(requests.Session(), allowed_methods=frozenset(["POST"]))
+elevenlabs_breaker = CircuitBreaker("ElevenLabs")
+sheets_breaker = CircuitBreaker("Google Sheets")
+
+class SheetsClient(gspread.Client):
+    """gspread client with pooled retrying connections, timeouts and a circuit breaker"""
+
+    def __init__(self, auth, http_session=None):
+        super().__init__(auth, http_session)
+        mount_retry_adapter(self.session)
+        self.set_timeout(SHEETS_TIMEOUT)
+
+    def request(self, *args, **kwargs):
+        sheets_breaker.check()
+        try:
+            response = super().request(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            # Client errors (bad range, permissions) say nothing about the upstream's health
+            if e.response.status_code in HTTP_RETRY_STATUSES:
+                sheets_breaker.record_failure()
+            else:
+                sheets_breaker.record_success()
+            raise
+        except Exception:
+            # Anything else (timeouts, decode errors) must still end a half-open trial
+            sheets_breaker.record_failure()
+            raise
+        sheets_breaker.record_success()
+        return response
+
+# Lazy service clients
+# Connecting to Google Sheets (OAuth plus opening the spreadsheet) and building
+# the Claude client used to happen at import, before a worker could answer
+# anything. Each client is now created on first use instead, behind a lock so
+# concurrent requests connect once. A failed connection is retried on use after
+# CLIENT_RETRY_INTERVAL seconds rather than leaving the service off until restart.
+# warm_up() (run by gunicorn after a worker starts, see gunicorn.conf.py) connects
+# them in the background and loads the stats snapshot; /ready reports when it's done.
+CLIENT_RETRY_INTERVAL = float(os.getenv("CLIENT_RETRY_INTERVAL", "60"))
+
+class LazyClient:
+    """Proxy to a client built by factory on first attribute access.
+
+    Truthy while the service is configured and hasn't just failed to connect,
+    so `if sheet:` style checks keep working without connecting.
+    """
+
+    def __init__(self, name: str, factory, configured: bool):
+        self.name = name
+        self.configured = configured
+        self._factory = factory
+        self._client = None
+        self._error = None
+        self._failed_at = None
+        self._lock = threading.Lock()
+
+    def _retry_due(self) -> bool:
+        return self._failed_at is None or time.monotonic() - self._failed_at >= CLIENT_RETRY_INTERVAL
+
+    def get(self):
+        """The connected client, connecting now if needed."""
+        client = self._client
+        if client is not None:
+            return client
+        with self._lock:
+            if self._client is None:
+                if not self.configured:
+                    raise RuntimeError(f"{self.name} is not configured")
+                if not self._retry_due():
+                    raise RuntimeError(f"{self.name} is unavailable: {self._error}")
+                started = time.monotonic()
+                try:
+                    self._client = self._factory()
+                except Exception as e:
+                    self._error = str(e)
+                    self._failed_at = time.monotonic()
+                    logger.error(f"Failed to initialize {self.name}: {e}")
+                    raise
+                self._error = None
+                self._failed_at = None
+                logger.info(f"{self.name} initialized in {time.monotonic() - started:.2f}s")
+            return self._client
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __bool__(self) -> bool:
+        return self.configured and (self._client is not None or self._retry_due())
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None
+
+    def status(self) -> str:
+        if not self.configured:
+            return "not_configured"
+        if self._client is not None:
+            return "connected"
+        return "failed" if self._error else "pending"
+
 scope = [
     "https://spreadsheets.google.com/feeds",
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive.file",
     "https://www.googleapis.com/auth/drive"
 ]
-print("[DEBUG] Finished Google Sheets Auth scope definition")
 
-print("[DEBUG] Starting Google Sheets client initialization")
-# Initialize Google Sheets client
-try:
-    # First try to load from environment variable (for Railway)
+def open_stats_sheet():
+    """Authorize with Google and open the Stats worksheet"""
+    # Environment variable first (for Railway), then credentials.json (for local development)
     credentials_json = os.getenv("GOOGLE_SHEETS_CREDENTIALS")
     if credentials_json:
-        try:
-            import json
-            # Clean the JSON string - remove any extra whitespace or newlines
-            credentials_json = credentials_json.strip()
-            creds_dict = json.loads(credentials_json)
-            creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-            client = gspread.authorize(creds)
-            sheet = client.open("Stats").sheet1
-            logger.info("Google Sheets initialized successfully from environment variable")
-            print("[DEBUG] Google Sheets initialized from environment variable")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in GOOGLE_SHEETS_CREDENTIALS: {e}")
-            print(f"[ERROR] Invalid JSON in GOOGLE_SHEETS_CREDENTIALS: {e}")
-            sheet = None
-        except Exception as e:
-            logger.error(f"Failed to initialize Google Sheets from environment variable: {e}")
-            print(f"[ERROR] Failed to initialize Google Sheets from environment variable: {e}")
-            sheet = None
-    # Fallback to file (for local development)
-    elif os.path.exists("credentials.json"):
-        creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-        client = gspread.authorize(creds)
-        sheet = client.open("Stats").sheet1
-        logger.info("Google Sheets initialized successfully from file")
-        print("[DEBUG] Google Sheets initialized from file")
+        creds = ServiceAccountCredentials.from_json_keyfile_dict(json.loads(credentials_json.strip()), scope)
     else:
-        logger.warning("No Google Sheets credentials found - Google Sheets functionality disabled")
-        print("[WARNING] No Google Sheets credentials found")
-        sheet = None
-except Exception as e:
-    logger.error(f"Failed to initialize Google Sheets: {e}")
-    print(f"[ERROR] Failed to initialize Google Sheets: {e}")
-    sheet = None
-print("[DEBUG] Finished Google Sheets client initialization")
+        creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
+    client = gspread.authorize(creds, client_factory=SheetsClient)
+    return client.open("Stats").sheet1
 
-print("[DEBUG] Starting Claude setup")
-# Claude setup
-try:
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if api_key:
-        # Clear proxy environment variables that might interfere
-        # Railway often injects these, causing issues with some clients
-        original_http_proxy = os.environ.pop('HTTP_PROXY', None)
-        original_https_proxy = os.environ.pop('HTTPS_PROXY', None)
-        original_no_proxy = os.environ.pop('NO_PROXY', None)
-    
+def create_claude_client():
+    """Anthropic client, built with any injected proxy variables cleared"""
+    # Railway often injects these, causing issues with some clients
+    saved_proxies = {name: os.environ.pop(name) for name in ('HTTP_PROXY', 'HTTPS_PROXY', 'NO_PROXY') if name in os.environ}
+    try:
         from anthropic import Client
-        claude = Client(api_key=api_key)
-        logger.info("Claude initialized successfully")
-        print("[DEBUG] Claude initialized successfully")
-    
-        # Restore proxy environment variables if they existed
-        if original_http_proxy is not None:
-            os.environ['HTTP_PROXY'] = original_http_proxy
-        if original_https_proxy is not None:
-            os.environ['HTTPS_PROXY'] = original_https_proxy
-        if original_no_proxy is not None:
-            os.environ['NO_PROXY'] = original_no_proxy
-    else:
-        logger.warning("ANTHROPIC_API_KEY not found in environment variables")
-        print("[WARNING] ANTHROPIC_API_KEY not found in environment variables")
-        claude = None
-except Exception as e:
-    logger.error(f"Failed to initialize Claude: {e}")
-    print(f"[ERROR] Failed to initialize Claude: {e}")
-    claude = None
-print("[DEBUG] Finished Claude setup")
+        return Client(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    finally:
+        os.environ.update(saved_proxies)
+
+sheet = LazyClient("Google Sheets", open_stats_sheet,
+                   configured=bool(os.getenv("GOOGLE_SHEETS_CREDENTIALS")) or os.path.exists("credentials.json"))
+if not sheet.configured:
+    logger.warning("No Google Sheets credentials found - Google Sheets functionality disabled")
+    print("[WARNING] No Google Sheets credentials found")
+
+claude = LazyClient("Claude", create_claude_client, configured=bool(os.getenv("ANTHROPIC_API_KEY")))
+if not claude.configured:
+    logger.warning("ANTHROPIC_API_KEY not found in environment variables")
+    print("[WARNING] ANTHROPIC_API_KEY not found in environment variables")
+
+# Claude completion cache
+# Insight prompts are built deterministically from the question and the data
+# summary, so the same question over the same numbers produces the same prompt.
+# Completions are kept by a fingerprint of model, prompt, token limit and
+# temperature (rounded to TEMPERATURE_BUCKET) for LLM_CACHE_TTL seconds, with at
+# most LLM_CACHE_MAX_ENTRIES kept (least recently used dropped first).
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(6 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+TEMPERATURE_BUCKET = 0.1
+
+def prompt_fingerprint(model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    """Cache key for a completion request"""
+    bucket = round(temperature / TEMPERATURE_BUCKET)
+    return hashlib.sha256(f"{model}\0{max_tokens}\0{bucket}\0{prompt}".encode('utf-8')).hexdigest()
+
+class CompletionCache:
+    """Bounded LRU of completion texts that expire after a TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = {}  # fingerprint -> (text, stored_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.pop(fingerprint, None)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                self._entries[fingerprint] = entry  # most recently used
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, fingerprint: str, text: str):
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+            self._entries[fingerprint] = (text, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+completion_cache = CompletionCache(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL)
+
+def cached_claude_completion(prompt: str, model: str = "claude-3-haiku-20240307",
+                             max_tokens: int = 300, temperature: float = 0.7) -> str:
+    """Claude's reply to a single-message prompt, reused for an identical prompt.
+
+    Errors are raised to the caller and never cached.
+    """
+    fingerprint = prompt_fingerprint(model, prompt, max_tokens, temperature)
+    text = completion_cache.get(fingerprint)
+    if text is not None:
+        return text
+    response = claude.messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    text = response.content[0].text.strip() if hasattr(response.content[0], 'text') else str(response.content[0])
+    completion_cache.put(fingerprint, text)
+    return text
 
 print("[DEBUG] Starting ElevenLabs setup")
 # ElevenLabs setup
@@ -212,6 +475,1419 @@ print("[DEBUG] Starting memory storage setup")
 conversation_memory_file = "data/conversation_memory.json"
 print("[DEBUG] Finished memory storage setup")
 
+# Shared sheet row cache
+# Every report, dashboard and query reads the whole Stats sheet. Instead of each
+# call site downloading it again, they all share one snapshot that is refreshed
+# once it is older than SHEET_CACHE_TTL seconds or explicitly invalidated after
+# a write. Callers must treat the returned rows as read-only.
+SHEET_CACHE_TTL = float(os.getenv("SHEET_CACHE_TTL", "60"))
+_sheet_rows_lock = threading.Lock()
+_sheet_rows_cache = {"rows": None, "fetched_at": 0.0, "version": 0, "local_rows": 0}
+
+# Shared snapshot across worker processes
+# The rows are also kept in SHEET_SNAPSHOT_PATH so gunicorn workers share one
+# copy of the data instead of each downloading the sheet. The file holds a header
+# line (version, snapshot id, a hash of the rows and their count) and then one JSON
+# row per line. Workers memory-map it and decode rows only as they're read, so a
+# worker's memory doesn't grow with the sheet's history; tables come from the
+# binary columns written next to it (see "Binary stats snapshot").
+# A worker whose snapshot has expired loads a file another worker wrote within
+# SHEET_CACHE_TTL or, failing that, claims the refresh: it reads the storage
+# without holding the file lock and takes the lock again only to replace the file
+# (or, if the rows hash the same, just mark it fresh). While one worker is
+# reading, the others keep serving what they have. So the sheet is read once per
+# TTL whatever the worker count, and every worker serves the file's version.
+# With gunicorn's preload_app (see gunicorn.conf.py) the master loads the file
+# before forking, so workers start with the snapshot already in shared pages.
+SHEET_SNAPSHOT_PATH = os.getenv("SHEET_SNAPSHOT_PATH", os.path.join(os.path.dirname(__file__), 'data', 'sheet_snapshot.json'))
+SNAPSHOT_DECODE_CHUNK = 1000
+
+class SnapshotRows(Sequence):
+    """Rows of a shared snapshot file, decoded from its memory map when read, plus rows added locally"""
+
+    def __init__(self, buffer: mmap.mmap, starts: np.ndarray, digest: str, tail: Optional[List[dict]] = None):
+        self._buffer = buffer
+        self._starts = starts  # offset of each row's line, then the end of the file
+        self._stored = len(starts) - 1
+        self.digest = digest
+        self._tail = tail or []
+
+    def __len__(self) -> int:
+        return self._stored + len(self._tail)
+
+    def _decode(self, start: int, stop: int) -> List[dict]:
+        if start >= stop:
+            return []
+        lines = self._buffer[self._starts[start]:self._starts[stop] - 1]
+        return json.loads(b'[' + lines.replace(b'\n', b',') + b']')
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start == 0 and stop >= self._stored:
+                return SnapshotRows(self._buffer, self._starts, self.digest, self._tail[:stop - self._stored])
+            return (self._decode(start, min(stop, self._stored))
+                    + self._tail[max(start - self._stored, 0):max(stop - self._stored, 0)])
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snapshot row index out of range")
+        if index >= self._stored:
+            return self._tail[index - self._stored]
+        return self._decode(index, index + 1)[0]
+
+    def __iter__(self):
+        for start in range(0, self._stored, SNAPSHOT_DECODE_CHUNK):
+            yield from self._decode(start, min(start + SNAPSHOT_DECODE_CHUNK, self._stored))
+        yield from self._tail
+
+    def __add__(self, other) -> 'SnapshotRows':
+        return SnapshotRows(self._buffer, self._starts, self.digest, self._tail + list(other))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SnapshotRows):
+            return self.digest == other.digest and self._tail == other._tail
+        if isinstance(other, list):
+            return len(self) == len(other) and list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+class SharedSnapshot:
+    """Stat rows in a file shared by every worker, replaced atomically"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.table_path = f"{os.path.splitext(path)[0]}.bin"  # binary columns of the same rows
+        self.version = 0  # version of the rows this process last loaded
+        self.snapshot_id = None  # pairs the rows with their binary columns
+        self.digest = None  # hash of the rows this process last loaded
+        self._built = None  # (snapshot_id, table) this process built when it couldn't write the binary columns
+
+    def _header(self) -> Optional[dict]:
+        """The file's header line, or None if there is no readable file."""
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        return header if isinstance(header, dict) and 'count' in header else None
+
+    def _fresh(self) -> bool:
+        try:
+            return time.time() - os.path.getmtime(self.path) < SHEET_CACHE_TTL
+        except OSError:
+            return False
+
+    def _current(self, header: dict) -> Optional[SnapshotRows]:
+        """None if this process already holds the file's rows, else the rows loaded from it."""
+        return None if header['hash'] == self.digest else self.load()
+
+    def _write(self, rows: List[dict], lines: List[str], digest: str, version: int):
+        snapshot_id = uuid.uuid4().bytes
+        table = StatsTable(rows)
+        written = False
+        try:
+            written = write_stats_snapshot(self.table_path, table, snapshot_id)
+        except Exception as e:
+            logger.error(f"Failed to write binary stats snapshot: {e}")
+        self._built = None if written else (snapshot_id, table)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({"version": version, "id": snapshot_id.hex(), "hash": digest, "count": len(lines)}))
+            f.write('\n')
+            for line in lines:
+                f.write(line)
+                f.write('\n')
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> Optional[SnapshotRows]:
+        """Rows from the file, ignoring its age (None if there is none)."""
+        try:
+            with open(self.path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        header_end = buffer.find(b'\n') + 1
+        try:
+            header = json.loads(buffer[:header_end])
+        except ValueError:
+            return None
+        if not isinstance(header, dict) or 'count' not in header:
+            return None
+        line_ends = np.flatnonzero(np.frombuffer(buffer, dtype=np.uint8, offset=header_end) == ord('\n'))
+        if len(line_ends) != header['count']:
+            return None
+        starts = np.concatenate([[header_end], line_ends + header_end + 1])
+        self.version = header['version']
+        self.snapshot_id = bytes.fromhex(header['id'])
+        self.digest = header['hash']
+        return SnapshotRows(buffer, starts, header['hash'])
+
+    def load_table(self, rows: List[dict]) -> Optional['StatsTable']:
+        """The memory-mapped table for the rows last loaded, if there is one."""
+        built, self._built = self._built, None
+        table = None
+        if self.snapshot_id is not None:
+            try:
+                table = map_stats_snapshot(self.table_path, rows, self.snapshot_id)
+            except Exception as e:
+                logger.error(f"Failed to map binary stats snapshot: {e}")
+        if table is None and built and built[0] == self.snapshot_id and len(built[1]) == len(rows):
+            table = built[1]
+        return table
+
+    def refresh(self, read_rows, force: bool = False) -> Optional[SnapshotRows]:
+        """Current rows: another worker's fresh file, or read_rows() written to the file.
+
+        Returns None when this process already holds the file's rows, including
+        while another worker is reading the storage (changed() then says so).
+        """
+        lock_path = f"{self.path}.lock"
+        with FileLock(lock_path):
+            header = self._header()
+            if header and not force and self._fresh():
+                return self._current(header)
+        # One worker reads the storage at a time; the rest wait only if they have no rows to serve
+        waits = force or header is None or self.digest is None
+        with FileLock(f"{self.path}.refresh.lock", blocking=waits) as claim:
+            if not claim.acquired:
+                return self._current(header)
+            if not force:
+                with FileLock(lock_path):
+                    header = self._header()
+                    if header and self._fresh():
+                        return self._current(header)  # the worker we waited for wrote it
+            rows = read_rows()
+            lines = [json.dumps(row, separators=(',', ':'), default=str) for row in rows]
+            digest = hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+            with FileLock(lock_path):
+                header = self._header()
+                if header and header['hash'] == digest:
+                    os.utime(self.path)  # the same rows: just mark them fresh
+                    return self._current(header)
+                self._write(rows, lines, digest, header['version'] + 1 if header else self.version + 1)
+            return self.load()
+
+    def changed(self) -> bool:
+        """Whether the file was replaced or has expired since this process last loaded it."""
+        header = self._header()
+        return header is None or header['hash'] != self.digest or not self._fresh()
+
+    def expire(self):
+        """Make every worker's next refresh re-read the storage (after a write)."""
+        try:
+            os.utime(self.path, (0, 0))
+        except OSError:
+            pass
+
+shared_snapshot = SharedSnapshot(SHEET_SNAPSHOT_PATH)
+
+def get_sheet_rows(force_refresh: bool = False) -> List[dict]:
+    """Return the shared snapshot of stat rows (from stats_storage), refreshing it when stale."""
+    if not stats_storage:
+        return []
+    with _sheet_rows_lock:
+        cached_rows = _sheet_rows_cache["rows"]
+        age = time.monotonic() - _sheet_rows_cache["fetched_at"]
+        if cached_rows is not None and not force_refresh and age < SHEET_CACHE_TTL:
+            return cached_rows
+        try:
+            rows = shared_snapshot.refresh(stats_storage.read_rows, force=force_refresh)
+        except Exception as e:
+            if cached_rows is None:
+                raise
+            logger.error(f"Failed to refresh sheet rows, serving cached snapshot: {e}")
+            return cached_rows
+        if rows is None:
+            # The shared file is already loaded here (re-checked next call if another
+            # worker is still reading the storage)
+            if cached_rows is not None:
+                _sheet_rows_cache["fetched_at"] = 0.0 if shared_snapshot.changed() else time.monotonic()
+                return cached_rows
+            rows = shared_snapshot.load()
+        # Rows still in the write-behind spool aren't in the storage yet
+        pending = stats_storage.pending_rows()
+        if pending:
+            rows = rows + pending
+        if rows == cached_rows:
+            # Keep the same snapshot object so tables built from it stay cached
+            rows = cached_rows
+        else:
+            _sheet_rows_cache["version"] += 1
+            query_answer_cache.clear()
+        _sheet_rows_cache["rows"] = rows
+        # A flush that landed while the storage was being read expired the file:
+        # serve these rows now but read again on the next call
+        _sheet_rows_cache["fetched_at"] = 0.0 if shared_snapshot.changed() else time.monotonic()
+        _sheet_rows_cache["local_rows"] = len(pending)
+        return rows
+
+def get_sheet_rows_version() -> int:
+    """Return a counter that changes whenever the cached sheet contents change."""
+    return _sheet_rows_cache["version"]
+
+def has_local_rows() -> bool:
+    """Whether the snapshot holds rows added locally rather than read back from the sheet."""
+    return _sheet_rows_cache["local_rows"] > 0
+
+def invalidate_sheet_rows():
+    """Drop the cached snapshot so the next read fetches fresh rows."""
+    with _sheet_rows_lock:
+        _sheet_rows_cache["fetched_at"] = 0.0
+    shared_snapshot.expire()
+
+def preload_sheet_rows():
+    """Load the shared snapshot file (if any) into the cache and build its table, without network calls."""
+    if not stats_storage:
+        return
+    rows = shared_snapshot.load()
+    if rows is None:
+        return
+    with _sheet_rows_lock:
+        _sheet_rows_cache["rows"] = rows
+        _sheet_rows_cache["fetched_at"] = time.monotonic()
+        _sheet_rows_cache["version"] += 1
+    get_stats_table(rows)
+    logger.info(f"Preloaded {len(rows)} stat rows (snapshot version {shared_snapshot.version})")
+
+# Columnar stats table
+# Stat columns from the A-U sheet layout (see STATS_COLUMN_MAPPING.md), followed
+# by the legacy fields that older rows still carry.
+STATS_TABLE_FIELDS = [
+    'Total Attendance', 'First Time Visitors', 'Visitors', 'Information Gathered',
+    'First Time Christians', 'Rededications', 'Youth Attendance', 'Youth Salvations',
+    'Youth New People', 'Kids Attendance', 'Kids Leaders', 'New Kids',
+    'New Kids Salvations', 'Connect Groups', 'Dream Team', 'Tithe', 'Baptisms',
+    'Child Dedications',
+    'New People', 'New Christians', 'Kids Total', 'Volunteers'
+]
+
+# Stats sheet header, columns A-U
+SHEET_COLUMNS = ['Timestamp', 'Date', 'Campus'] + STATS_TABLE_FIELDS[:18]
+
+# Summary stat name -> sheet fields to read it from; the first non-empty field wins
+STAT_FIELD_SOURCES = {
+    'attendance': ['Total Attendance'],
+    'first_time_visitors': ['First Time Visitors'],
+    'information_gathered': ['Information Gathered'],
+    'new_christians': ['First Time Christians', 'New Christians'],
+    'rededications': ['Rededications'],
+    'youth_attendance': ['Youth Attendance'],
+    'youth_salvations': ['Youth Salvations'],
+    'youth_new_people': ['Youth New People'],
+    'kids_attendance': ['Kids Attendance', 'Kids Total'],
+    'kids_leaders': ['Kids Leaders'],
+    'new_kids': ['New Kids'],
+    'new_kids_salvations': ['New Kids Salvations'],
+    'connect_groups': ['Connect Groups'],
+    'dream_team': ['Dream Team'],
+    'tithe': ['Tithe'],
+    'baptisms': ['Baptisms'],
+    'child_dedications': ['Child Dedications'],
+    'new_people': ['New People']  # Keep for backward compatibility
+}
+
+SHEET_DATE_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',  # 2025-07-31 12:49:11
+    '%Y-%m-%d',           # 2025-07-31
+    '%m/%d/%Y',           # 4/15/2025
+    '%m/%d/%y',           # 4/15/25
+    '%d/%m/%Y',           # 15/4/2025
+    '%d/%m/%y',           # 15/4/25
+    '%Y-%m-%dT%H:%M:%S',  # 2025-07-31T12:49:11
+    '%Y-%m-%dT%H:%M:%SZ', # 2025-07-31T12:49:11Z
+]
+
+_EPOCH = datetime(1970, 1, 1)
+
+def parse_stat_cell(value: Any) -> int:
+    """Parse a sheet cell into an int stat value, returning 0 for blanks and junk."""
+    if type(value) is int:
+        return value
+    if value is None or value == '':
+        return 0
+    try:
+        return int(str(value).replace(',', '').strip())
+    except Exception:
+        return 0
+
+def parse_row_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a Timestamp/Date cell into a naive local datetime, or None if unreadable."""
+    text = str(value).strip() if value is not None else ''
+    if not text:
+        return None
+    if 'T' in text:
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        return parsed
+    for fmt in SHEET_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+def datetime_to_seconds(value: datetime) -> float:
+    """Convert a datetime to the naive epoch seconds used by StatsTable columns."""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+# Report stat -> table stat read by the quarterly, monthly and mid-year reports
+REPORT_STAT_SOURCES = {
+    'attendance': 'attendance',
+    'new_people': 'new_people',
+    'new_christians': 'New Christians',
+    'youth': 'youth_attendance',
+    'kids': 'Kids Total',
+    'connect_groups': 'connect_groups'
+}
+
+# A row only counts toward cross-campus reports if one of these is positive
+CROSS_CAMPUS_STAT_FIELDS = [
+    "Total Attendance", "New People", "New Christians", "First Time Christians", "Youth Attendance",
+    "Kids Total", "Kids Attendance", "Connect Groups", "Tithe"
+]
+
+# Stats kept in the daily rollup, and the entry-count flavours it tracks
+ROLLUP_STATS = list(STAT_FIELD_SOURCES) + ['New Christians', 'Kids Total']
+ROLLUP_ENTRY_GROUPS = {
+    'summary': list(STAT_FIELD_SOURCES),
+    'report': list(REPORT_STAT_SOURCES.values())
+}
+
+class StatsTable:
+    """Typed, column-per-stat view of sheet rows, built once per snapshot"""
+
+    def __init__(self, rows: List[dict]):
+        self.rows = [row for row in rows if isinstance(row, dict)]
+        # Timestamp (A) and service Date (B), parsed once and kept in sorted order so
+        # date ranges are a binary search instead of a scan
+        self._timestamps = [parse_row_timestamp(row.get('Timestamp', '')) for row in self.rows]
+        self.timestamp_seconds = np.array(
+            [datetime_to_seconds(ts) if ts else np.nan for ts in self._timestamps], dtype=np.float64
+        )
+        self.day_ordinals = np.array(
+            [ts.toordinal() if ts else StatsRollup.UNDATED for ts in self._timestamps], dtype=np.int64
+        )
+        self._dates = [parse_row_timestamp(row.get('Date', '')) for row in self.rows]
+        self.date_seconds = np.array(
+            [datetime_to_seconds(day) if day else np.nan for day in self._dates], dtype=np.float64
+        )
+        self._indexes = {
+            'Timestamp': self._build_index(self.timestamp_seconds),
+            'Date': self._build_index(self.date_seconds)
+        }
+
+        campus_names = [normalize_campus(row.get('Campus') or row.get('campus') or '') for row in self.rows]
+        self.campus_names = list(dict.fromkeys(campus_names))
+        self._campus_ids = {name: code for code, name in enumerate(self.campus_names)}
+        self.campus_codes = np.array([self._campus_ids[name] for name in campus_names], dtype=np.int32)
+
+        self.values = {}
+        self.present = {}
+        for field in STATS_TABLE_FIELDS:
+            cells = [row.get(field) for row in self.rows]
+            self.present[field] = np.array([cell is not None and cell != '' for cell in cells], dtype=bool)
+            self.values[field] = np.array([parse_stat_cell(cell) for cell in cells], dtype=np.int64)
+
+        has_campus = np.array([bool(str(row.get('Campus', '')).strip()) for row in self.rows], dtype=bool)
+        has_stat = np.zeros(len(self.rows), dtype=bool)
+        for field in CROSS_CAMPUS_STAT_FIELDS:
+            has_stat |= self.values[field] > 0
+        self.cross_campus_eligible = has_campus & has_stat
+
+        self._stat_columns = {}
+        self._rollup = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def _datetimes(seconds: np.ndarray) -> List[Optional[datetime]]:
+        return [None if np.isnan(value) else _EPOCH + timedelta(seconds=float(value)) for value in seconds]
+
+    @property
+    def timestamps(self) -> List[Optional[datetime]]:
+        """Parsed Timestamp of each row (None if unreadable)"""
+        if self._timestamps is None:
+            self._timestamps = self._datetimes(self.timestamp_seconds)
+        return self._timestamps
+
+    @property
+    def dates(self) -> List[Optional[datetime]]:
+        """Parsed service Date of each row (None if unreadable)"""
+        if self._dates is None:
+            self._dates = self._datetimes(self.date_seconds)
+        return self._dates
+
+    @staticmethod
+    def _build_index(seconds: np.ndarray) -> tuple:
+        """Row order sorted by the given column, its sorted keys and the undated rows."""
+        undated = np.isnan(seconds)
+        dated_rows = np.flatnonzero(~undated)
+        order = dated_rows[np.argsort(seconds[dated_rows], kind='stable')]
+        return order, seconds[order], np.flatnonzero(undated)
+
+    @staticmethod
+    def _merge_index(index: tuple, tail_index: tuple, offset: int) -> tuple:
+        """Merge the sorted index of appended rows into an existing index."""
+        order, keys, undated = index
+        tail_order, tail_keys, tail_undated = tail_index
+        positions = np.searchsorted(keys, tail_keys, side='right')
+        return (np.insert(order, positions, tail_order + offset),
+                np.insert(keys, positions, tail_keys),
+                np.concatenate([undated, tail_undated + offset]))
+
+    def extend(self, new_rows: List[dict]) -> 'StatsTable':
+        """Return a new table with new_rows appended, updating rather than rebuilding indexes."""
+        tail = StatsTable(new_rows)
+        offset = len(self.rows)
+        table = StatsTable([])
+        table.rows = self.rows + tail.rows
+        # Datetime lists are rebuilt from the seconds columns if anything asks for them
+        table._timestamps = None
+        table._dates = None
+        for name in ('timestamp_seconds', 'day_ordinals', 'date_seconds', 'cross_campus_eligible'):
+            setattr(table, name, np.concatenate([getattr(self, name), getattr(tail, name)]))
+        table._indexes = {key: self._merge_index(index, tail._indexes[key], offset)
+                          for key, index in self._indexes.items()}
+
+        table.campus_names = list(self.campus_names)
+        table._campus_ids = dict(self._campus_ids)
+        for name in tail.campus_names:
+            if name not in table._campus_ids:
+                table._campus_ids[name] = len(table.campus_names)
+                table.campus_names.append(name)
+        remap = np.array([table._campus_ids[name] for name in tail.campus_names], dtype=np.int32)
+        table.campus_codes = np.concatenate([self.campus_codes, remap[tail.campus_codes]])
+
+        for field in STATS_TABLE_FIELDS:
+            table.values[field] = np.concatenate([self.values[field], tail.values[field]])
+            table.present[field] = np.concatenate([self.present[field], tail.present[field]])
+        if self._rollup is not None:
+            table._rollup = self._rollup.merged(tail.rollup())
+        return table
+
+    def all_rows(self) -> np.ndarray:
+        """Indices of every row."""
+        return np.arange(len(self.rows))
+
+    def campus_codes_for(self, campus: str, exact: bool = False) -> List[int]:
+        """Codes of the campuses equal to (or, unless exact, containing) the given campus."""
+        wanted = normalize_campus(campus)
+        return [code for code, name in enumerate(self.campus_names)
+                if name == wanted or (not exact and wanted in name)]
+
+    def select(self, campus: Optional[str] = None, start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None, include_undated: bool = False,
+               by: str = 'Timestamp', exact_campus: bool = False, end_inclusive: bool = True) -> np.ndarray:
+        """Indices of rows for the campus within [start_date, end_date], oldest first.
+
+        Rows whose `by` column is blank or unreadable are only included (ahead of the
+        dated rows) when include_undated is set.
+        """
+        order, keys, undated = self._indexes[by]
+        lo = 0 if start_date is None else np.searchsorted(keys, datetime_to_seconds(start_date), side='left')
+        if end_date is None:
+            hi = len(keys)
+        else:
+            hi = np.searchsorted(keys, datetime_to_seconds(end_date), side='right' if end_inclusive else 'left')
+        selection = order[lo:hi]
+        if include_undated and undated.size:
+            selection = np.concatenate([undated, selection])
+        if campus:
+            selection = selection[np.isin(self.campus_codes[selection], self.campus_codes_for(campus, exact_campus))]
+        return selection
+
+    def partition_by_campus(self, selection: np.ndarray) -> Dict[int, np.ndarray]:
+        """Split a selection into per-campus-code selections in one pass."""
+        codes = self.campus_codes[selection]
+        order = np.argsort(codes, kind='stable')
+        grouped_codes = codes[order]
+        present_codes = np.unique(grouped_codes)
+        bounds = np.searchsorted(grouped_codes, present_codes, side='left').tolist() + [len(order)]
+        return {int(code): selection[order[bounds[i]:bounds[i + 1]]] for i, code in enumerate(present_codes)}
+
+    def take(self, selection: np.ndarray) -> List[dict]:
+        """The original row dicts for a selection."""
+        return [self.rows[i] for i in selection]
+
+    def stat(self, name: str) -> np.ndarray:
+        """Column for a summary stat (or raw sheet field), applying field fallbacks."""
+        column = self._stat_columns.get(name)
+        if column is None:
+            fields = STAT_FIELD_SOURCES.get(name, [name])
+            column = self.values[fields[-1]]
+            for field in reversed(fields[:-1]):
+                column = np.where(self.present[field], self.values[field], column)
+            self._stat_columns[name] = column
+        return column
+
+    def total(self, field: str, selection: np.ndarray) -> int:
+        """Sum of a stat over the selected rows."""
+        return int(self.stat(field)[selection].sum())
+
+    def summarize(self, selection: np.ndarray) -> dict:
+        """Totals, per-stat averages of positive values and entry count for the selected rows."""
+        stats = {stat_name: 0 for stat_name in STAT_FIELD_SOURCES}
+        averages = {}
+        entry_count = 0
+        if len(selection):
+            columns = {stat_name: self.stat(stat_name)[selection] for stat_name in STAT_FIELD_SOURCES}
+            # Only count entries with at least one stat
+            entry_count = int(np.count_nonzero(np.any(np.stack(list(columns.values())) != 0, axis=0)))
+            for stat_name, column in columns.items():
+                stats[f'total_{stat_name}'] = int(column.sum())
+                positive = column[column > 0]
+                if positive.size:
+                    averages[stat_name] = round(int(positive.sum()) / positive.size, 1)
+        return {
+            "total_entries": entry_count,
+            **stats,
+            "averages": averages
+        }
+
+    def rollup(self) -> 'StatsRollup':
+        """The (campus, day) rollup of this table, built on first use."""
+        if self._rollup is None:
+            self._rollup = StatsRollup(self)
+        return self._rollup
+
+class StatsRollup:
+    """Per-campus, per-day sums and counts for every rollup stat.
+
+    Each day is identified by its ordinal (of the row's Timestamp) and holds one
+    int64 vector: per stat the sum, the sum of positive values and the count of
+    positive values, then one entry count per ROLLUP_ENTRY_GROUPS group and the
+    row count. A period is answered by summing the vectors of the days in it, so a
+    row always counts in the period its own date falls in, even when its week
+    straddles the start of a month, quarter or year.
+    The 'cross_campus' layer only holds rows eligible for cross-campus reports.
+    """
+    UNDATED = -1
+    LAYERS = ('all', 'cross_campus')
+
+    def __init__(self, table: Optional[StatsTable] = None):
+        self.layers = {layer: {} for layer in self.LAYERS}
+        if table is not None and len(table):
+            self._add_table(table)
+
+    @staticmethod
+    def width() -> int:
+        return 3 * len(ROLLUP_STATS) + len(ROLLUP_ENTRY_GROUPS) + 1
+
+    def _add_table(self, table: StatsTable):
+        stats = np.stack([table.stat(name) for name in ROLLUP_STATS], axis=1)
+        entries = [np.any(np.stack([table.stat(name) for name in names], axis=1) != 0, axis=1)
+                   for names in ROLLUP_ENTRY_GROUPS.values()]
+        vectors = np.hstack([
+            stats,
+            np.where(stats > 0, stats, 0),
+            (stats > 0).astype(np.int64),
+            np.stack(entries, axis=1).astype(np.int64),
+            np.ones((len(table), 1), dtype=np.int64)
+        ])
+        for layer, rows in (('all', table.all_rows()), ('cross_campus', np.flatnonzero(table.cross_campus_eligible))):
+            if not len(rows):
+                continue
+            keys = (table.campus_codes[rows].astype(np.int64) << 32) | (table.day_ordinals[rows] - self.UNDATED)
+            group_keys, groups = np.unique(keys, return_inverse=True)
+            sums = np.zeros((len(group_keys), self.width()), dtype=np.int64)
+            np.add.at(sums, groups, vectors[rows])
+            codes = group_keys >> 32
+            days = (group_keys & 0xFFFFFFFF) + self.UNDATED
+            for code in np.unique(codes):
+                part = codes == code
+                self.layers[layer][table.campus_names[code]] = (days[part], sums[part])
+
+    def merged(self, other: 'StatsRollup') -> 'StatsRollup':
+        """A new rollup combining this one with another (e.g. for appended rows)."""
+        result = StatsRollup()
+        for layer in self.LAYERS:
+            campuses = dict(self.layers[layer])
+            for campus, (days, sums) in other.layers[layer].items():
+                if campus in campuses:
+                    old_days, old_sums = campuses[campus]
+                    all_days = np.union1d(old_days, days)
+                    combined = np.zeros((len(all_days), self.width()), dtype=np.int64)
+                    combined[np.searchsorted(all_days, old_days)] += old_sums
+                    combined[np.searchsorted(all_days, days)] += sums
+                    campuses[campus] = (all_days, combined)
+                else:
+                    campuses[campus] = (days, sums)
+            result.layers[layer] = campuses
+        return result
+
+    def totals(self, campus: Optional[str] = None, start_date: Optional[datetime] = None,
+               end_date: Optional[datetime] = None, include_undated: bool = False, layer: str = 'all') -> dict:
+        """Merge the days in [start_date, end_date] (whole days) for matching campuses."""
+        wanted = normalize_campus(campus) if campus else None
+        vector = np.zeros(self.width(), dtype=np.int64)
+        first_day = start_date.toordinal() if start_date else 0
+        last_day = end_date.toordinal() if end_date else None
+        for name, (days, sums) in self.layers[layer].items():
+            if wanted and not (name == wanted or wanted in name):
+                continue
+            lo = np.searchsorted(days, first_day, side='left')
+            hi = len(days) if last_day is None else np.searchsorted(days, last_day, side='right')
+            vector += sums[lo:hi].sum(axis=0)
+            if include_undated and len(days) and days[0] == self.UNDATED:
+                vector += sums[0]
+
+        count = len(ROLLUP_STATS)
+        result = {'rows': int(vector[-1]), 'entries': {}, 'totals': {}, 'averages': {}}
+        for i, name in enumerate(ROLLUP_STATS):
+            result['totals'][name] = int(vector[i])
+            positive_count = int(vector[2 * count + i])
+            if positive_count:
+                result['averages'][name] = int(vector[count + i]) / positive_count
+        for i, group in enumerate(ROLLUP_ENTRY_GROUPS):
+            result['entries'][group] = int(vector[3 * count + i])
+        return result
+
+    def summarize(self, campus: Optional[str] = None, start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None, include_undated: bool = False, layer: str = 'all') -> dict:
+        """Same shape as StatsTable.summarize, merged from the daily rollup."""
+        merged = self.totals(campus, start_date, end_date, include_undated, layer)
+        stats = {stat_name: 0 for stat_name in STAT_FIELD_SOURCES}
+        averages = {}
+        if merged['rows']:
+            for stat_name in STAT_FIELD_SOURCES:
+                stats[f'total_{stat_name}'] = merged['totals'][stat_name]
+                if stat_name in merged['averages']:
+                    averages[stat_name] = round(merged['averages'][stat_name], 1)
+        return {
+            "total_entries": merged['entries']['summary'],
+            **stats,
+            "averages": averages
+        }
+
+    def report_totals(self, campus: Optional[str] = None, start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None, include_undated: bool = False) -> dict:
+        """Totals, averages and entry count of the REPORT_STAT_SOURCES stats."""
+        merged = self.totals(campus, start_date, end_date, include_undated)
+        return {
+            'totals': {key: merged['totals'][name] for key, name in REPORT_STAT_SOURCES.items()},
+            'averages': {key: merged['averages'].get(name, 0) for key, name in REPORT_STAT_SOURCES.items()},
+            'entry_count': merged['entries']['report']
+        }
+
+# Binary stats snapshot
+# Next to the JSON rows of the shared snapshot, the refresher writes the stats
+# table's columns to a binary file: int32 stat columns with presence flags,
+# Timestamp seconds, Date as epoch days, campus ids into a string table, and the
+# sorted Timestamp/Date indexes. Workers memory-map it and use the arrays in
+# place, so a snapshot is parsed once by whichever process wrote it and its pages
+# are shared by every worker. It is written to a temporary file and renamed into
+# place, and only used when its snapshot id matches the JSON rows. A table the
+# format can't hold exactly (a stat outside int32, a Date with a time of day) is
+# simply not written and workers build the table from the rows as before.
+STATS_SNAPSHOT_MAGIC = b'FCSTATS2'
+# magic, snapshot id, rows, fields, dated timestamps, dated dates, string table bytes
+STATS_SNAPSHOT_HEADER = struct.Struct('<8s16sIIIII')
+UNDATED_DAY = np.iinfo(np.int32).min
+SECONDS_PER_DAY = 86400
+
+def _stats_snapshot_sections(rows: int, fields: int) -> List[tuple]:
+    """(name, dtype, shape) of each array in the file, in order"""
+    return [
+        ('timestamp_seconds', np.float64, (rows,)),
+        ('date_days', np.int32, (rows,)),
+        ('day_ordinals', np.int32, (rows,)),
+        ('campus_codes', np.uint16, (rows,)),
+        ('cross_campus_eligible', np.bool_, (rows,)),
+        ('values', np.int32, (fields, rows)),
+        ('present', np.bool_, (fields, rows)),
+        ('timestamp_order', np.int32, (rows,)),
+        ('date_order', np.int32, (rows,)),
+    ]
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def write_stats_snapshot(path: str, table: StatsTable, snapshot_id: bytes) -> bool:
+    """Write table's columns to path atomically; False if the table doesn't fit the format."""
+    dated = ~np.isnan(table.date_seconds)
+    date_days = np.full(len(table), UNDATED_DAY, dtype=np.int64)
+    date_days[dated] = np.floor(table.date_seconds[dated] / SECONDS_PER_DAY)
+    if np.any(date_days[dated] * SECONDS_PER_DAY != table.date_seconds[dated]):
+        return False
+    values = np.stack([table.values[field] for field in STATS_TABLE_FIELDS]) if len(table) else \
+        np.zeros((len(STATS_TABLE_FIELDS), 0), dtype=np.int64)
+    limits = np.iinfo(np.int32)
+    if values.size and (values.min() < limits.min or values.max() > limits.max):
+        return False
+    if len(table.campus_names) > np.iinfo(np.uint16).max:
+        return False
+
+    indexes = {}
+    for key in ('Timestamp', 'Date'):
+        order, _, undated = table._indexes[key]
+        indexes[key] = (len(order), np.concatenate([order, undated]))
+    strings = '\0'.join(STATS_TABLE_FIELDS + table.campus_names).encode('utf-8')
+    arrays = {
+        'timestamp_seconds': table.timestamp_seconds,
+        'date_days': date_days,
+        'day_ordinals': table.day_ordinals,
+        'campus_codes': table.campus_codes,
+        'cross_campus_eligible': table.cross_campus_eligible,
+        'values': values,
+        'present': np.stack([table.present[field] for field in STATS_TABLE_FIELDS]) if len(table) else
+                   np.zeros((len(STATS_TABLE_FIELDS), 0), dtype=bool),
+        'timestamp_order': indexes['Timestamp'][1],
+        'date_order': indexes['Date'][1],
+    }
+    header = STATS_SNAPSHOT_HEADER.pack(STATS_SNAPSHOT_MAGIC, snapshot_id, len(table), len(STATS_TABLE_FIELDS),
+                                        indexes['Timestamp'][0], indexes['Date'][0], len(strings))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(strings)
+        for name, dtype, shape in _stats_snapshot_sections(len(table), len(STATS_TABLE_FIELDS)):
+            f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+    os.replace(tmp_path, path)
+    return True
+
+def map_stats_snapshot(path: str, rows: List[dict], snapshot_id: bytes) -> Optional[StatsTable]:
+    """StatsTable for rows over the memory-mapped file at path, or None if it isn't their snapshot."""
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < STATS_SNAPSHOT_HEADER.size:
+        return None
+    magic, file_id, count, fields, dated_timestamps, dated_dates, strings_size = \
+        STATS_SNAPSHOT_HEADER.unpack_from(buffer)
+    if magic != STATS_SNAPSHOT_MAGIC or file_id != snapshot_id or count != len(rows):
+        return None
+    offset = STATS_SNAPSHOT_HEADER.size
+    strings = bytes(buffer[offset:offset + strings_size]).decode('utf-8').split('\0')
+    if strings[:fields] != STATS_TABLE_FIELDS:
+        return None
+    offset += strings_size
+    arrays = {}
+    for name, dtype, shape in _stats_snapshot_sections(count, fields):
+        offset = _aligned(offset)
+        size = int(np.prod(shape))
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=size, offset=offset).reshape(shape)
+        offset += size * np.dtype(dtype).itemsize
+
+    table = StatsTable([])
+    table.rows = rows
+    table._timestamps = None
+    table._dates = None
+    table.timestamp_seconds = arrays['timestamp_seconds']
+    table.day_ordinals = arrays['day_ordinals']
+    date_days = arrays['date_days']
+    table.date_seconds = np.where(date_days == UNDATED_DAY, np.nan, date_days.astype(np.float64) * SECONDS_PER_DAY)
+    table._indexes = {}
+    for key, seconds, dated in (('Timestamp', table.timestamp_seconds, dated_timestamps),
+                                ('Date', table.date_seconds, dated_dates)):
+        order = arrays['timestamp_order' if key == 'Timestamp' else 'date_order']
+        table._indexes[key] = (order[:dated], seconds[order[:dated]], order[dated:])
+    table.campus_names = strings[fields:]
+    table._campus_ids = {name: code for code, name in enumerate(table.campus_names)}
+    table.campus_codes = arrays['campus_codes']
+    table.cross_campus_eligible = arrays['cross_campus_eligible']
+    table.values = dict(zip(STATS_TABLE_FIELDS, arrays['values']))
+    table.present = dict(zip(STATS_TABLE_FIELDS, arrays['present']))
+    return table
+
+_stats_table_lock = threading.Lock()
+_stats_table_cache = {"rows": None, "table": None}
+
+def get_stats_table(rows: Optional[List[dict]] = None) -> StatsTable:
+    """Return the columnar table for rows, reusing the one built for the shared snapshot."""
+    if rows is None:
+        rows = get_sheet_rows()
+    with _stats_table_lock:
+        cached_rows = _stats_table_cache["rows"]
+        cached_table = _stats_table_cache["table"]
+    if cached_rows is rows:
+        return cached_table
+    if (cached_rows is not None and rows is _sheet_rows_cache["rows"] and len(rows) > len(cached_rows)
+            and rows[:len(cached_rows)] == cached_rows):
+        # The sheet only grew: extend the previous table and its rollup with the new rows
+        table = cached_table.extend(rows[len(cached_rows):])
+    else:
+        table = None
+        if rows is _sheet_rows_cache["rows"]:
+            # Use the columns another process already built for this snapshot, if they're
+            # on disk, adding any rows on the end that aren't in the storage yet
+            local_rows = _sheet_rows_cache["local_rows"]
+            stored_rows = rows[:len(rows) - local_rows] if local_rows else rows
+            table = shared_snapshot.load_table(stored_rows)
+            if table is not None and local_rows:
+                table = table.extend(rows[len(stored_rows):])
+        if table is None:
+            table = StatsTable(rows)
+    if rows is _sheet_rows_cache["rows"]:
+        with _stats_table_lock:
+            _stats_table_cache["rows"] = rows
+            _stats_table_cache["table"] = table
+    return table
+
+# Worker pool for per-campus stats, shared by every request
+STATS_WORKERS = int(os.getenv("STATS_WORKERS", "4"))
+_stats_executor = ThreadPoolExecutor(max_workers=STATS_WORKERS, thread_name_prefix="stats")
+
+def summarize_campuses(table: StatsTable, campuses: List[str], start_date: Optional[datetime] = None,
+                       end_date: Optional[datetime] = None) -> List[tuple]:
+    """(selection, summary) for each campus, from one partition of the date range, computed in parallel."""
+    period = table.select(start_date=start_date, end_date=end_date)
+    parts = table.partition_by_campus(period)
+    empty = np.array([], dtype=np.int64)
+
+    def summarize_campus(campus: str) -> tuple:
+        if not campus:
+            return period, table.summarize(period)
+        campus_parts = [parts[code] for code in table.campus_codes_for(campus) if code in parts]
+        selection = np.sort(np.concatenate(campus_parts)) if campus_parts else empty
+        return selection, table.summarize(selection)
+
+    if len(campuses) < 2:
+        return [summarize_campus(campus) for campus in campuses]
+    return list(_stats_executor.map(summarize_campus, campuses))
+
+def record_appended_rows(new_rows: List[dict]):
+    """Fold rows just appended to the sheet into the cached snapshot, table and rollup."""
+    query_answer_cache.invalidate_rows(new_rows)
+    with _sheet_rows_lock:
+        cached_rows = _sheet_rows_cache["rows"]
+        if cached_rows is None:
+            return
+        rows = cached_rows + new_rows
+        _sheet_rows_cache["rows"] = rows
+        _sheet_rows_cache["version"] += 1
+        _sheet_rows_cache["local_rows"] += len(new_rows)
+    with _stats_table_lock:
+        if _stats_table_cache["rows"] is cached_rows:
+            _stats_table_cache["table"] = _stats_table_cache["table"].extend(new_rows)
+            _stats_table_cache["rows"] = rows
+
+# Sheets write-behind queue
+# Logged stat rows are committed to a local SQLite spool and the request returns
+# straight away; a background flusher sends them to the Stats sheet in batches
+# with append_rows, backing off while Sheets is failing. Rows stay in the spool
+# until Sheets has accepted them, so nothing is lost while Sheets is down or a
+# worker restarts. Every worker process runs a flusher; a flush holds a file lock
+# so each row is sent once (a crash between the write and the delete resends it).
+# Until then get_sheet_rows adds the spooled rows to the end of every refreshed
+# snapshot. It reads the spool under the flush lock, so never between a batch
+# reaching the sheet and leaving the spool, and a flush expires the shared
+# snapshot before releasing the lock, so a refresh that read the sheet before the
+# batch landed knows to read it again.
+SHEET_SPOOL_PATH = os.path.join(os.path.dirname(__file__), 'data', 'sheet_spool.sqlite3')
+SHEET_FLUSH_INTERVAL = float(os.getenv("SHEET_FLUSH_INTERVAL", "2"))
+SHEET_FLUSH_BATCH = int(os.getenv("SHEET_FLUSH_BATCH", "200"))
+SHEET_FLUSH_MAX_BACKOFF = float(os.getenv("SHEET_FLUSH_MAX_BACKOFF", "300"))
+
+class SheetWriteQueue:
+    """Durable spool of rows waiting to be appended to the Stats sheet"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._wake = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self.last_error = None
+        self.last_flush_at = None
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS spool ("
+                     "id INTEGER PRIMARY KEY AUTOINCREMENT, row TEXT NOT NULL, enqueued_at REAL NOT NULL)")
+        return conn
+
+    def enqueue(self, rows: List[list]):
+        """Spool rows for the sheet and show them in the cached snapshot right away."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO spool (row, enqueued_at) VALUES (?, ?)",
+                             [(json.dumps(row), now) for row in rows])
+        record_appended_rows([dict(zip(SHEET_COLUMNS, row)) for row in rows])
+        self.start()
+        self._wake.set()
+
+    def flush_once(self) -> int:
+        """Append the oldest spooled rows to the sheet; returns how many were sent."""
+        with FileLock(f"{self.path}.lock"):
+            with closing(self._connect()) as conn:
+                batch = conn.execute("SELECT id, row FROM spool ORDER BY id LIMIT ?", (SHEET_FLUSH_BATCH,)).fetchall()
+                if not batch:
+                    return 0
+                sheet.append_rows([json.loads(row) for _, row in batch])
+                with conn:
+                    conn.execute("DELETE FROM spool WHERE id <= ?", (batch[-1][0],))
+            # The rows now come from the sheet rather than the spool
+            shared_snapshot.expire()
+        invalidate_sheet_rows()
+        self.last_flush_at = datetime.now(timezone.utc).isoformat()
+        logger.info(f"Flushed {len(batch)} spooled rows to Google Sheets")
+        return len(batch)
+
+    def drain(self):
+        """Send everything spooled now (raises if Sheets refuses)."""
+        while self.flush_once() == SHEET_FLUSH_BATCH:
+            pass
+
+    def pending_rows(self) -> List[dict]:
+        """Spooled rows not yet sent, oldest first (waiting out a flush in progress)."""
+        with FileLock(f"{self.path}.lock"), closing(self._connect()) as conn:
+            return [dict(zip(SHEET_COLUMNS, json.loads(row))) for row, in conn.execute("SELECT row FROM spool ORDER BY id")]
+
+    def depth(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def start(self):
+        """Start this process's flusher thread (again after a fork)."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._thread = threading.Thread(target=self._run, name="sheet-flusher", daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            backoff = self._retry_at - time.monotonic()
+            if backoff > 0:
+                time.sleep(backoff)  # wake-ups from new rows don't cut a backoff short
+            self._wake.wait(SHEET_FLUSH_INTERVAL)
+            self._wake.clear()
+            if not sheet:
+                continue
+            try:
+                if self.flush_once() == SHEET_FLUSH_BATCH:
+                    self._wake.set()  # more waiting
+                self._failures = 0
+                self.last_error = None
+            except Exception as e:
+                self._back_off(e)
+
+    def _back_off(self, error: Exception):
+        """Hold off the next flush, exponentially longer (with jitter) for each failure in a row."""
+        self._failures += 1
+        self.last_error = str(error)
+        delay = min(SHEET_FLUSH_MAX_BACKOFF, SHEET_FLUSH_INTERVAL * 2 ** self._failures)
+        self._retry_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+        logger.error(f"Failed to flush spooled rows to Google Sheets (attempt {self._failures}): {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        with closing(self._connect()) as conn:
+            depth, oldest = conn.execute("SELECT COUNT(*), MIN(enqueued_at) FROM spool").fetchone()
+        return {
+            "depth": depth,
+            "oldest_age_seconds": round(time.time() - oldest, 1) if oldest else 0,
+            "failures": self._failures,
+            "last_error": self.last_error,
+            "last_flush_at": self.last_flush_at
+        }
+
+sheet_write_queue = SheetWriteQueue(SHEET_SPOOL_PATH)
+
+# Incremental sheet reads
+# The Stats sheet mostly grows by appends, so after one full download a refresh
+# reads, in a single batch_get, the header row, the last SHEET_VERIFY_TAIL rows
+# already read plus any appended after them, and one block of SHEET_VERIFY_BLOCK
+# older rows, taking the next block on each refresh. The re-read rows are
+# compared with the records held; if the header or any of them changed (a row was
+# edited or removed), the whole sheet is read again. So edits to recent rows
+# (tithe entries from another worker, say) show on the next refresh and edits
+# anywhere else within one sweep of the blocks, with SHEET_FULL_RESYNC_INTERVAL as
+# a backstop. A refresh costs about SHEET_VERIFY_BLOCK rows plus the new ones
+# rather than the sheet's history.
+SHEET_FULL_RESYNC_INTERVAL = float(os.getenv("SHEET_FULL_RESYNC_INTERVAL", "3600"))
+SHEET_VERIFY_TAIL = int(os.getenv("SHEET_VERIFY_TAIL", "50"))
+SHEET_VERIFY_BLOCK = int(os.getenv("SHEET_VERIFY_BLOCK", "500"))
+
+class SheetDeltaReader:
+    """The records of a worksheet (as get_all_records returns them), read incrementally"""
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        self.generation = 0  # bumped on every full read
+        self.full_reads = 0
+        self.delta_reads = 0
+        self._lock = threading.Lock()
+        self._header = None
+        self._records = []
+        self._verify_from = 0  # first record of the next older block to re-check
+        self._full_read_at = 0.0
+
+    def _record(self, values: List[Any]) -> dict:
+        values = list(values[:len(self._header)]) + [''] * (len(self._header) - len(values))
+        return dict(zip(self._header, gspread.utils.numericise_all(values)))
+
+    @staticmethod
+    def _trim(values: List[Any]) -> List[Any]:
+        values = list(values)
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def _last_column(self) -> str:
+        return gspread.utils.rowcol_to_a1(1, max(len(self._header), 1))[:-1]
+
+    def _rows_range(self, start: int, end: Optional[int] = None) -> str:
+        """A1 range of records start..end-1 (to the end of the sheet without end)."""
+        last_row = '' if end is None else end + 1
+        return f'A{start + 2}:{self._last_column()}{last_row}'
+
+    def _read_full(self):
+        values = self.worksheet.get_values()
+        self._header = self._trim(values[0]) if values else []
+        self._records = [self._record(row) for row in values[1:]]
+        self._verify_from = 0
+        self._full_read_at = time.monotonic()
+        self.generation += 1
+        self.full_reads += 1
+
+    def read(self, full: bool = False) -> List[dict]:
+        """All records, fetching only rows appended since the last read when possible."""
+        with self._lock:
+            if full or self._header is None or time.monotonic() - self._full_read_at >= SHEET_FULL_RESYNC_INTERVAL:
+                self._read_full()
+                return list(self._records)
+            count = len(self._records)
+            tail_start = max(0, count - SHEET_VERIFY_TAIL)
+            block_start = self._verify_from if self._verify_from < tail_start else 0
+            block_end = min(block_start + SHEET_VERIFY_BLOCK, tail_start)
+            ranges = ['1:1', self._rows_range(tail_start)]
+            if block_end > block_start:
+                ranges.append(self._rows_range(block_start, block_end))
+            header, tail, *block = self.worksheet.batch_get(ranges)
+            known = count - tail_start
+            changed = (self._trim(header[0] if header else []) != self._header
+                       or len(tail) < known
+                       or [self._record(row) for row in tail[:known]] != self._records[tail_start:])
+            if block and not changed:
+                rows = list(block[0]) + [[]] * (block_end - block_start - len(block[0]))
+                changed = [self._record(row) for row in rows] != self._records[block_start:block_end]
+            if changed:
+                logger.info("Stats sheet rows changed since the last read, reading it in full")
+                self._read_full()
+                return list(self._records)
+            self._verify_from = block_end
+            if len(tail) > known:
+                self._records = self._records + [self._record(row) for row in tail[known:]]
+            self.delta_reads += 1
+            return list(self._records)
+
+    def refresh_row(self, index: int):
+        """Re-read the index-th record after it was written, so the edit isn't taken for a foreign one."""
+        with self._lock:
+            if self._header is None or index >= len(self._records):
+                return
+            values = self.worksheet.get(self._rows_range(index, index + 1))
+            row = values[0] if values else []
+            self._records = self._records[:index] + [self._record(row)] + self._records[index + 1:]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rows": len(self._records), "full_reads": self.full_reads, "delta_reads": self.delta_reads}
+
+# Stats storage
+# Every read and write of stat rows goes through stats_storage, chosen with
+# STATS_STORAGE:
+#   sheets  the Google Sheet itself (default); logged rows go through the
+#           write-behind queue above
+#   sqlite  a local database at STATS_DB_PATH, indexed on (campus, date). Reads
+#           and writes never leave the machine, so the backend also runs fully
+#           offline; when a sheet is configured, a sync thread mirrors rows both
+#           ways every STATS_SYNC_INTERVAL seconds.
+# Dashboards aggregate the whole table, so they read it once into the shared
+# snapshot (get_sheet_rows); lookups of one campus on one day (tithe entry) go
+# through find_row, which hands back a key update_value can address the row by.
+STATS_STORAGE = os.getenv("STATS_STORAGE", "sheets").strip().lower()
+STATS_DB_PATH = os.getenv("STATS_DB_PATH", os.path.join(os.path.dirname(__file__), 'data', 'stats.sqlite3'))
+STATS_SYNC_INTERVAL = float(os.getenv("STATS_SYNC_INTERVAL", "60"))
+
+def sheet_column_letter(column: str) -> str:
+    """Sheet column letter (A-U) of a SHEET_COLUMNS field"""
+    return chr(ord('A') + SHEET_COLUMNS.index(column))
+
+class StatsStorage(abc.ABC):
+    """Stat rows in the SHEET_COLUMNS layout, oldest first"""
+    name = "none"
+    reader = None  # SheetDeltaReader over the Google Sheet, if there is one
+
+    @abc.abstractmethod
+    def read_rows(self) -> List[dict]:
+        """Every row."""
+
+    @abc.abstractmethod
+    def append_rows(self, rows: List[list]):
+        """Write rows now."""
+
+    def log_rows(self, rows: List[list]):
+        """Record rows logged by a user; they show in the cached snapshot straight away."""
+        self.append_rows(rows)
+        record_appended_rows([dict(zip(SHEET_COLUMNS, row)) for row in rows])
+
+    def pending_rows(self) -> List[dict]:
+        """Logged rows that read_rows doesn't return yet."""
+        return []
+
+    @abc.abstractmethod
+    def find_row(self, campus: str, date_str: str) -> Optional[Any]:
+        """Key of the first row for the campus dated date_str (YYYY-MM-DD), or None."""
+
+    @abc.abstractmethod
+    def update_value(self, key: Any, column: str, value: Any):
+        """Set one field of the row find_row returned key for."""
+
+class SheetStatsStorage(StatsStorage):
+    """The Google Sheet"""
+    name = "sheets"
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        self.reader = SheetDeltaReader(worksheet)
+
+    def read_rows(self) -> List[dict]:
+        return self.reader.read()
+
+    def append_rows(self, rows: List[list]):
+        self.worksheet.append_rows(rows)
+
+    def log_rows(self, rows: List[list]):
+        sheet_write_queue.enqueue(rows)
+
+    def pending_rows(self) -> List[dict]:
+        return sheet_write_queue.pending_rows()
+
+    def find_row(self, campus: str, date_str: str) -> Optional[int]:
+        # Keys are positions in the sheet, which only ever grows: send anything
+        # still spooled and re-read it if the snapshot holds rows it hasn't confirmed
+        sheet_write_queue.drain()
+        get_sheet_rows(force_refresh=has_local_rows())
+        with _sheet_rows_lock:
+            rows = _sheet_rows_cache["rows"]
+            stored = len(rows) - _sheet_rows_cache["local_rows"]
+        table = get_stats_table(rows)
+        day_start = datetime.strptime(date_str, '%Y-%m-%d')
+        matches = table.select(campus, day_start, day_start + timedelta(days=1), by='Date',
+                               exact_campus=True, end_inclusive=False)
+        # Rows spooled since the drain (by another request or worker) have no position yet
+        matches = matches[matches < stored]
+        return int(matches.min()) if len(matches) else None
+
+    def update_value(self, key: int, column: str, value: Any):
+        # +2 because sheets are 1-indexed and have a header row
+        self.worksheet.update(f'{sheet_column_letter(column)}{key + 2}', [[value]])
+        self.reader.refresh_row(key)
+
+class SQLiteStatsStorage(StatsStorage):
+    """Local SQLite copy of the stats, optionally mirrored with the Google Sheet.
+
+    sheet_row records where a row sits in the sheet (NULL until it has been sent
+    there) and dirty marks rows edited locally since. date_key is Date as
+    YYYY-MM-DD (NULL if unreadable), so (campus_key, date_key) can be indexed
+    whatever format the sheet wrote the date in. id is a row's key: sync
+    updates synced rows in place rather than re-inserting them.
+    """
+    name = "sqlite"
+    # Sheet order, then rows not yet sent there
+    _ORDER = "ORDER BY sheet_row IS NULL, sheet_row, id"
+
+    def __init__(self, path: str, worksheet=None):
+        self.path = path
+        self.worksheet = worksheet
+        self.reader = SheetDeltaReader(worksheet) if worksheet else None
+        self._reader_generation = None
+        self._columns = ', '.join(f'"{column}"' for column in SHEET_COLUMNS)
+        self._sync_thread = None
+        self._sync_pid = None
+        self._start_lock = threading.Lock()
+        self._schema_ready = False
+        self.last_sync_at = None
+        self.last_sync_error = None
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        if not self._schema_ready:
+            with conn:
+                self._create_schema(conn)
+            self._schema_ready = True
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        # Untyped columns keep sheet values as they were read (numbers stay numbers)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     f"sheet_row INTEGER UNIQUE, dirty INTEGER NOT NULL DEFAULT 0, campus_key TEXT, "
+                     f"date_key TEXT, {self._columns})")
+        if 'date_key' not in [column[1] for column in conn.execute("PRAGMA table_info(stats)")]:
+            # Databases from before date_key indexed the raw Date text
+            conn.execute("DROP INDEX IF EXISTS stats_campus_date")
+            conn.execute("ALTER TABLE stats ADD COLUMN date_key TEXT")
+            conn.executemany("UPDATE stats SET date_key = ? WHERE id = ?",
+                             [(self._date_key(date), row_id) for row_id, date in conn.execute('SELECT id, "Date" FROM stats')])
+        conn.execute("CREATE INDEX IF NOT EXISTS stats_campus_day ON stats (campus_key, date_key)")
+
+    @staticmethod
+    def _date_key(value: Any) -> Optional[str]:
+        parsed = parse_row_timestamp(value)
+        return parsed.strftime('%Y-%m-%d') if parsed else None
+
+    def _insert(self, conn: sqlite3.Connection, rows: List[Any], sheet_rows: Optional[List[int]] = None):
+        """Insert rows; with sheet_rows, rows already at those sheet positions are overwritten in place."""
+        values = []
+        for i, row in enumerate(rows):
+            if isinstance(row, dict):
+                row = [row.get(column, '') for column in SHEET_COLUMNS]
+            row = list(row) + [''] * (len(SHEET_COLUMNS) - len(row))
+            values.append([sheet_rows[i] if sheet_rows else None, normalize_campus(row[2]), self._date_key(row[1])]
+                          + row[:len(SHEET_COLUMNS)])
+        placeholders = ', '.join('?' * (len(SHEET_COLUMNS) + 3))
+        query = f"INSERT INTO stats (sheet_row, campus_key, date_key, {self._columns}) VALUES ({placeholders})"
+        if sheet_rows:
+            updates = ', '.join(f'{column} = excluded.{column}' for column in ['campus_key', 'date_key'] + self._columns.split(', '))
+            query += f" ON CONFLICT (sheet_row) DO UPDATE SET dirty = 0, {updates}"
+        conn.executemany(query, values)
+
+    @staticmethod
+    def _as_record(values: tuple) -> dict:
+        return {column: '' if value is None else value for column, value in zip(SHEET_COLUMNS, values)}
+
+    def read_rows(self) -> List[dict]:
+        with closing(self._connect()) as conn:
+            return [self._as_record(values) for values in conn.execute(f"SELECT {self._columns} FROM stats {self._ORDER}")]
+
+    def select_rows(self, campus: str, start_date: Optional[str] = None,
+                    end_date: Optional[str] = None) -> List[tuple]:
+        """(id, row) pairs for one campus with Date in [start_date, end_date] (YYYY-MM-DD), from the index."""
+        query = f"SELECT id, {self._columns} FROM stats WHERE campus_key = ?"
+        params = [normalize_campus(campus)]
+        if start_date:
+            query += " AND date_key >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date_key <= ?"
+            params.append(end_date)
+        with closing(self._connect()) as conn:
+            return [(row_id, self._as_record(values)) for row_id, *values in conn.execute(f"{query} {self._ORDER}", params)]
+
+    def append_rows(self, rows: List[list]):
+        with closing(self._connect()) as conn, conn:
+            self._insert(conn, rows)
+
+    def find_row(self, campus: str, date_str: str) -> Optional[int]:
+        rows = self.select_rows(campus, date_str, date_str)
+        return rows[0][0] if rows else None
+
+    def update_value(self, key: int, column: str, value: Any):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f'UPDATE stats SET "{column}" = ?, dirty = sheet_row IS NOT NULL WHERE id = ?', (value, key))
+
+    def sync(self, full: bool = False) -> Dict[str, int]:
+        """Mirror with the sheet: push local edits, pull new sheet rows, push new local rows.
+
+        New sheet rows come from the delta reader; when it had to read the whole
+        sheet (or full is set), every synced row is overwritten with the sheet's copy.
+        """
+        if not self.worksheet:
+            return {}
+        counts = {"updated": 0, "pulled": 0, "pushed": 0}
+        with FileLock(f"{self.path}.sync.lock"), closing(self._connect()) as conn:
+            last_column = sheet_column_letter(SHEET_COLUMNS[-1])
+            for row_id, sheet_row, *values in conn.execute(
+                    f"SELECT id, sheet_row, {self._columns} FROM stats WHERE dirty = 1").fetchall():
+                self.worksheet.update(f'A{sheet_row + 2}:{last_column}{sheet_row + 2}',
+                                      [['' if value is None else value for value in values]])
+                with conn:
+                    conn.execute("UPDATE stats SET dirty = 0 WHERE id = ?", (row_id,))
+                self.reader.refresh_row(sheet_row)
+                counts["updated"] += 1
+
+            sheet_rows = self.reader.read(full=full)
+            synced = conn.execute("SELECT COUNT(*) FROM stats WHERE sheet_row IS NOT NULL").fetchone()[0]
+            with conn:
+                if self.reader.generation != self._reader_generation or len(sheet_rows) < synced:
+                    self._reader_generation = self.reader.generation
+                    conn.execute("DELETE FROM stats WHERE sheet_row >= ?", (len(sheet_rows),))
+                    synced = 0
+                new_rows = sheet_rows[synced:]
+                self._insert(conn, new_rows, list(range(synced, len(sheet_rows))))
+            counts["pulled"] = len(new_rows)
+
+            local = conn.execute(f"SELECT id, {self._columns} FROM stats WHERE sheet_row IS NULL ORDER BY id").fetchall()
+            if local:
+                self.worksheet.append_rows([['' if value is None else value for value in values[1:]] for values in local])
+                with conn:
+                    conn.executemany("UPDATE stats SET sheet_row = ? WHERE id = ?",
+                                     [(len(sheet_rows) + i, values[0]) for i, values in enumerate(local)])
+                counts["pushed"] = len(local)
+        if counts["pulled"] or counts["updated"]:
+            invalidate_sheet_rows()
+        self.last_sync_at = datetime.now(timezone.utc).isoformat()
+        return counts
+
+    def start_sync(self):
+        """Start this process's sync thread (again after a fork)."""
+        if not self.worksheet:
+            return
+        with self._start_lock:
+            if self._sync_thread and self._sync_thread.is_alive() and self._sync_pid == os.getpid():
+                return
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="stats-sync", daemon=True)
+            self._sync_pid = os.getpid()
+            self._sync_thread.start()
+
+    def _sync_loop(self):
+        while True:
+            try:
+                counts = self.sync()
+                self.last_sync_error = None
+                if any(counts.values()):
+                    logger.info(f"Stats sync with Google Sheets: {counts}")
+            except Exception as e:
+                self.last_sync_error = str(e)
+                logger.error(f"Stats sync with Google Sheets failed: {e}")
+            time.sleep(STATS_SYNC_INTERVAL)
+
+def create_stats_storage() -> Optional[StatsStorage]:
+    if STATS_STORAGE == 'sqlite':
+        return SQLiteStatsStorage(STATS_DB_PATH, worksheet=sheet if sheet.configured else None)
+    if STATS_STORAGE != 'sheets':
+        logger.warning(f"Unknown STATS_STORAGE '{STATS_STORAGE}', using Google Sheets")
+    return SheetStatsStorage(sheet) if sheet.configured else None
+
+stats_storage = create_stats_storage()
+logger.info(f"Stats storage: {stats_storage.name if stats_storage else 'none'}")
+
+def start_background_tasks():
+    """Start this process's sheet flusher and stats sync threads (again in each forked worker)."""
+    if sheet:
+        # Send anything left in the spool by an earlier run
+        sheet_write_queue.start()
+    if isinstance(stats_storage, SQLiteStatsStorage):
+        stats_storage.start_sync()
+
+# Under gunicorn's preload_app the master imports the app and must not start
+# threads before forking; the post_worker_init hook starts them in each worker
+APP_PRELOAD = os.getenv("APP_PRELOAD") == "1"
+if not APP_PRELOAD:
+    start_background_tasks()
+
 # Restore missing memory functions
 
 def parse_any_date(date_str):
@@ -221,18 +1897,7 @@ def parse_any_date(date_str):
         return datetime.now()
     
     # Try different date formats
-    formats = [
-        '%Y-%m-%d %H:%M:%S',  # 2025-07-31 12:49:11
-        '%Y-%m-%d',           # 2025-07-31
-        '%m/%d/%Y',           # 4/15/2025
-        '%m/%d/%y',           # 4/15/25
-        '%d/%m/%Y',           # 15/4/2025
-        '%d/%m/%y',           # 15/4/25
-        '%Y-%m-%dT%H:%M:%S',  # 2025-07-31T12:49:11
-        '%Y-%m-%dT%H:%M:%SZ', # 2025-07-31T12:49:11Z
-    ]
-    
-    for fmt in formats:
+    for fmt in SHEET_DATE_FORMATS:
         try:
             return datetime.strptime(str(date_str).strip(), fmt)
         except ValueError:
@@ -278,14 +1943,147 @@ def load_conversation_memory() -> Dict[str, Any]:
         logger.error(f"Failed to load conversation memory: {e}")
     return {}
 
-def save_conversation_memory(memory: Dict[str, Any]):
-    """Save conversation memory to file"""
-    try:
-        os.makedirs(os.path.dirname(conversation_memory_file), exist_ok=True)
-        with open(conversation_memory_file, 'w') as f:
-            json.dump(memory, f, indent=2)
-    except Exception as e:
-        logger.error(f"Failed to save conversation memory: {e}")
+# Append-only conversation memory
+# Each campus gets its own JSONL log under MEMORY_DIR. Logging a stat appends one
+# line under an flock (safe across gunicorn workers) instead of rewriting the
+# whole JSON file, and "last N for campus" reads only the tail of that campus's
+# log. Logs are compacted to the newest MEMORY_MAX_ENTRIES once they pass
+# MEMORY_COMPACT_BYTES. Per-campus lists from the old conversation_memory.json
+# are imported on first use; its session_stats stay where they are.
+MEMORY_DIR = os.path.join(os.path.dirname(conversation_memory_file), "memory")
+MEMORY_MAX_ENTRIES = int(os.getenv("MEMORY_MAX_ENTRIES", "500"))
+MEMORY_COMPACT_BYTES = int(os.getenv("MEMORY_COMPACT_BYTES", str(1024 * 1024)))
+LEGACY_MEMORY_KEYS = {"conversations", "session_stats", "last_updated"}
+
+class FileLock:
+    """Exclusive flock on a lock file, shared by every process using the same path.
+
+    With blocking=False it doesn't wait; acquired says whether the lock was free.
+    """
+
+    def __init__(self, path: str, blocking: bool = True):
+        self.path = path
+        self.blocking = blocking
+        self.acquired = False
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, 'a')
+        self.acquired = True
+        if fcntl:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_EX if self.blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.acquired = False
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl and self.acquired:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self.acquired = False
+        self._file.close()
+        self._file = None
+
+class ConversationMemoryStore:
+    """Per-campus append-only JSONL logs of logged stats"""
+
+    def __init__(self, directory: str, legacy_file: Optional[str] = None):
+        self.directory = directory
+        self.legacy_file = legacy_file
+        self._migrated = False
+
+    def _log_path(self, campus: str) -> str:
+        return os.path.join(self.directory, f"{quote(str(campus), safe='')}.jsonl")
+
+    def _lock(self, campus: str) -> FileLock:
+        return FileLock(f"{self._log_path(campus)}.lock")
+
+    def _migrate_legacy(self):
+        """Import per-campus lists from the old single-file memory, once."""
+        if self._migrated:
+            return
+        marker = os.path.join(self.directory, ".migrated")
+        with FileLock(os.path.join(self.directory, ".migrate.lock")):
+            if not os.path.exists(marker):
+                legacy = {}
+                if self.legacy_file and os.path.exists(self.legacy_file):
+                    try:
+                        with open(self.legacy_file, 'r') as f:
+                            legacy = json.load(f)
+                    except Exception as e:
+                        logger.error(f"Failed to read legacy conversation memory: {e}")
+                for campus, entries in legacy.items():
+                    if campus in LEGACY_MEMORY_KEYS or not isinstance(entries, list):
+                        continue
+                    with self._lock(campus), open(self._log_path(campus), 'a') as f:
+                        for entry in entries[-MEMORY_MAX_ENTRIES:]:
+                            f.write(json.dumps(entry) + "\n")
+                with open(marker, 'w'):
+                    pass
+        self._migrated = True
+
+    def append(self, campus: str, entry: Dict[str, Any]):
+        """Append one entry to the campus log, compacting it when it has grown too big."""
+        self._migrate_legacy()
+        line = json.dumps(entry) + "\n"
+        with self._lock(campus):
+            with open(self._log_path(campus), 'a') as f:
+                f.write(line)
+                size = f.tell()
+            if size > MEMORY_COMPACT_BYTES:
+                self._compact_locked(campus)
+
+    def recent(self, campus: str, limit: int) -> List[Dict[str, Any]]:
+        """The newest `limit` entries for a campus, oldest first, read from the end of its log."""
+        self._migrate_legacy()
+        if limit <= 0:
+            return []
+        try:
+            with open(self._log_path(campus), 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                data = b''
+                while position > 0 and data.count(b'\n') <= limit:
+                    step = min(8192, position)
+                    position -= step
+                    f.seek(position)
+                    data = f.read(step) + data
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in data.splitlines()[-limit:]:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # first line of the tail may be partial
+        return entries
+
+    def count(self, campus: str) -> int:
+        """Number of entries in the campus log."""
+        self._migrate_legacy()
+        try:
+            with open(self._log_path(campus), 'rb') as f:
+                return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(65536), b''))
+        except FileNotFoundError:
+            return 0
+
+    def compact(self, campus: str):
+        """Rewrite the campus log keeping only the newest MEMORY_MAX_ENTRIES entries."""
+        with self._lock(campus):
+            self._compact_locked(campus)
+
+    def _compact_locked(self, campus: str):
+        entries = self.recent(campus, MEMORY_MAX_ENTRIES)
+        path = self._log_path(campus)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, path)
+        logger.info(f"Compacted conversation memory for {campus} to {len(entries)} entries")
+
+conversation_memory = ConversationMemoryStore(MEMORY_DIR, legacy_file=conversation_memory_file)
 
 print("[DEBUG] Creating Flask app instance")
 app = Flask(__name__, static_folder='static', template_folder='templates')
@@ -306,20 +2104,157 @@ login_manager.login_message_category = 'info'
 print("[DEBUG] Flask-Login configured")
 
 # User management functions
+# Users registry
+# users.json is parsed once per process and kept in memory with id and username
+# indexes, so auth checks on every request do no file I/O. The file's mtime is
+# checked at most every USERS_RELOAD_INTERVAL seconds to pick up edits made by
+# another worker; edits made through save_users_database apply immediately.
+USERS_FILE = os.path.join(os.path.dirname(__file__), 'users.json')
+USERS_RELOAD_INTERVAL = float(os.getenv("USERS_RELOAD_INTERVAL", "5"))
+
+class _AnyCampus:
+    """Campus set that contains every campus (and no campus)."""
+
+    def __contains__(self, campus) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return "ANY_CAMPUS"
+
+ANY_CAMPUS = _AnyCampus()
+NO_CAMPUS = frozenset()
+
+# Campus-scoped permissions: the role sets 'all', 'assigned_campus' or 'none';
+# the value is the grant used when the role does not set it (or sets anything else)
+SCOPED_PERMISSIONS = {
+    'log_stats': 'none',
+    'recall_stats': 'none',
+    'dashboard_access': 'all',
+    'query_access': 'all'
+}
+# On/off permissions
+FLAG_PERMISSIONS = ['manage_users', 'system_settings', 'finance_access', 'cross_location_comparison']
+
+def compile_role_permissions(permissions: Dict[str, Any]) -> Dict[str, str]:
+    """Reduce a role's permission settings to 'all', 'assigned' or 'none' per permission."""
+    compiled = {}
+    for permission, default in SCOPED_PERMISSIONS.items():
+        value = permissions.get(permission)
+        if value == 'all':
+            compiled[permission] = 'all'
+        elif value == 'assigned_campus' and permission != 'log_stats':
+            compiled[permission] = 'assigned'
+        elif value == 'none':
+            compiled[permission] = 'none'
+        else:
+            compiled[permission] = default
+    for permission in FLAG_PERMISSIONS:
+        compiled[permission] = 'all' if permissions.get(permission) else 'none'
+    return compiled
+
+class UsersRegistry:
+    """Process-wide users and roles, indexed by id and username"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {"users": {}, "roles": {}}
+        self._by_username = {}
+        self._role_grants = {}
+        # Roles missing from the file get the defaults in SCOPED_PERMISSIONS
+        self._default_grants = compile_role_permissions({})
+        self._permission_sets = {}
+        self.version = 0
+        self._mtime_ns = None
+        self._checked_at = 0.0
+
+    def _index(self, data: Dict[str, Any]):
+        by_username = {}
+        for user_data in data.get('users', {}).values():
+            username = user_data.get('username')
+            current = by_username.get(username)
+            # Prefer the first active account if a username appears twice
+            if current is None or (not current.get('active') and user_data.get('active')):
+                by_username[username] = user_data
+        self._data = data
+        self._by_username = by_username
+        self._role_grants = {role: compile_role_permissions(role_data.get('permissions', {}))
+                             for role, role_data in data.get('roles', {}).items()}
+        self._permission_sets = {}
+        self.version += 1
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < USERS_RELOAD_INTERVAL and self._mtime_ns is not None:
+            return
+        with self._lock:
+            if now - self._checked_at < USERS_RELOAD_INTERVAL and self._mtime_ns is not None:
+                return
+            self._checked_at = now
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+                if mtime_ns == self._mtime_ns:
+                    return
+                with open(self.path, 'r') as f:
+                    self._index(json.load(f))
+                self._mtime_ns = mtime_ns
+            except Exception as e:
+                logger.error(f"Failed to load users database: {e}")
+
+    def data(self) -> Dict[str, Any]:
+        """The whole database; treat as read-only."""
+        self._refresh()
+        return self._data
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        return self._data.get('users', {}).get(user_id)
+
+    def find_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        return self._by_username.get(username)
+
+    def role_permissions(self, role: str) -> Dict[str, Any]:
+        self._refresh()
+        return self._data.get('roles', {}).get(role, {}).get('permissions', {})
+
+    def permission_sets(self, role: str, campus: Optional[str]) -> Dict[str, Any]:
+        """Permission -> campuses a user with this role and assigned campus may use it for."""
+        self._refresh()
+        key = (role, campus)
+        sets = self._permission_sets.get(key)
+        if sets is None:
+            assigned = ANY_CAMPUS if campus == 'all_campuses' else frozenset({None, campus})
+            sets = {}
+            for permission, grant in self._role_grants.get(role, self._default_grants).items():
+                sets[permission] = ANY_CAMPUS if grant == 'all' else assigned if grant == 'assigned' else NO_CAMPUS
+            self._permission_sets[key] = sets
+        return sets
+
+    def replace(self, data: Dict[str, Any]):
+        """Install data just written to the users file."""
+        with self._lock:
+            self._index(data)
+            try:
+                self._mtime_ns = os.stat(self.path).st_mtime_ns
+            except OSError:
+                self._mtime_ns = None
+            self._checked_at = time.monotonic()
+
+users_registry = UsersRegistry(USERS_FILE)
+
 def load_users_database():
-    """Load users from JSON file"""
-    try:
-        with open(os.path.join(os.path.dirname(__file__), 'users.json'), 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error(f"Failed to load users database: {e}")
-        return {"users": {}, "roles": {}}
+    """Return a copy of the users database that callers may edit and save"""
+    return copy.deepcopy(users_registry.data())
 
 def save_users_database(data):
     """Save users to JSON file"""
     try:
-        with open(os.path.join(os.path.dirname(__file__), 'users.json'), 'w') as f:
+        tmp_path = f"{USERS_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, USERS_FILE)
+        users_registry.replace(copy.deepcopy(data))
         return True
     except Exception as e:
         logger.error(f"Failed to save users database: {e}")
@@ -365,51 +2300,8 @@ class User(UserMixin):
         
     def has_permission(self, permission_type, campus=None):
         """Check if user has specific permission"""
-        users_db = load_users_database()
-        role_permissions = users_db.get('roles', {}).get(self.role, {}).get('permissions', {})
-        
-        if permission_type == 'log_stats':
-            return role_permissions.get('log_stats') == 'all'
-        elif permission_type == 'recall_stats':
-            recall_perm = role_permissions.get('recall_stats')
-            if recall_perm == 'all':
-                return True
-            elif recall_perm == 'assigned_campus':
-                return campus is None or campus == self.campus or self.campus == 'all_campuses'
-            elif recall_perm == 'none':
-                return False
-            else:
-                return False
-        elif permission_type == 'dashboard_access':
-            dashboard_perm = role_permissions.get('dashboard_access')
-            if dashboard_perm == 'all':
-                return True
-            elif dashboard_perm == 'assigned_campus':
-                return campus is None or campus == self.campus or self.campus == 'all_campuses'
-            elif dashboard_perm == 'none':
-                return False
-            else:
-                return True  # Default to allow if not specified
-        elif permission_type == 'query_access':
-            query_perm = role_permissions.get('query_access')
-            if query_perm == 'all':
-                return True
-            elif query_perm == 'assigned_campus':
-                return campus is None or campus == self.campus or self.campus == 'all_campuses'
-            elif query_perm == 'none':
-                return False
-            else:
-                return True  # Default to allow if not specified
-        elif permission_type == 'manage_users':
-            return role_permissions.get('manage_users', False)
-        elif permission_type == 'system_settings':
-            return role_permissions.get('system_settings', False)
-        elif permission_type == 'finance_access':
-            return role_permissions.get('finance_access', False)
-        elif permission_type == 'cross_location_comparison':
-            return role_permissions.get('cross_location_comparison', False)
-        
-        return False
+        allowed = users_registry.permission_sets(self.role, self.campus).get(permission_type, NO_CAMPUS)
+        return campus in allowed
         
     def get_accessible_campuses(self):
         """Get list of campuses this user can access for data recall"""
@@ -423,33 +2315,32 @@ class User(UserMixin):
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID for Flask-Login"""
-    users_db = load_users_database()
-    user_data = users_db.get('users', {}).get(user_id)
+    user_data = users_registry.get_user(user_id)
     if user_data:
         return User(user_data)
     return None
 
 def authenticate_user(username, password):
     """Authenticate user and return User object if valid"""
-    users_db = load_users_database()
-    
     print(f"[DEBUG] Attempting login for username: {username}")
     
     # Find user by username
-    for user_id, user_data in users_db.get('users', {}).items():
-        if user_data['username'] == username and user_data['active']:
-            print(f"[DEBUG] Found user: {user_data['username']} (ID: {user_id})")
-            user = User(user_data)
-            if user.check_password(password):
-                print(f"[DEBUG] Password check successful for user: {username}")
-                # Update last login
-                user_data['last_login'] = datetime.now().isoformat()
+    user_data = users_registry.find_by_username(username)
+    if user_data and user_data['active']:
+        print(f"[DEBUG] Found user: {user_data['username']} (ID: {user_data['id']})")
+        user = User(user_data)
+        if user.check_password(password):
+            print(f"[DEBUG] Password check successful for user: {username}")
+            # Update last login
+            users_db = load_users_database()
+            if user_data['id'] in users_db.get('users', {}):
+                users_db['users'][user_data['id']]['last_login'] = datetime.now().isoformat()
                 save_users_database(users_db)
-                return user
-            else:
-                print(f"[DEBUG] Password check failed for user: {username}")
-        elif user_data['username'] == username and not user_data['active']:
-            print(f"[DEBUG] User found but inactive: {username}")
+            return user
+        else:
+            print(f"[DEBUG] Password check failed for user: {username}")
+    elif user_data:
+        print(f"[DEBUG] User found but inactive: {username}")
     
     print(f"[DEBUG] No user found with username: {username}")
     return None
@@ -485,6 +2376,8 @@ def save_campuses_database(data):
         
         with open(os.path.join(os.path.dirname(__file__), 'campuses.json'), 'w') as f:
             json.dump(data, f, indent=2)
+        invalidate_user_campuses()
+        invalidate_campus_matcher()
         return True
     except Exception as e:
         logger.error(f"Failed to save campuses database: {e}")
@@ -507,79 +2400,187 @@ def get_active_campuses():
     active_campuses.sort(key=lambda x: (x['id'] != 'all_campuses', x['name']))
     return active_campuses
 
+USER_CAMPUSES_TTL = 60
+_user_campuses_lock = threading.Lock()
+_user_campuses_cache = {}
+
+def _build_campuses_for_user(role: str, user_campus: Optional[str]) -> dict:
+    campuses_db = load_campuses_database()
+    # Roles limited to their assigned campus see only it; everyone else sees every active campus
+    recall_campuses = users_registry.permission_sets(role, user_campus).get('recall_stats', NO_CAMPUS)
+    if isinstance(recall_campuses, frozenset) and recall_campuses:
+        campus_ids = [user_campus]
+    else:
+        campus_ids = [campus_id for campus_id in campuses_db.get('campuses', {}) if campus_id != 'all_campuses']
+    
+    accessible_campuses = []
+    for campus_id in campus_ids:
+        campus_data = campuses_db.get('campuses', {}).get(campus_id)
+        if campus_data and campus_data.get('active', False):
+            accessible_campuses.append({
+                'id': campus_id,
+                'name': campus_data.get('display_name', campus_data.get('name', campus_id)),
+                'full_name': campus_data.get('name', campus_id)
+            })
+    
+    return {
+        'campuses': sorted(accessible_campuses, key=lambda x: x['name'])
+    }
+
+def invalidate_user_campuses():
+    """Forget cached per-user campus lists (after campus or user edits)."""
+    with _user_campuses_lock:
+        _user_campuses_cache.clear()
+
 def get_campuses_for_user():
     """Get campuses accessible to current user based on their role"""
     try:
         if not hasattr(current_user, 'role'):
             return {'campuses': []}
-            
-        campuses_db = load_campuses_database()
-        accessible_campuses = []
-        
-        # Finance team and admin roles can access all campuses
-        if current_user.role in ['finance', 'admin', 'senior_leader']:
-            for campus_id, campus_data in campuses_db.get('campuses', {}).items():
-                if campus_data.get('active', False) and campus_id != 'all_campuses':
-                    accessible_campuses.append({
-                        'id': campus_id,
-                        'name': campus_data.get('display_name', campus_data.get('name', campus_id)),
-                        'full_name': campus_data.get('name', campus_id)
-                    })
-        elif current_user.role == 'campus_pastor':
-            # Campus pastors only see their own campus
-            user_campus = current_user.campus
-            if user_campus in campuses_db.get('campuses', {}):
-                campus_data = campuses_db['campuses'][user_campus]
-                if campus_data.get('active', False):
-                    accessible_campuses.append({
-                        'id': user_campus,
-                        'name': campus_data.get('display_name', campus_data.get('name', user_campus)),
-                        'full_name': campus_data.get('name', user_campus)
-                    })
-        else:
-            # Other roles get all campuses by default (except all_campuses)
-            for campus_id, campus_data in campuses_db.get('campuses', {}).items():
-                if campus_data.get('active', False) and campus_id != 'all_campuses':
-                    accessible_campuses.append({
-                        'id': campus_id,
-                        'name': campus_data.get('display_name', campus_data.get('name', campus_id)),
-                        'full_name': campus_data.get('name', campus_id)
-                    })
         
-        return {
-            'campuses': sorted(accessible_campuses, key=lambda x: x['name'])
-        }
+        key = (current_user.id, current_user.role, current_user.campus, users_registry.version)
+        now = time.monotonic()
+        with _user_campuses_lock:
+            cached = _user_campuses_cache.get(key)
+        if cached and now - cached[0] < USER_CAMPUSES_TTL:
+            return copy.deepcopy(cached[1])
+        result = _build_campuses_for_user(current_user.role, current_user.campus)
+        with _user_campuses_lock:
+            _user_campuses_cache[key] = (now, result)
+        return copy.deepcopy(result)
     except Exception as e:
         logger.error(f"Error getting campuses for user: {e}")
         return {'campuses': []}
 
-def get_campus_detection_patterns():
-    """Get dynamic campus detection patterns from configuration with natural speech support"""
+# Campus detection
+# Every way detect_campus recognises a campus (configured detection phrases,
+# common voice-recognition misspellings, partial words and church-wide phrases)
+# is compiled into one regex per campuses.json version. Each tier keeps its old
+# precedence: the winning match is the one from the earliest tier and, within a
+# tier, the earliest campus, wherever it appears in the text.
+CAMPUSES_FILE = os.path.join(os.path.dirname(__file__), 'campuses.json')
+CAMPUSES_RELOAD_INTERVAL = float(os.getenv("CAMPUSES_RELOAD_INTERVAL", "5"))
+
+# Common misspellings from voice recognition (whole words)
+CAMPUS_FUZZY_PATTERNS = {
+    'south': [
+        r'\bsouth\b', r'\bsowth\b', r'\bsow\b', r'\bsowf\b', r'\bsowth campus\b',
+        r'\bsouth campus\b', r'\bsow campus\b', r'\bsowf campus\b'
+    ],
+    'salisbury': [
+        r'\bsalisbury\b', r'\bsalsbury\b', r'\bsalsbery\b', r'\bsalisbery\b',
+        r'\bsalisbury campus\b', r'\bsalsbury campus\b', r'\bsalsbery campus\b',
+        r'\bsalisbery campus\b'
+    ],
+    'paradise': [
+        r'\bparadise\b', r'\bparadice\b', r'\bparidise\b', r'\bparidice\b',
+        r'\bparadise campus\b', r'\bparadice campus\b', r'\bparidise campus\b',
+        r'\bparidice campus\b'
+    ],
+    'adelaide_city': [
+        r'\badelaide\b', r'\badelaide city\b', r'\badelaide city campus\b',
+        r'\badelaide campus\b', r'\badelaide city campus\b'
+    ]
+}
+
+# Partial matches anywhere in the text (for voice recognition errors)
+CAMPUS_PARTIAL_MATCHES = {
+    'south': ['sow', 'sowth', 'sowf', 'south'],
+    'salisbury': ['sals', 'salis', 'salsbury', 'salisbury'],
+    'paradise': ['parad', 'paradis', 'paradice'],
+    'adelaide_city': ['adela', 'adelaide']
+}
+
+# With no campus named, these make a question church-wide
+CHURCH_WIDE_INDICATORS = [
+    'how many', 'what is', "what's", 'give me', 'tell me', 'what was', 'how much',
+    'total', 'average', 'church', 'this weekend', 'this week', 'this month', 'this year',
+    'all campuses', 'church wide', 'across all', 'every campus', 'all locations'
+]
+
+def get_campus_detection_phrases() -> Dict[str, List[str]]:
+    """Detection phrases of every active campus, in configuration order"""
     campuses_db = load_campuses_database()
-    patterns = {}
-    
+    phrases = {}
     for campus_id, campus_data in campuses_db.get('campuses', {}).items():
         if campus_data.get('active', False):
-            detection_patterns = campus_data.get('detection_patterns', [campus_id])
-            
-            # Create flexible patterns that handle natural speech
-            flexible_patterns = []
-            for pattern in detection_patterns:
-                # Add the base pattern
-                flexible_patterns.append(rf'\b{re.escape(pattern)}\b')
-                # Add common speech patterns
-                flexible_patterns.append(rf'\bfor {re.escape(pattern)}\b')
-                flexible_patterns.append(rf'\bat {re.escape(pattern)}\b')
-                flexible_patterns.append(rf'\b{re.escape(pattern)} campus\b')
-                flexible_patterns.append(rf'\bstats for {re.escape(pattern)}\b')
-                flexible_patterns.append(rf'\blog stats for {re.escape(pattern)}\b')
-                flexible_patterns.append(rf'\breporting for {re.escape(pattern)}\b')
-            
-            # Join patterns with OR regex
-            pattern = '(?:' + '|'.join(flexible_patterns) + ')'
-            patterns[campus_id] = pattern
-    
-    return patterns
+            phrases[campus_id] = [p for p in campus_data.get('detection_patterns', [campus_id]) if p]
+    return phrases
+
+class CampusMatcher:
+    """All campus detection tiers compiled into a single regex"""
+
+    def __init__(self, campus_phrases: Dict[str, List[str]]):
+        alternatives = []
+        self._groups = []  # group number -> (campus id, tier), in precedence order
+
+        def add(campus_id: str, tier: str, body: str):
+            alternatives.append(f"(?P<g{len(self._groups)}>{body})")
+            self._groups.append((campus_id, tier))
+
+        # Configured phrases, whole words ("for south", "south campus" etc. all contain one)
+        self.campus_ids = list(campus_phrases)
+        self.campus_patterns = {}
+        for campus_id, phrases in campus_phrases.items():
+            if phrases:
+                body = r'\b(?:' + '|'.join(re.escape(phrase) for phrase in phrases) + r')\b'
+                self.campus_patterns[campus_id] = re.compile(body, re.IGNORECASE)
+                add(campus_id, 'config', body)
+        for campus_id, patterns in CAMPUS_FUZZY_PATTERNS.items():
+            add(campus_id, 'fuzzy', '|'.join(patterns))
+        for campus_id, partials in CAMPUS_PARTIAL_MATCHES.items():
+            add(campus_id, 'partial', '|'.join(re.escape(partial) for partial in partials))
+        add('all_campuses', 'church_wide', '|'.join(re.escape(phrase) for phrase in CHURCH_WIDE_INDICATORS))
+
+        # Zero-width so every position is tried; the first alternative that matches
+        # at a position is the one with the highest precedence there
+        self._regex = re.compile('(?=' + '|'.join(alternatives) + ')', re.IGNORECASE)
+
+    def match(self, text: str) -> Optional[tuple]:
+        """(campus id, tier) of the highest-precedence match in text, or None."""
+        best = None
+        for found in self._regex.finditer(text):
+            group = int(found.lastgroup[1:])
+            if best is None or group < best:
+                best = group
+                if best == 0:
+                    break
+        return self._groups[best] if best is not None else None
+
+    def mentions(self, campus_id: str, text: str) -> bool:
+        """Whether one of the campus's configured phrases appears in text."""
+        pattern = self.campus_patterns.get(campus_id)
+        return bool(pattern and pattern.search(text))
+
+    def mentioned(self, text: str) -> List[str]:
+        """Every campus named in (lowercased) text by its id or a configured phrase, in configuration order."""
+        return [campus_id for campus_id in self.campus_ids
+                if campus_id.lower() in text or self.mentions(campus_id, text)]
+
+_campus_matcher_lock = threading.Lock()
+_campus_matcher_cache = {"matcher": None, "mtime_ns": None, "checked_at": 0.0}
+
+def get_campus_matcher() -> CampusMatcher:
+    """The matcher for the current campuses.json, rebuilt only when the file changes."""
+    now = time.monotonic()
+    cache = _campus_matcher_cache
+    if cache["matcher"] is not None and now - cache["checked_at"] < CAMPUSES_RELOAD_INTERVAL:
+        return cache["matcher"]
+    with _campus_matcher_lock:
+        try:
+            mtime_ns = os.stat(CAMPUSES_FILE).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if cache["matcher"] is None or mtime_ns != cache["mtime_ns"]:
+            cache["matcher"] = CampusMatcher(get_campus_detection_phrases())
+            cache["mtime_ns"] = mtime_ns
+        cache["checked_at"] = now
+        return cache["matcher"]
+
+def invalidate_campus_matcher():
+    """Rebuild the campus matcher on next use (after editing campuses.json)."""
+    with _campus_matcher_lock:
+        _campus_matcher_cache["matcher"] = None
 
 print("[DEBUG] Campus management functions defined")
 
@@ -662,110 +2663,55 @@ patterns = {
     "volunteers": r"(\d+)\s+(?:volunteers?|team\s+members?|servers?)"
 }
 
-# Campus detection patterns (loaded dynamically)
-def get_campus_patterns():
-    """Get campus patterns dynamically from configuration"""
-    return get_campus_detection_patterns()
+# Every stat pattern is "<number> <label>", so an utterance is scanned once for
+# numbers and each label is tried, anchored, right after each number. A stat
+# takes its first matching number in the text, exactly as a per-pattern
+# re.search would, whichever other labels also match at the same place.
+STAT_NUMBER_PATTERN = re.compile(r"(\d+)\s+")
+STAT_LABEL_PATTERNS = {
+    key: re.compile(pattern[len(STAT_NUMBER_PATTERN.pattern):], re.IGNORECASE)
+    for key, pattern in patterns.items()
+}
+
+def scan_stats(text: str) -> Dict[str, str]:
+    """First number found for each stat key in text, in pattern order"""
+    found = {}
+    pending = list(STAT_LABEL_PATTERNS.items())
+    for number in STAT_NUMBER_PATTERN.finditer(text):
+        label_start = number.end()
+        still_pending = []
+        for key, label in pending:
+            if label.match(text, label_start):
+                found[key] = number.group(1)
+            else:
+                still_pending.append((key, label))
+        pending = still_pending
+        if not pending:
+            break
+    return {key: found[key] for key in STAT_LABEL_PATTERNS if key in found}
 
 def detect_campus(text: str) -> Optional[str]:
     """Detect campus from text using dynamic patterns from configuration with fuzzy matching for voice recognition"""
-    text_lower = text.lower()
-    
-    # Get dynamic campus patterns
-    campus_patterns = get_campus_patterns()
-    
-    # Check each campus pattern with exact matching first
-    for campus_id, pattern in campus_patterns.items():
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return campus_id
-    
-    # Enhanced fuzzy matching for voice recognition with common misspellings
-    fuzzy_campus_patterns = {
-        'south': [
-            r'\bsouth\b', r'\bsowth\b', r'\bsow\b', r'\bsowf\b', r'\bsowth campus\b',
-            r'\bsouth campus\b', r'\bsow campus\b', r'\bsowf campus\b'
-        ],
-        'salisbury': [
-            r'\bsalisbury\b', r'\bsalsbury\b', r'\bsalsbery\b', r'\bsalisbery\b',
-            r'\bsalisbury campus\b', r'\bsalsbury campus\b', r'\bsalsbery campus\b',
-            r'\bsalisbery campus\b'
-        ],
-        'paradise': [
-            r'\bparadise\b', r'\bparadice\b', r'\bparidise\b', r'\bparidice\b',
-            r'\bparadise campus\b', r'\bparadice campus\b', r'\bparidise campus\b',
-            r'\bparidice campus\b'
-        ],
-        'adelaide_city': [
-            r'\badelaide\b', r'\badelaide city\b', r'\badelaide city campus\b',
-            r'\badelaide campus\b', r'\badelaide city campus\b'
-        ]
-    }
-    
-    # Check fuzzy patterns for each campus
-    for campus_id, patterns in fuzzy_campus_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                logger.info(f"Fuzzy campus match: '{text}' -> {campus_id}")
-                return campus_id
-    
-    # Check for partial matches (for voice recognition errors)
-    partial_matches = {
-        'south': ['sow', 'sowth', 'sowf', 'south'],
-        'salisbury': ['sals', 'salis', 'salsbury', 'salisbury'],
-        'paradise': ['parad', 'paradis', 'paradice'],
-        'adelaide_city': ['adela', 'adelaide']
-    }
-    
-    for campus_id, partials in partial_matches.items():
-        for partial in partials:
-            if partial in text_lower:
-                logger.info(f"Partial campus match: '{text}' -> {campus_id}")
-                return campus_id
-    
-    # If no specific campus is mentioned, default to all campuses for church-wide queries
-    # Check if this looks like a church-wide stat query
-    church_wide_indicators = [
-        'how many', 'what is', "what's", 'give me', 'tell me', 'what was', 'how much',
-        'total', 'average', 'church', 'this weekend', 'this week', 'this month', 'this year',
-        'all campuses', 'church wide', 'across all', 'every campus', 'all locations'
-    ]
-    
-    has_church_wide_query = any(indicator in text_lower for indicator in church_wide_indicators)
-    
-    if has_church_wide_query:
-        return "all_campuses"
-    
-    return None
-
-def get_all_campuses_data(rows: list, start_date: datetime, end_date: datetime) -> list:
-    """Get data from all campuses within the date range"""
-    all_campus_data = []
-    
-    for row in rows:
-        try:
-            timestamp_str = row.get("Timestamp", "")
-            if timestamp_str:
-                # Handle different timestamp formats
-                if "T" in timestamp_str:
-                    row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                else:
-                    row_date = parse_any_date(timestamp_str)
-                # Check if row date is within the specified range
-                if start_date <= row_date <= end_date:
-                    all_campus_data.append(row)
-            else:
-                # If no timestamp, include the row (fallback)
-                all_campus_data.append(row)
-        except Exception as e:
-            logger.warning(f"Could not parse timestamp for row: {e}")
-            all_campus_data.append(row)
-    
-    return all_campus_data
-
-def generate_cross_campus_insights(question: str, analysis_data: dict, filtered_rows: list) -> str:
-    """Generate intelligent AI insights for cross-campus data"""
-    if not claude:
-        return "I'd be happy to analyze your church-wide data, but I need to connect to my AI assistant first."
+    match = get_campus_matcher().match(text.lower())
+    if not match:
+        return None
+    campus_id, tier = match
+    if tier == 'fuzzy':
+        logger.info(f"Fuzzy campus match: '{text}' -> {campus_id}")
+    elif tier == 'partial':
+        logger.info(f"Partial campus match: '{text}' -> {campus_id}")
+    return campus_id
+
+def get_all_campuses_data(rows: list, start_date: datetime, end_date: datetime) -> list:
+    """Get data from all campuses within the date range"""
+    # Rows without a readable timestamp are included as a fallback
+    table = get_stats_table(rows)
+    return table.take(table.select(start_date=start_date, end_date=end_date, include_undated=True))
+
+def generate_cross_campus_insights(question: str, analysis_data: dict, filtered_rows: list) -> str:
+    """Generate intelligent AI insights for cross-campus data"""
+    if not claude:
+        return "I'd be happy to analyze your church-wide data, but I need to connect to my AI assistant first."
     
     # Prepare data summary for Claude
     data_summary = f"""
@@ -844,14 +2790,7 @@ Give them friendly, helpful insights about their church-wide data. Focus on:
 Be warm and specific. Use their data to give meaningful insights about Futures Church as a whole. Keep it under 120 words and sound conversational."""
 
     try:
-        response = claude.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=300,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        response_text = response.content[0].text.strip() if hasattr(response.content[0], 'text') else str(response.content[0])
-        return response_text
+        return cached_claude_completion(prompt, model="claude-3-haiku-20240307", max_tokens=300, temperature=0.7)
         
     except Exception as e:
         logger.error(f"Claude API error in generate_cross_campus_insights: {e}")
@@ -865,15 +2804,40 @@ def extract_stats_with_context(text: str, campus: str) -> Dict[str, Any]:
         "Raw_Text": text
     }
     # Only extract a stat if its context matches, do not fallback to first number
-    for key, pattern in patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            # Convert to string for Google Sheets compatibility
-            result[key.replace("_", " ").title()] = str(match.group(1))
-            logger.info(f"Extracted {key}: {match.group(1)}")
+    for key, value in scan_stats(text).items():
+        # Already a string for Google Sheets compatibility
+        result[key.replace("_", " ").title()] = value
+        logger.info(f"Extracted {key}: {value}")
     # No fallback for total_attendance: only extract if context matches
     return result
 
+def encouragement_kind(text: str) -> str:
+    """Which reply generate_encouragement_with_memory gives: query, request, stat_logging or insight.
+
+    Only stat_logging is answered without calling Claude.
+    """
+    # Check if this contains actual numbers (indicating stat logging)
+    text_lower = text.lower()
+    contains_numbers = any(char.isdigit() for char in text)
+    
+    # Check for explicit query indicators
+    is_query = any(word in text_lower for word in [
+        'how many', 'what is', 'what was', 'what were', 'average', 'last week', 'this week', 'total', 'count', 'query', 'data', 'has had', 'had this year', 'had this month',
+        'compare', 'comparison', 'vs', 'versus', 'between', 'year over year',
+        'review', 'annual review', 'mid year review', 'mid-year review', 'report', 'summary', 'dashboard', 'snapshot', 'full report', 'overview', 'recap', 'stats summary', 'stat summary', 'stat report', 'stat overview', 'stat recap',
+        'annual', 'mid year', 'mid-year', 'midyear'
+    ]) or any(word in text_lower for word in ['q1', 'q2', 'q3', 'q4', 'quarter 1', 'quarter 2', 'quarter 3', 'quarter 4', 'first quarter', 'second quarter', 'third quarter', 'fourth quarter'])
+    
+    # Check if this is a request to log stats (no numbers yet)
+    is_request = not contains_numbers and any(word in text_lower for word in ['log', 'record', 'enter', 'add', 'can i log', 'want to log', 'help me log', 'can we log'])
+    
+    if is_query:
+        return "query"
+    if is_request:
+        return "request"
+    # If it has numbers and is not explicitly a query, treat as stat logging
+    return "stat_logging" if contains_numbers else "insight"
+
 def generate_encouragement_with_memory(text: str, campus: str, memory: Dict[str, Any]) -> List[str]:
     """Generate conversational responses using Claude with conversation memory"""
     if not claude:
@@ -900,23 +2864,8 @@ def generate_encouragement_with_memory(text: str, campus: str, memory: Dict[str,
                 date_str = "recently"
             context += f"{i}. {date_str}: {raw_text}\n"
     
-    # Check if this contains actual numbers (indicating stat logging)
-    text_lower = text.lower()
-    contains_numbers = any(char.isdigit() for char in text)
-    
-    # Check for explicit query indicators
-    is_query = any(word in text_lower for word in [
-        'how many', 'what is', 'what was', 'what were', 'average', 'last week', 'this week', 'total', 'count', 'query', 'data', 'has had', 'had this year', 'had this month',
-        'compare', 'comparison', 'vs', 'versus', 'between', 'year over year',
-        'review', 'annual review', 'mid year review', 'mid-year review', 'report', 'summary', 'dashboard', 'snapshot', 'full report', 'overview', 'recap', 'stats summary', 'stat summary', 'stat report', 'stat overview', 'stat recap',
-        'annual', 'mid year', 'mid-year', 'midyear'
-    ]) or any(word in text_lower for word in ['q1', 'q2', 'q3', 'q4', 'quarter 1', 'quarter 2', 'quarter 3', 'quarter 4', 'first quarter', 'second quarter', 'third quarter', 'fourth quarter'])
-    
-    # Check if this is a request to log stats (no numbers yet)
-    is_request = not contains_numbers and any(word in text_lower for word in ['log', 'record', 'enter', 'add', 'can i log', 'want to log', 'help me log', 'can we log'])
-    
-    # If it has numbers and is not explicitly a query, treat as stat logging
-    is_stat_logging = contains_numbers and not is_query
+    kind = encouragement_kind(text)
+    is_query, is_request, is_stat_logging = kind == "query", kind == "request", kind == "stat_logging"
     
     if is_query:
         prompt = f"""You are a helpful church AI assistant. A leader from the {campus} campus is asking for data:
@@ -993,10 +2942,95 @@ Generate EXACTLY 2 short insights (max 12 words each). Focus on different trends
 
 # Update: allow generate_audio_with_elevenlabs to accept a filename for saving audio
 
-def generate_audio_with_elevenlabs(text: str, filename: Optional[str] = None) -> Optional[str]:
-    """Generate audio using ElevenLabs API, optionally saving to a specific filename"""
+# TTS audio cache
+# Spoken responses repeat a lot ("Thanks for inputting those stats for South
+# campus!"), so synthesized audio is stored under a sha256 of everything that
+# affects the sound. Files are written atomically, touched on every hit, and the
+# least recently used ones are evicted once the directory is over quota or a file
+# has not been used for TTS_CACHE_MAX_AGE seconds.
+TEMP_AUDIO_DIR = os.path.join(os.path.dirname(__file__), "temp_audio")
+TTS_MODEL_ID = "eleven_monolingual_v1"
+TTS_VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.5}
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+TTS_CACHE_MAX_AGE = float(os.getenv("TTS_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+_tts_cache_lock = threading.Lock()
+_tts_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "errors": 0}
+
+def tts_cache_key(text: str, voice_id: Optional[str] = None, model_id: str = TTS_MODEL_ID,
+                  voice_settings: Optional[Dict[str, Any]] = None) -> str:
+    """Full sha256 of the text and every synthesis parameter."""
+    payload = json.dumps({
+        "text": text,
+        "voice_id": voice_id or elevenlabs_voice_id,
+        "model_id": model_id,
+        "voice_settings": voice_settings or TTS_VOICE_SETTINGS
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def tts_cache_filename(text: str) -> str:
+    """Name of the cached audio file for text, relative to TEMP_AUDIO_DIR."""
+    return f"tts_{tts_cache_key(text)}.mp3"
+
+def _count_tts(stat: str, amount: int = 1):
+    with _tts_cache_lock:
+        _tts_cache_stats[stat] += amount
+
+def get_tts_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters for this process, plus the current disk usage."""
+    with _tts_cache_lock:
+        stats = dict(_tts_cache_stats)
+    files = _list_tts_files()
+    stats["files"] = len(files)
+    stats["bytes"] = sum(size for _, size, _ in files)
+    return stats
+
+def _list_tts_files() -> List[tuple]:
+    """(path, size, mtime) for every audio file in TEMP_AUDIO_DIR."""
+    files = []
+    try:
+        with os.scandir(TEMP_AUDIO_DIR) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.mp3'):
+                    info = entry.stat()
+                    files.append((entry.path, info.st_size, info.st_mtime))
+    except OSError:
+        pass
+    return files
+
+def _evict_tts_cache():
+    """Drop expired audio, then the least recently used files until under quota."""
+    files = sorted(_list_tts_files(), key=lambda item: item[2])
+    cutoff = time.time() - TTS_CACHE_MAX_AGE
+    total = sum(size for _, size, _ in files)
+    evicted = 0
+    for path, size, mtime in files:
+        if mtime >= cutoff and total <= TTS_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            evicted += 1
+        except OSError:
+            pass
+        total -= size
+    if evicted:
+        _count_tts("evictions", evicted)
+        logger.info(f"Evicted {evicted} cached audio files")
+
+def generate_audio_with_elevenlabs(text: str) -> Optional[str]:
+    """Return the URL of the spoken text, synthesizing it with ElevenLabs on a cache miss"""
     if not elevenlabs_api_key:
         return None
+    audio_filename = tts_cache_filename(text)
+    full_path = os.path.join(TEMP_AUDIO_DIR, audio_filename)
+    if os.path.exists(full_path):
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(full_path)
+            _count_tts("hits")
+            return f"/temp_audio/{audio_filename}"
+        except OSError:
+            pass  # Evicted in the meantime; synthesize again
+    _count_tts("misses")
     try:
         url = f"https://api.elevenlabs.io/v1/text-to-speech/{elevenlabs_voice_id}"
         headers = {
@@ -1006,43 +3040,218 @@ def generate_audio_with_elevenlabs(text: str, filename: Optional[str] = None) ->
         }
         data = {
             "text": text,
-            "model_id": "eleven_monolingual_v1",
-            "voice_settings": {
-                "stability": 0.5,
-                "similarity_boost": 0.5
-            }
+            "model_id": TTS_MODEL_ID,
+            "voice_settings": TTS_VOICE_SETTINGS
         }
-        response = requests.post(url, json=data, headers=headers)
+        elevenlabs_breaker.check()
+        try:
+            response = elevenlabs_session.post(url, json=data, headers=headers, timeout=ELEVENLABS_TIMEOUT)
+        except Exception:
+            elevenlabs_breaker.record_failure()
+            raise
+        if response.status_code in HTTP_RETRY_STATUSES:
+            elevenlabs_breaker.record_failure()
+        else:
+            elevenlabs_breaker.record_success()
         if response.status_code == 200:
             # Ensure temp_audio directory exists in backend folder
-            temp_audio_dir = os.path.join(os.path.dirname(__file__), "temp_audio")
-            os.makedirs(temp_audio_dir, exist_ok=True)
-            
-            if filename:
-                # If filename provided, use it as-is
-                audio_filename = filename  
-                full_path = audio_filename
-            else:
-                # Generate filename and full path
-                audio_filename = f"response_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-                full_path = os.path.join(temp_audio_dir, audio_filename)
-            
-            with open(full_path, "wb") as f:
+            os.makedirs(TEMP_AUDIO_DIR, exist_ok=True)
+            tmp_path = f"{full_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
                 f.write(response.content)
+            os.replace(tmp_path, full_path)
             logger.info(f"Generated audio file: {full_path}")
+            _evict_tts_cache()
             
             # Return URL path for the audio file
             return f"/temp_audio/{audio_filename}"
         else:
+            _count_tts("errors")
             logger.error(f"ElevenLabs API error: {response.status_code} - {response.text}")
             return None
     except Exception as e:
+        _count_tts("errors")
         logger.error(f"Failed to generate audio with ElevenLabs: {e}")
         return None
 
-def detect_missing_stats(text: str, campus: str) -> List[str]:
+# Background TTS
+# process_voice starts synthesis as soon as it knows what it will say and returns
+# the (content-addressed) audio URL straight away; the rest of the request runs in
+# parallel. A .pending marker next to the target file lets /temp_audio in any
+# worker wait for synthesis that is still in flight, and a .failed marker tells it
+# that synthesis gave up so it can answer with an error instead of waiting. Pending
+# markers older than TTS_WAIT_TIMEOUT are left behind by a worker that died and are
+# ignored.
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "4"))
+TTS_WAIT_TIMEOUT = 30
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+_tts_in_flight_lock = threading.Lock()
+_tts_in_flight = {}
+
+def _tts_pending_marker(audio_filename: str) -> str:
+    return os.path.join(TEMP_AUDIO_DIR, f"{audio_filename}.pending")
+
+def _tts_failed_marker(audio_filename: str) -> str:
+    return os.path.join(TEMP_AUDIO_DIR, f"{audio_filename}.failed")
+
+def _tts_pending(audio_filename: str) -> bool:
+    """True while another worker's pending marker for audio_filename is still fresh."""
+    try:
+        return time.time() - os.path.getmtime(_tts_pending_marker(audio_filename)) < TTS_WAIT_TIMEOUT
+    except OSError:
+        return False
+
+def _synthesize_in_background(text: str, audio_filename: str) -> Optional[str]:
+    audio_url = None
+    try:
+        audio_url = generate_audio_with_elevenlabs(text)
+        return audio_url
+    finally:
+        if audio_url is None:
+            logger.error(f"Background audio generation failed for {audio_filename}")
+            try:
+                with open(_tts_failed_marker(audio_filename), 'w'):
+                    pass
+            except OSError:
+                pass
+        try:
+            os.remove(_tts_pending_marker(audio_filename))
+        except OSError:
+            pass
+        with _tts_in_flight_lock:
+            _tts_in_flight.pop(audio_filename, None)
+
+def start_audio_generation(text: str) -> Optional[str]:
+    """Start synthesizing text on the TTS pool and return the URL it will be served from."""
+    if not elevenlabs_api_key:
+        return None
+    audio_filename = tts_cache_filename(text)
+    if os.path.exists(os.path.join(TEMP_AUDIO_DIR, audio_filename)):
+        return generate_audio_with_elevenlabs(text)
+    with _tts_in_flight_lock:
+        if audio_filename not in _tts_in_flight:
+            os.makedirs(TEMP_AUDIO_DIR, exist_ok=True)
+            try:
+                os.remove(_tts_failed_marker(audio_filename))
+            except OSError:
+                pass
+            with open(_tts_pending_marker(audio_filename), 'w'):
+                pass
+            _tts_in_flight[audio_filename] = _tts_executor.submit(_synthesize_in_background, text, audio_filename)
+    return f"/temp_audio/{audio_filename}"
+
+def wait_for_audio(audio_filename: str, timeout: float = TTS_WAIT_TIMEOUT) -> bool:
+    """Wait for in-flight synthesis of audio_filename; True once the file exists."""
+    full_path = os.path.join(TEMP_AUDIO_DIR, audio_filename)
+    with _tts_in_flight_lock:
+        future = _tts_in_flight.get(audio_filename)
+    if future is not None:
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Background audio generation failed for {audio_filename}: {e}")
+    else:
+        # Started by another worker process: poll until its marker goes away or goes stale
+        deadline = time.time() + timeout
+        while not os.path.exists(full_path) and _tts_pending(audio_filename) and time.time() < deadline:
+            time.sleep(0.1)
+    return os.path.exists(full_path)
+
+def audio_generation_failed(audio_filename: str) -> bool:
+    """True if the last attempt to synthesize audio_filename gave up without a file."""
+    return (not os.path.exists(os.path.join(TEMP_AUDIO_DIR, audio_filename))
+            and os.path.exists(_tts_failed_marker(audio_filename)))
+
+# Background insight jobs
+# Claude insight calls can take several seconds. Instead of holding a gunicorn
+# worker for the round-trip, process_voice hands them to this pool (unless the
+# client sends async_insights: false) and returns straight away; the client then
+# polls /api/insights/<id> or listens on its /stream endpoint. Plain stat logging
+# is answered with a canned confirmation and never becomes a job. Job state lives
+# in INSIGHT_JOBS_DIR so any worker process can answer for a job started by another.
+INSIGHT_JOBS_DIR = os.path.join(os.path.dirname(__file__), "data", "insight_jobs")
+INSIGHT_WORKERS = int(os.getenv("INSIGHT_WORKERS", "4"))
+INSIGHT_JOB_TTL = 3600
+_insight_executor = ThreadPoolExecutor(max_workers=INSIGHT_WORKERS, thread_name_prefix="insights")
+
+def _insight_job_path(job_id: str) -> str:
+    return os.path.join(INSIGHT_JOBS_DIR, f"{job_id}.json")
+
+def _save_insight_job(job: Dict[str, Any]):
+    """Write job state atomically so readers never see a partial file."""
+    os.makedirs(INSIGHT_JOBS_DIR, exist_ok=True)
+    tmp_path = f"{_insight_job_path(job['id'])}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(job, f)
+    os.replace(tmp_path, _insight_job_path(job['id']))
+
+def load_insight_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Load a job's state, or None if the id is unknown or malformed."""
+    if not re.fullmatch(r'[0-9a-f]{32}', job_id or ''):
+        return None
+    try:
+        with open(_insight_job_path(job_id), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _prune_insight_jobs():
+    """Remove job files older than INSIGHT_JOB_TTL."""
+    cutoff = time.time() - INSIGHT_JOB_TTL
+    try:
+        for name in os.listdir(INSIGHT_JOBS_DIR):
+            path = os.path.join(INSIGHT_JOBS_DIR, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+    except OSError:
+        pass
+
+def submit_insight_job(func, *args, owner: Optional[str] = None, with_audio: bool = False) -> str:
+    """Run an insight generator in the background and return the job id to poll."""
+    job = {
+        "id": uuid.uuid4().hex,
+        "owner": owner,
+        "status": "pending",
+        "created_at": time.time(),
+        "text": None,
+        "insights": [],
+        "audio_url": None,
+        "error": None
+    }
+    _prune_insight_jobs()
+    _save_insight_job(job)
+
+    def run():
+        try:
+            result = func(*args)
+            insights = result if isinstance(result, list) else [result]
+            job["insights"] = insights
+            job["text"] = insights[0] if insights else ""
+            if with_audio and elevenlabs_api_key and job["text"]:
+                job["audio_url"] = generate_audio_with_elevenlabs(job["text"])
+            job["status"] = "done"
+        except Exception as e:
+            logger.error(f"Insight job {job['id']} failed: {e}")
+            job["status"] = "error"
+            job["error"] = str(e)
+        job["finished_at"] = time.time()
+        _save_insight_job(job)
+
+    _insight_executor.submit(run)
+    return job["id"]
+
+def insight_job_links(job_id: str) -> Dict[str, str]:
+    """Response fields telling the client where to fetch a job's result."""
+    return {
+        "insights_job": job_id,
+        "insights_url": f"/api/insights/{job_id}",
+        "insights_stream_url": f"/api/insights/{job_id}/stream"
+    }
+
+def detect_missing_stats(text: str, campus: str, extracted: Optional[Dict[str, Any]] = None) -> List[str]:
     """Detect what stats might be missing and suggest follow-up questions"""
-    extracted = extract_stats_with_context(text, campus)
+    if extracted is None:
+        extracted = extract_stats_with_context(text, campus)
     missing = []
     
     # Check for common missing stats
@@ -1125,208 +3334,17 @@ def parse_date_range(question: str) -> tuple:
 
 def detect_comparison_request(question: str) -> tuple:
     """Detect if this is a comparison request and extract years/periods to compare"""
-    question_lower = question.lower()
-    current_year = datetime.now().year
-    import re
-    
-    # Look for comparison keywords - more precise list
-    comparison_keywords = [
-        'compare', 'comparison', 'vs', 'versus', 'against', 'side by side', 'year over year',
-        'between', 'difference', 'compared to', 'compared with', 'relative to',
-        'q1 vs', 'q2 vs', 'q3 vs', 'q4 vs', 'quarter 1 vs', 'quarter 2 vs', 'quarter 3 vs', 'quarter 4 vs',
-        'first quarter vs', 'second quarter vs', 'third quarter vs', 'fourth quarter vs',
-        'mid-year vs', 'mid year vs', 'midyear vs', 'year to year',
-        'growth', 'trend', 'improvement', 'decline', 'increase', 'decrease', 'change',
-        'how are we doing', 'how did we do', 'performance', 'results'
-    ]
-    
-    # Check for explicit comparison indicators
-    explicit_comparison_indicators = [
-        'compare', 'comparison', 'vs', 'versus', 'against', 'side by side', 'year over year',
-        'between', 'difference', 'compared to', 'compared with', 'relative to',
-        'year to year', 'growth', 'trend', 'improvement', 'decline', 'increase', 'decrease', 'change'
-    ]
-    
-    # Check for specific comparison patterns
-    has_explicit_comparison = any(indicator in question_lower for indicator in explicit_comparison_indicators)
-    
-    # Check for "this year" which should NOT be a comparison
-    if 'this year' in question_lower or 'current year' in question_lower:
+    details = _detect_period_comparison(parse_utterance(question))
+    if details is None:
         return False, [], None, None
-    
-    # Check for "annual" or "yearly" only if they appear with comparison context
-    annual_keywords = ['annual', 'yearly']
-    has_annual_keyword = any(keyword in question_lower for keyword in annual_keywords)
-    
-    # Only treat as comparison if there's explicit comparison language OR annual/yearly with comparison context
-    is_comparison = has_explicit_comparison or (has_annual_keyword and any(word in question_lower for word in ['compare', 'comparison', 'vs', 'versus', 'against', 'between', 'difference']))
-    logger.info(f"[COMPARE DEBUG] Question: '{question}' -> Lower: '{question_lower}'")
-    logger.info(f"[COMPARE DEBUG] Comparison keywords found: {[kw for kw in comparison_keywords if kw in question_lower]}")
-    logger.info(f"[COMPARE DEBUG] Is comparison: {is_comparison}")
-    if not is_comparison:
-        return False, [], None, None
-    
-    # Detect mid-year comparison
-    if 'mid-year' in question_lower or 'mid year' in question_lower or 'midyear' in question_lower:
-        years = re.findall(r'\b(20\d{2})\b', question)
-        if len(years) >= 2:
-            return True, [int(years[0]), int(years[1])], 'mid_year', None
-        elif len(years) == 1:
-            y = int(years[0])
-            return True, [y-1, y], 'mid_year', None
-        else:
-            return True, [current_year-1, current_year], 'mid_year', None
-
-    # Detect quarterly comparison (Q1, Q2, Q3, Q4) - improved detection
-    quarter = None
-    quarter_patterns = [
-        (r'\bq1\b', 1), (r'\bq2\b', 2), (r'\bq3\b', 3), (r'\bq4\b', 4),
-        (r'\bquarter 1\b', 1), (r'\bquarter 2\b', 2), (r'\bquarter 3\b', 3), (r'\bquarter 4\b', 4),
-        (r'\bfirst quarter\b', 1), (r'\bsecond quarter\b', 2), (r'\bthird quarter\b', 3), (r'\bfourth quarter\b', 4)
-    ]
-    
-    for pattern, q in quarter_patterns:
-        if re.search(pattern, question_lower):
-            quarter = q
-            break
-    
-    if quarter:
-        years = re.findall(r'\b(20\d{2})\b', question)
-        if len(years) >= 2:
-            return True, [int(years[0]), int(years[1])], 'quarterly', quarter
-        elif len(years) == 1:
-            y = int(years[0])
-            return True, [y-1, y], 'quarterly', quarter
-        else:
-            return True, [current_year-1, current_year], 'quarterly', quarter
-
-    # Detect monthly comparison
-    months = {
-        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-        'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
-        'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-    }
-    
-    # Check for monthly comparison patterns like "march vs april" or "monthly comparison"
-    monthly_indicators = ['monthly comparison', 'monthly vs', 'month vs', 'month comparison']
-    has_monthly_indicator = any(indicator in question_lower for indicator in monthly_indicators)
-    
-    # Also check for month names in comparison
-    mentioned_months = []
-    for month_name, month_num in months.items():
-        if month_name in question_lower:
-            mentioned_months.append(month_num)
-    
-    if has_monthly_indicator or len(mentioned_months) >= 1:
-        # If we found month names, use the first one; otherwise use current month
-        month = mentioned_months[0] if mentioned_months else datetime.now().month
-        
-        years = re.findall(r'\b(20\d{2})\b', question)
-        if len(years) >= 2:
-            return True, [int(years[0]), int(years[1])], 'monthly', month
-        elif len(years) == 1:
-            y = int(years[0])
-            return True, [y-1, y], 'monthly', month
-        else:
-            return True, [current_year-1, current_year], 'monthly', month
-
-    # Default: annual comparison
-    years = re.findall(r'\b(20\d{2})\b', question)
-    if len(years) >= 2:
-        return True, [int(year) for year in years], 'annual', None
-    elif len(years) == 1:
-        y = int(years[0])
-        return True, [y-1, y], 'annual', None
-    else:
-        return True, [current_year-1, current_year], 'annual', None
+    return True, details["years"], details["period_type"], details["period_value"]
 
 def detect_cross_location_comparison(question: str) -> tuple:
     """Detect if this is a cross-location comparison request and extract campuses to compare"""
-    question_lower = question.lower()
-    
-    logger.info(f"[CROSS_LOCATION_DEBUG] Processing question: '{question}'")
-    
-    # Check if user has permission for cross-location comparison
-    if not current_user.is_authenticated or not current_user.has_permission('cross_location_comparison'):
-        logger.info(f"[CROSS_LOCATION_DEBUG] User doesn't have cross_location_comparison permission")
-        return False, [], None, None
-    
-    # Look for cross-location comparison keywords
-    cross_location_keywords = [
-        'compare', 'vs', 'versus', 'against', 'between', 'difference',
-        'south vs', 'barker vs', 'paradise vs', 'adelaide vs', 'salisbury vs',
-        'south compared to', 'barker compared to', 'paradise compared to', 'adelaide compared to', 'salisbury compared to',
-        'how many', 'did south have', 'did barker have', 'did paradise have', 'did adelaide have', 'did salisbury have',
-        'south and', 'barker and', 'paradise and', 'adelaide and', 'salisbury and'
-    ]
-    
-    # Check for explicit cross-location comparison indicators
-    has_cross_location_indicator = any(indicator in question_lower for indicator in cross_location_keywords)
-    logger.info(f"[CROSS_LOCATION_DEBUG] Has cross-location indicator: {has_cross_location_indicator}")
-    
-    if not has_cross_location_indicator:
-        logger.info(f"[CROSS_LOCATION_DEBUG] No cross-location indicator found")
-        return False, [], None, None
-    
-    # Get all available campuses
-    available_campuses = get_campuses_for_user()
-    campus_names = [campus['id'] for campus in available_campuses.get('campuses', []) if campus['id'] != 'all_campuses']
-    logger.info(f"[CROSS_LOCATION_DEBUG] Available campuses: {campus_names}")
-    
-    # Get campus detection patterns for better matching
-    campus_patterns = get_campus_detection_patterns()
-    
-    # Detect mentioned campuses in the question
-    mentioned_campuses = []
-    for campus_id in campus_names:
-        # Check if campus name appears in question
-        if campus_id.lower() in question_lower:
-            mentioned_campuses.append(campus_id)
-            logger.info(f"[CROSS_LOCATION_DEBUG] Found campus '{campus_id}' directly in question")
-        else:
-            # Check campus detection patterns
-            if campus_id in campus_patterns:
-                pattern = campus_patterns[campus_id]
-                if re.search(pattern, question_lower, re.IGNORECASE):
-                    mentioned_campuses.append(campus_id)
-                    logger.info(f"[CROSS_LOCATION_DEBUG] Found campus '{campus_id}' via pattern")
-    
-    # Also check for common campus name variations
-    campus_variations = {
-        'mount_barker': ['barker', 'mt barker', 'mount barker'],
-        'south': ['south'],
-        'paradise': ['paradise'],
-        'adelaide_city': ['adelaide', 'city', 'cbd'],
-        'salisbury': ['salisbury']
-    }
-    
-    for campus_id, variations in campus_variations.items():
-        if campus_id in campus_names:  # Only check if campus is available to user
-            for variation in variations:
-                if variation.lower() in question_lower and campus_id not in mentioned_campuses:
-                    mentioned_campuses.append(campus_id)
-                    logger.info(f"[CROSS_LOCATION_DEBUG] Found campus '{campus_id}' via variation '{variation}'")
-                    break
-    
-    logger.info(f"[CROSS_LOCATION_DEBUG] Mentioned campuses: {mentioned_campuses}")
-    
-    # If no specific campuses mentioned, return False
-    if len(mentioned_campuses) < 2:
-        logger.info(f"[CROSS_LOCATION_DEBUG] Not enough campuses mentioned (found {len(mentioned_campuses)})")
+    details = _detect_cross_location(parse_utterance(question))
+    if details is None:
         return False, [], None, None
-    
-    # Detect time period
-    current_year = datetime.now().year
-    years = re.findall(r'\b(20\d{2})\b', question)
-    year = int(years[0]) if years else current_year
-    
-    # Detect specific stat being compared
-    specific_stat = detect_specific_stat_in_comparison(question)
-    
-    logger.info(f"[CROSS_LOCATION] Detected cross-location comparison: campuses={mentioned_campuses}, year={year}, stat={specific_stat}")
-    
-    return True, mentioned_campuses, year, specific_stat
+    return True, details["campuses"], details["year"], details["stat"]
 
 def handle_cross_location_comparison(question: str, campuses: list, year: int, specific_stat: str = None) -> dict:
     """Handle cross-location comparison requests between multiple campuses"""
@@ -1335,50 +3353,29 @@ def handle_cross_location_comparison(question: str, campuses: list, year: int, s
     try:
         # Get data for each campus
         campus_reports = []
-        for campus in campuses:
-            # Get data for the specific year
-            start_date = datetime(year, 1, 1)
-            end_date = datetime(year, 12, 31)
-            
-            # Get rows data
-            rows = []
-            if sheet:
-                try:
-                    rows = sheet.get_all_records()
-                except Exception as e:
-                    logger.error(f"Failed to get stats from Google Sheets: {e}")
-                    rows = []
-            
-            # Filter rows for this campus and year
-            filtered_rows = []
-            for row in rows:
-                try:
-                    if isinstance(row, dict):
-                        campus_field = row.get('Campus', '').lower()
-                        if campus.lower() in campus_field:
-                            timestamp_str = row.get("Timestamp", "")
-                            if timestamp_str:
-                                if "T" in timestamp_str:
-                                    row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                                else:
-                                    row_date = parse_any_date(timestamp_str)
-                                if start_date <= row_date <= end_date:
-                                    filtered_rows.append(row)
-                except Exception as e:
-                    logger.warning(f"Could not process row: {e}")
-                    continue
-            
-            # Calculate stats for this campus
-            if filtered_rows:
-                analysis_data = calculate_stats_from_filtered_rows(filtered_rows)
-                
-                            # Create report for this campus
+        rows = []
+        if stats_storage:
+            try:
+                rows = get_sheet_rows()
+            except Exception as e:
+                logger.error(f"Failed to get stats from Google Sheets: {e}")
+                rows = []
+        table = get_stats_table(rows)
+        
+        # Get data for the specific year
+        start_date = datetime(year, 1, 1)
+        end_date = datetime(year, 12, 31)
+        
+        # Partition the year by campus once, then compute every campus on the worker pool
+        campus_stats = summarize_campuses(table, campuses, start_date, end_date)
+        for campus, (selection, analysis_data) in zip(campuses, campus_stats):
+            # Create report for this campus
             campus_report = {
                 "campus": display_campus_name(campus),
                 "original_campus": campus,  # Keep the original campus name
                 "year": year,
                 "stats": analysis_data,
-                "entry_count": len(filtered_rows)
+                "entry_count": len(selection)
             }
             campus_reports.append(campus_report)
         
@@ -1466,388 +3463,141 @@ def handle_cross_location_comparison(question: str, campuses: list, year: int, s
 
 # Handler for mid-year and quarterly comparisons
 
-def query_data_internal(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Internal function to query data - handles all types of stat queries with popup support"""
-    question = str(data.get("question", "")).strip()
-    if not question:
-        return {"error": "Missing question"}
+def answer_cross_location_comparison(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare stats between named campuses"""
+    question = parse.text
+    campuses, year, specific_stat = parse.details["campuses"], parse.details["year"], parse.details["stat"]
+    result = handle_cross_location_comparison(question, campuses, year, specific_stat)
 
-    # Extract campus from question using the same detection logic
-    campus = detect_campus(question)
-    question_lower = question.lower()
-    
-    # Smart campus defaulting based on user role when no campus is mentioned
-    if not campus:
-        if current_user.is_authenticated:
-            if current_user.role == 'campus_pastor':
-                # Campus pastors get their assigned campus by default
-                campus = getattr(current_user, 'campus', 'main')
-                logger.info(f"[QUERY] No campus mentioned - using campus pastor's campus: {campus}")
-            elif current_user.role in ['senior_pastor', 'lead_pastor', 'admin']:
-                # Senior leadership gets all campuses by default
-                campus = 'all_campuses'
-                logger.info(f"[QUERY] No campus mentioned - using all campuses for senior leadership")
-            else:
-                # Other roles default to main or all_campuses
-                campus = 'all_campuses'
-                logger.info(f"[QUERY] No campus mentioned - defaulting to all campuses")
-        else:
-            campus = 'all_campuses'
+    # Ensure the response has the correct format for the frontend
+    if result.get('comparison'):
+        # Add popup flag for comparison results
+        result['popup'] = True
+        return result
     else:
-        logger.info(f"[QUERY] Campus detected from question: {campus}")
-    
-    logger.info(f"[QUERY] Processing question: '{question}' | Final Campus: {campus}")
-    
-    # 1. CROSS-LOCATION COMPARISON REQUESTS - CHECK FIRST
-    is_cross_location, campuses, year, specific_stat = detect_cross_location_comparison(question)
-    
-    if is_cross_location:
-        result = handle_cross_location_comparison(question, campuses, year, specific_stat)
-        
-        # Ensure the response has the correct format for the frontend
-        if result.get('comparison'):
-            # Add popup flag for comparison results
-            result['popup'] = True
-            return result
-        else:
-            logger.error(f"[QUERY] Cross-location comparison failed to return proper format")
-            return {
-                "error": "Failed to generate cross-location comparison",
-                "text": "Sorry, I couldn't generate that cross-location comparison. Please try a different query.",
-                "popup": True
-            }
+        logger.error(f"[QUERY] Cross-location comparison failed to return proper format")
+        return {
+            "error": "Failed to generate cross-location comparison",
+            "text": "Sorry, I couldn't generate that cross-location comparison. Please try a different query.",
+            "popup": True
+        }
 
-    # 2. COMPARISON REQUESTS (Year over year, quarterly, etc.)
-    is_comparison, years, period_type, period_value = detect_comparison_request(question)
-    if is_comparison:
-        logger.info(f"[QUERY] Detected comparison: years={years}, period={period_type}, value={period_value}")
-        campus = detect_campus(question) or campus or "main"
-        
-        # Add comprehensive logging
-        logger.info(f"[QUERY] Processing comparison for campus: {campus}")
-        logger.info(f"[QUERY] Question: '{question}'")
-        
-        result = handle_period_comparison_request(question, campus, years, period_type, period_value)
-        
-        # Ensure the response has the correct format for the frontend
-        if result.get('comparison'):
-            # Add popup flag for comparison results
-            result['popup'] = True
-            logger.info(f"[QUERY] Comparison result keys: {list(result.keys())}")
-            return result
-        else:
-            logger.error(f"[QUERY] Comparison failed to return proper format")
-            return {
-                "error": "Failed to generate comparison",
-                "text": "Sorry, I couldn't generate that comparison. Please try a different query.",
-                "popup": True
-            }
+def answer_period_comparison(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare a campus across years, quarters or other periods"""
+    question = parse.text
+    years, period_type, period_value = parse.details["years"], parse.details["period_type"], parse.details["period_value"]
+    logger.info(f"[QUERY] Detected comparison: years={years}, period={period_type}, value={period_value}")
+    campus = parse.campus or campus or "main"
+
+    # Add comprehensive logging
+    logger.info(f"[QUERY] Processing comparison for campus: {campus}")
+    logger.info(f"[QUERY] Question: '{question}'")
+
+    result = handle_period_comparison_request(question, campus, years, period_type, period_value)
+
+    # Ensure the response has the correct format for the frontend
+    if result.get('comparison'):
+        # Add popup flag for comparison results
+        result['popup'] = True
+        logger.info(f"[QUERY] Comparison result keys: {list(result.keys())}")
+        return result
+    else:
+        logger.error(f"[QUERY] Comparison failed to return proper format")
+        return {
+            "error": "Failed to generate comparison",
+            "text": "Sorry, I couldn't generate that comparison. Please try a different query.",
+            "popup": True
+        }
 
-    # 2. REVIEW INTENTS (Annual, Quarterly, Mid-Year Reviews)
-    if is_review_intent(question):
-        logger.info(f"[QUERY] Detected review intent")
-        campus = detect_campus(question) or campus or "main"
-        import re
-        years = re.findall(r'\b(20\d{2})\b', question)
-        if len(years) == 0:
-            years = [datetime.now().year]
-        elif len(years) == 1:
-            years = [int(y) for y in years]
+def answer_review(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Annual, quarterly, monthly or mid-year review for a campus or the whole church"""
+    logger.info(f"[QUERY] Detected review intent")
+    campus = parse.campus or campus or "main"
+    years = parse.years or [datetime.now().year]
+    # Check if this is a cross-campus request
+    if campus == "all_campuses" or parse.matches(CROSS_CAMPUS_QUESTION_PATTERN):
+        # Detect specific review type for cross-campus
+        review_type, period_value, year = parse.details["review"]
+        year = years[0] if years else year  # Use detected year or default
+
+        # Map review types to cross-campus report types
+        if review_type == "quarterly":
+            cross_campus_report = generate_cross_campus_report('quarterly', f"Q{period_value} {year}")
+            spoken_summary = f"Here's your Q{period_value} {year} quarterly review for All Campuses."
+        elif review_type == "monthly":
+            month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
+                          'July', 'August', 'September', 'October', 'November', 'December']
+            month_name = month_names[period_value]
+            cross_campus_report = generate_cross_campus_report('monthly', f"{month_name} {year}")
+            spoken_summary = f"Here's your {month_name} {year} monthly review for All Campuses."
+        elif review_type == "mid_year":
+            cross_campus_report = generate_cross_campus_report('mid_year', f"Jan-Jun {year}")
+            spoken_summary = f"Here's your {year} mid-year review for All Campuses."
         else:
-            years = [int(y) for y in years]
-        # Check if this is a cross-campus request
-        if campus == "all_campuses" or any(indicator in question_lower for indicator in ['all campuses', 'futures church', 'church wide', 'across all']):  
-            # Detect specific review type for cross-campus
-            review_type, period_value, year = detect_review_type(question)
-            year = years[0] if years else year  # Use detected year or default
-            
-            # Map review types to cross-campus report types
-            if review_type == "quarterly":
-                cross_campus_report = generate_cross_campus_report('quarterly', f"Q{period_value} {year}")
-                spoken_summary = f"Here's your Q{period_value} {year} quarterly review for All Campuses."
-            elif review_type == "monthly":
-                month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                              'July', 'August', 'September', 'October', 'November', 'December']
-                month_name = month_names[period_value]
-                cross_campus_report = generate_cross_campus_report('monthly', f"{month_name} {year}")
-                spoken_summary = f"Here's your {month_name} {year} monthly review for All Campuses."
-            elif review_type == "mid_year":
-                cross_campus_report = generate_cross_campus_report('mid_year', f"Jan-Jun {year}")
-                spoken_summary = f"Here's your {year} mid-year review for All Campuses."
-            else:
-                # Default to annual
-                cross_campus_report = generate_cross_campus_report('annual', "")
-                spoken_summary = f"Here's your annual review for All Campuses campus in {year}."
-            
-            stats = cross_campus_report.get('stats', {})
-            
-            # Create report format for popup
-            report_data = [
-                {"label": "Total Attendance", "total": stats.get('attendance', {}).get('total', 0), "average": stats.get('attendance', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
-                {"label": "New People", "total": stats.get('new_people', {}).get('total', 0), "average": stats.get('new_people', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
-                {"label": "New Christians", "total": stats.get('new_christians', {}).get('total', 0), "average": stats.get('new_christians', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
-                {"label": "Youth Attendance", "total": stats.get('youth', {}).get('total', 0), "average": stats.get('youth', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
-                {"label": "Kids Total", "total": stats.get('kids', {}).get('total', 0), "average": stats.get('kids', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
-                {"label": "Connect Groups", "total": stats.get('connect_groups', {}).get('total', 0), "average": stats.get('connect_groups', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
-                {"label": "Volunteers", "total": 0, "average": 0, "count": 0, "year": year}  # Volunteers not tracked in cross-campus yet
-            ]
-            
-            return {
-                "report": report_data,
-                "text": spoken_summary,
-                "popup": True,
-                "stats": stats,
-                "campus": "All Campuses",
-                "year": year
-            }
-        else:
-            # Single campus review - detect specific review type
-            review_type, period_value, year = detect_review_type(question)
-            year = years[0] if years else year  # Use detected year or default
-            
-            if review_type == "quarterly":
-                report = generate_quarterly_report(campus, year, period_value)
-            elif review_type == "monthly":
-                report = generate_monthly_report(campus, year, period_value)
-            elif review_type == "mid_year":
-                report = generate_mid_year_report(campus, year)
-            else:
-                # Default to annual review
-                report = generate_full_stat_report(campus, [year])
-            
-            report["popup"] = True  # Enable popup for reviews
-            return report
-
-    # 2. WEEKEND REVIEWS
-    if any(phrase in question_lower for phrase in WEEKEND_REVIEW_PHRASES):
-        logger.info(f"[QUERY] Detected weekend review")
-        
-        # First check for pastor names (priority over campus detection)
-        pastor_campus = detect_pastor_name(question)
-        if pastor_campus:
-            campus = pastor_campus
-            logger.info(f"[QUERY] Pastor detected - using campus: {campus}")
-        else:
-            campus = detect_campus(question)
-            logger.info(f"[QUERY] No pastor detected - using campus detection: {campus}")
-        if campus and campus != "all_campuses":
-            # Campus-specific weekend review
-            start_date = datetime.now() - timedelta(days=7)
-            end_date = datetime.now()
-            rows = []
-            if sheet:
-                try:
-                    rows = sheet.get_all_records()
-                except Exception as e:
-                    logger.error(f"Failed to get stats from Google Sheets: {e}")
-                    rows = []
-            if not rows:
-                memory = load_conversation_memory()
-                campus_history = memory.get("session_stats", {}).get(campus, [])
-                rows = campus_history
-            
-            campus_normalized = normalize_campus(campus)
-            filtered_rows = []
-            for row in rows:
-                row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-                if row_campus == campus_normalized or campus_normalized in row_campus:
-                    timestamp_str = row.get("Timestamp", "")
-                    if timestamp_str:
-                        try:
-                            if "T" in timestamp_str:
-                                row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                            else:
-                                row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                            if start_date <= row_date <= end_date:
-                                filtered_rows.append(row)
-                        except Exception:
-                            continue
-            
-            logger.info(f"[WEEKEND_REVIEW] Found {len(rows)} total rows, {len(filtered_rows)} filtered rows for {campus} in last 7 days")
-            analysis_data = calculate_stats_from_filtered_rows(filtered_rows)
-            logger.info(f"[WEEKEND_REVIEW] Analysis data: {analysis_data}")
-            
-            # Check if we have any data
-            has_data = (analysis_data.get('total_entries', 0) > 0 or 
-                       any(analysis_data.get(key, 0) > 0 for key in ['total_attendance', 'total_new_people', 'total_new_christians', 'total_youth', 'total_kids', 'total_connect_groups']))
-            
-            if has_data:
-                # Create detailed summary for display
-                detailed_summary = (
-                    f"{display_campus_name(campus)} Weekend Review\n"
-                    f"Total Attendance: {analysis_data.get('total_attendance', 0):,}\n"
-                    f"New People: {analysis_data.get('total_new_people', 0):,}\n"
-                    f"New Christians: {analysis_data.get('total_new_christians', 0):,}\n"
-                    f"Youth: {analysis_data.get('total_youth', 0):,}\n"
-                    f"Kids: {analysis_data.get('total_kids', 0):,}\n"
-                    f"Connect Groups: {analysis_data.get('total_connect_groups', 0):,}"
-                )
-                
-                # Create spoken summary 
-                spoken_summary = f"Here's your weekend review for {display_campus_name(campus)} campus."
-            else:
-                # No data found
-                detailed_summary = (
-                    f"{display_campus_name(campus)} Weekend Review\n"
-                    f"No stats have been logged for {display_campus_name(campus)} campus in the last 7 days.\n"
-                    f"This could mean:\n"
-                    f"• Stats haven't been entered yet for this weekend\n"
-                    f"• The campus name might not match our records\n"
-                    f"• There was no service this weekend"
-                )
-                
-                # Create spoken summary 
-                spoken_summary = f"I couldn't find any weekend stats for {display_campus_name(campus)} campus in the last 7 days. You may need to enter the stats first or check if the campus name is correct."
-            
-            # Create comprehensive report with all available stats
-            report = []
-            stat_mappings = [
-                ("total_attendance", "Total Attendance", "attendance"),
-                ("total_first_time_visitors", "First Time Visitors", "first_time_visitors"),
-                ("total_information_gathered", "Information Gathered", "information_gathered"),
-                ("total_new_christians", "New Christians", "new_christians"),
-                ("total_rededications", "Rededications", "rededications"),
-                ("total_youth_attendance", "Youth Attendance", "youth_attendance"),
-                ("total_youth_salvations", "Youth Salvations", "youth_salvations"),
-                ("total_youth_new_people", "Youth New People", "youth_new_people"),
-                ("total_kids_attendance", "Kids Attendance", "kids_attendance"),
-                ("total_kids_leaders", "Kids Leaders", "kids_leaders"),
-                ("total_new_kids", "New Kids", "new_kids"),
-                ("total_new_kids_salvations", "New Kids Salvations", "new_kids_salvations"),
-                ("total_connect_groups", "Connect Groups", "connect_groups"),
-                ("total_dream_team", "Dream Team", "dream_team"),
-                ("total_tithe", "Tithe", "tithe"),
-                ("total_baptisms", "Baptisms", "baptisms"),
-                ("total_child_dedications", "Child Dedications", "child_dedications"),
-                ("total_new_people", "New People", "new_people"),  # Keep for backward compatibility
-            ]
-            
-            for stat_key, label, avg_key in stat_mappings:
-                total = analysis_data.get(stat_key, 0)
-                average = analysis_data.get("averages", {}).get(avg_key, 0)
-                count = analysis_data.get("total_entries", 0)
-                
-                # Only include stats that have data or are important to show
-                if total > 0 or label in ["Total Attendance", "New Christians", "Youth Attendance", "Kids Attendance", "Connect Groups", "Dream Team"]:
-                    report.append({
-                        "label": label,
-                        "total": total,
-                        "average": average,
-                        "count": count,
-                        "year": start_date.year
-                    })
-            return {
-                "question": question,
-                "campus": display_campus_name(campus),
-                "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-                "summary": detailed_summary,
-                "stats": analysis_data,
-                "report": report,
-                "text": spoken_summary,
-                "popup": True
-            }
-        else:
-            # Cross-campus weekend review
-            logger.info(f"[WEEKEND_REVIEW] Processing cross-campus weekend review")
-            report = generate_cross_campus_report('weekly', "")
-            logger.info(f"[WEEKEND_REVIEW] Cross-campus report: {report}")
-            stats = report.get('stats', {})
-            
-            # Create detailed summary for display
-            detailed_summary = (
-                f"Futures Church Weekend Review\n"
-                f"Total Attendance: {stats.get('attendance', {}).get('total', 0):,}\n"
-                f"Average Attendance: {stats.get('attendance', {}).get('average', 0):,.1f}\n"
-                f"New People: {stats.get('new_people', {}).get('total', 0):,}\n"
-                f"New Christians: {stats.get('new_christians', {}).get('total', 0):,}\n"
-                f"Youth: {stats.get('youth', {}).get('total', 0):,}\n"
-                f"Kids: {stats.get('kids', {}).get('total', 0):,}\n"
-                f"Connect Groups: {stats.get('connect_groups', {}).get('total', 0):,}"
-            )
-            
-            # Create spoken summary
-            spoken_summary = f"Here's your weekend review for Futures Church across all campuses."
-            return {
-                "question": question,
-                "campus": "Futures Church (All Campuses)",
-                "date_range": report.get('date_range', ''),
-                "summary": detailed_summary,
-                "stats": stats,
-                "report": report,
-                "text": spoken_summary,
-                "popup": True
-            }
+            # Default to annual
+            cross_campus_report = generate_cross_campus_report('annual', "")
+            spoken_summary = f"Here's your annual review for All Campuses campus in {year}."
 
-    # 3. CROSS-CAMPUS REVIEWS
-    cross_campus_result = detect_cross_campus_review(question)
-    if cross_campus_result:
-        review_type, _ = cross_campus_result
-        logger.info(f"[QUERY] Detected cross-campus review: {review_type}")
-        report = generate_cross_campus_report(review_type, "")
-        stats = report.get('stats', {})
-        
-        # Create comprehensive summary
-        summary = f"Futures Church {review_type.title()} Report\n"
-        summary += f"Total Attendance: {stats.get('attendance', {}).get('total', 0):,}\n"
-        summary += f"Average Attendance: {stats.get('attendance', {}).get('average', 0):,.1f}\n"
-        summary += f"New People: {stats.get('new_people', {}).get('total', 0):,}\n"
-        summary += f"New Christians: {stats.get('new_christians', {}).get('total', 0):,}\n"
-        summary += f"Youth: {stats.get('youth', {}).get('total', 0):,}\n"
-        summary += f"Kids: {stats.get('kids', {}).get('total', 0):,}\n"
-        summary += f"Connect Groups: {stats.get('connect_groups', {}).get('total', 0):,}"
-        
-        # Convert to report format for popup
+        stats = cross_campus_report.get('stats', {})
+
+        # Create report format for popup
         report_data = [
-            {"label": "Total Attendance", "total": stats.get('attendance', {}).get('total', 0), "average": stats.get('attendance', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
-            {"label": "New People", "total": stats.get('new_people', {}).get('total', 0), "average": stats.get('new_people', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
-            {"label": "New Christians", "total": stats.get('new_christians', {}).get('total', 0), "average": stats.get('new_christians', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
-            {"label": "Youth", "total": stats.get('youth', {}).get('total', 0), "average": stats.get('youth', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
-            {"label": "Kids", "total": stats.get('kids', {}).get('total', 0), "average": stats.get('kids', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
-            {"label": "Connect Groups", "total": stats.get('connect_groups', {}).get('total', 0), "average": stats.get('connect_groups', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+            {"label": "Total Attendance", "total": stats.get('attendance', {}).get('total', 0), "average": stats.get('attendance', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
+            {"label": "New People", "total": stats.get('new_people', {}).get('total', 0), "average": stats.get('new_people', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
+            {"label": "New Christians", "total": stats.get('new_christians', {}).get('total', 0), "average": stats.get('new_christians', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
+            {"label": "Youth Attendance", "total": stats.get('youth', {}).get('total', 0), "average": stats.get('youth', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
+            {"label": "Kids Total", "total": stats.get('kids', {}).get('total', 0), "average": stats.get('kids', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
+            {"label": "Connect Groups", "total": stats.get('connect_groups', {}).get('total', 0), "average": stats.get('connect_groups', {}).get('average', 0), "count": cross_campus_report.get('entry_count', 0), "year": year},
+            {"label": "Volunteers", "total": 0, "average": 0, "count": 0, "year": year}  # Volunteers not tracked in cross-campus yet
         ]
-        
+
         return {
-            "question": question,
-            "campus": "Futures Church (All Campuses)",
-            "date_range": report.get('date_range', ''),
-            "summary": summary,
-            "stats": stats,
             "report": report_data,
-            "text": summary,
-            "popup": True
+            "text": spoken_summary,
+            "popup": True,
+            "stats": stats,
+            "campus": "All Campuses",
+            "year": year
         }
-
-    # 5. SIMPLE STAT QUERIES (How many people, what was attendance, etc.)
-    # First check for multiple stats (e.g., "np and nc")
-    multiple_stats = detect_multiple_stats(question)
-    simple_stat_result = detect_simple_stat_query(question)
-    
-    if multiple_stats:
-        logger.info(f"[QUERY] Detected multiple stat query: {multiple_stats}")
-        stat_types = multiple_stats
-        keyword = "multiple stats"
-    elif simple_stat_result:
-        stat_type, keyword = simple_stat_result
-        stat_types = [stat_type]  # Convert to list for consistency
-        logger.info(f"[QUERY] Detected simple stat query: {stat_type} (keyword: {keyword})")
     else:
-        stat_types = None
-        keyword = None
-    
-    if stat_types:
-        
-        # Default campus if none detected
-        if not campus or campus == "all_campuses":
-            campus = "main"
-        
-        # Parse date range from question
-        start_date, end_date, date_range_text = parse_date_range(question)
-        
-        # Get data
+        # Single campus review - detect specific review type
+        review_type, period_value, year = parse.details["review"]
+        year = years[0] if years else year  # Use detected year or default
+
+        if review_type == "quarterly":
+            report = generate_quarterly_report(campus, year, period_value)
+        elif review_type == "monthly":
+            report = generate_monthly_report(campus, year, period_value)
+        elif review_type == "mid_year":
+            report = generate_mid_year_report(campus, year)
+        else:
+            # Default to annual review
+            report = generate_full_stat_report(campus, [year])
+
+        report["popup"] = True  # Enable popup for reviews
+        return report
+
+def answer_weekend_review(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Last seven days for a campus (or pastor's campus) or the whole church"""
+    question = parse.text
+    logger.info(f"[QUERY] Detected weekend review")
+
+    # First check for pastor names (priority over campus detection)
+    pastor_campus = detect_pastor_name(question)
+    if pastor_campus:
+        campus = pastor_campus
+        logger.info(f"[QUERY] Pastor detected - using campus: {campus}")
+    else:
+        campus = parse.campus
+        logger.info(f"[QUERY] No pastor detected - using campus detection: {campus}")
+    if campus and campus != "all_campuses":
+        # Campus-specific weekend review
+        start_date = datetime.now() - timedelta(days=7)
+        end_date = datetime.now()
         rows = []
-        if sheet:
+        if stats_storage:
             try:
-                rows = sheet.get_all_records()
+                rows = get_sheet_rows()
             except Exception as e:
                 logger.error(f"Failed to get stats from Google Sheets: {e}")
                 rows = []
@@ -1855,242 +3605,424 @@ def query_data_internal(data: Dict[str, Any]) -> Dict[str, Any]:
             memory = load_conversation_memory()
             campus_history = memory.get("session_stats", {}).get(campus, [])
             rows = campus_history
-        
-        # Handle cross-campus queries
-        if campus == "all_campuses" or any(indicator in question_lower for indicator in ['all campuses', 'futures church', 'church wide', 'across all']):
-            # Cross-campus simple stat query
-            analysis_data = get_all_campuses_data(rows, start_date, end_date)
-            campus_display = "Futures Church (All Campuses)"
-            
-            # Calculate cross-campus totals
-            total_attendance = sum(safe_int(row.get('Total Attendance', 0)) for row in analysis_data)
-            total_new_people = sum(safe_int(row.get('New People', 0)) for row in analysis_data)
-            total_new_christians = sum(safe_int(row.get('New Christians', 0)) for row in analysis_data)
-            total_youth = sum(safe_int(row.get('Youth Attendance', 0)) for row in analysis_data)
-            total_kids = sum(safe_int(row.get('Kids Total', 0)) for row in analysis_data)
-            total_connect_groups = sum(safe_int(row.get('Connect Groups', 0)) for row in analysis_data)
-            
-            # Calculate averages
-            valid_entries = len([row for row in analysis_data if safe_int(row.get('Total Attendance', 0)) > 0])
-            avg_attendance = total_attendance / valid_entries if valid_entries > 0 else 0
-            avg_new_people = total_new_people / valid_entries if valid_entries > 0 else 0
-            avg_new_christians = total_new_christians / valid_entries if valid_entries > 0 else 0
-            avg_youth = total_youth / valid_entries if valid_entries > 0 else 0
-            avg_kids = total_kids / valid_entries if valid_entries > 0 else 0
-            avg_connect_groups = total_connect_groups / valid_entries if valid_entries > 0 else 0
-            
-            cross_campus_data = {
-                'total_attendance': total_attendance,
-                'total_new_people': total_new_people,
-                'total_new_christians': total_new_christians,
-                'total_youth': total_youth,
-                'total_kids': total_kids,
-                'total_connect_groups': total_connect_groups,
-                'averages': {
-                    'attendance': avg_attendance,
-                    'new_people': avg_new_people,
-                    'new_christians': avg_new_christians,
-                    'youth': avg_youth,
-                    'kids': avg_kids,
-                    'connect_groups': avg_connect_groups
-                }
-            }
-            
-            answer = generate_simple_stat_answer(stat_types[0], cross_campus_data, campus_display, f" {date_range_text}")
-            
-            # Create targeted report data for popup - only show the requested stat(s)
-            report_data = create_targeted_report_data(stat_types, cross_campus_data, start_date.year, valid_entries)
-            
-            return {
-                "question": question,
-                "campus": campus_display,
-                "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-                "answer": answer,
-                "text": answer,
-                "stats": cross_campus_data,
-                "report": report_data,
-                "popup": True
-            }
+
+        table = get_stats_table(rows)
+        selection = table.select(campus, start_date, end_date)
+
+        logger.info(f"[WEEKEND_REVIEW] Found {len(rows)} total rows, {len(selection)} filtered rows for {campus} in last 7 days")
+        analysis_data = table.summarize(selection)
+        logger.info(f"[WEEKEND_REVIEW] Analysis data: {analysis_data}")
+
+        # Check if we have any data
+        has_data = (analysis_data.get('total_entries', 0) > 0 or 
+                   any(analysis_data.get(key, 0) > 0 for key in ['total_attendance', 'total_new_people', 'total_new_christians', 'total_youth', 'total_kids', 'total_connect_groups']))
+
+        if has_data:
+            # Create detailed summary for display
+            detailed_summary = (
+                f"{display_campus_name(campus)} Weekend Review\n"
+                f"Total Attendance: {analysis_data.get('total_attendance', 0):,}\n"
+                f"New People: {analysis_data.get('total_new_people', 0):,}\n"
+                f"New Christians: {analysis_data.get('total_new_christians', 0):,}\n"
+                f"Youth: {analysis_data.get('total_youth', 0):,}\n"
+                f"Kids: {analysis_data.get('total_kids', 0):,}\n"
+                f"Connect Groups: {analysis_data.get('total_connect_groups', 0):,}"
+            )
+
+            # Create spoken summary 
+            spoken_summary = f"Here's your weekend review for {display_campus_name(campus)} campus."
         else:
-            # Single campus simple stat query
-            campus_normalized = normalize_campus(campus)
-            filtered_rows = []
-            for row in rows:
-                row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-                if row_campus == campus_normalized or campus_normalized in row_campus:
-                    timestamp_str = row.get("Timestamp", "")
-                    if timestamp_str:
-                        try:
-                            if "T" in timestamp_str:
-                                row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                            else:
-                                row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                            if start_date <= row_date <= end_date:
-                                filtered_rows.append(row)
-                        except Exception:
-                            continue
-            
-            analysis_data = calculate_stats_for_year_range(filtered_rows, campus, start_date.year, end_date.year if end_date.year != start_date.year else None)
-            answer = generate_simple_stat_answer(stat_types[0], analysis_data, display_campus_name(campus), f" {date_range_text}")
-            
-            # Create targeted report data for popup - only show the requested stat(s)
-            report_data = create_targeted_report_data(stat_types, analysis_data, start_date.year, analysis_data.get("total_entries", 0))
-            
-            return {
-                "question": question,
-                "campus": display_campus_name(campus),
-                "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-                "answer": answer,
-                "text": answer,
-                "stats": analysis_data,
-                "report": report_data,
-                "popup": True
-            }
+            # No data found
+            detailed_summary = (
+                f"{display_campus_name(campus)} Weekend Review\n"
+                f"No stats have been logged for {display_campus_name(campus)} campus in the last 7 days.\n"
+                f"This could mean:\n"
+                f"• Stats haven't been entered yet for this weekend\n"
+                f"• The campus name might not match our records\n"
+                f"• There was no service this weekend"
+            )
 
-    # 6. GENERAL/BIG PICTURE QUERIES
-    general_patterns = [
-        'summary', 'all numbers', 'big picture', 'overview', 'all stats', 'full stats',
-        'church numbers', 'show me everything', 'what are our numbers', 'church stats'
-    ]
-    
-    if any(pattern in question_lower for pattern in general_patterns):
-        logger.info(f"[QUERY] Detected general/big picture query")
-        
-        # Default to current year if no specific period mentioned
-        if not campus or campus == "all_campuses":
-            campus = "main"
-        
-        start_date, end_date, date_range_text = parse_date_range(question)
-        
-        # Get data and calculate comprehensive stats
-        rows = []
-        if sheet:
-            try:
-                rows = sheet.get_all_records()
-            except Exception as e:
-                logger.error(f"Failed to get stats from Google Sheets: {e}")
-                rows = []
-        if not rows:
-            memory = load_conversation_memory()
-            campus_history = memory.get("session_stats", {}).get(campus, [])
-            rows = campus_history
-        
-        # Filter by campus and date
-        campus_normalized = normalize_campus(campus)
-        filtered_rows = []
-        for row in rows:
-            row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-            if row_campus == campus_normalized or campus_normalized in row_campus:
-                timestamp_str = row.get("Timestamp", "")
-                if timestamp_str:
-                    try:
-                        if "T" in timestamp_str:
-                            row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                        else:
-                            row_date = parse_any_date(timestamp_str)
-                        if start_date <= row_date <= end_date:
-                            filtered_rows.append(row)
-                    except Exception:
-                        continue
-        
-        analysis_data = calculate_stats_for_year_range(filtered_rows, campus, start_date.year, end_date.year if end_date.year != start_date.year else None)
-        
-        # Create comprehensive summary
-        campus_display = display_campus_name(campus)
-        summary = f"{campus_display} Church Stats ({date_range_text})\n\n"
-        summary += f"📊 Attendance: {analysis_data.get('total_attendance', 0):,} total (avg: {analysis_data.get('averages', {}).get('attendance', 0):.1f})\n"
-        summary += f"👥 New People: {analysis_data.get('total_new_people', 0):,} total (avg: {analysis_data.get('averages', {}).get('new_people', 0):.1f})\n"
-        summary += f"✝️ New Christians: {analysis_data.get('total_new_christians', 0):,} total (avg: {analysis_data.get('averages', {}).get('new_christians', 0):.1f})\n"
-        summary += f"🎯 Youth: {analysis_data.get('total_youth', 0):,} total (avg: {analysis_data.get('averages', {}).get('youth', 0):.1f})\n"
-        summary += f"👶 Kids: {analysis_data.get('total_kids', 0):,} total (avg: {analysis_data.get('averages', {}).get('kids', 0):.1f})\n"
-        summary += f"🤝 Connect Groups: {analysis_data.get('total_connect_groups', 0):,} total (avg: {analysis_data.get('averages', {}).get('connect_groups', 0):.1f})"
-        
-        # Create report data for popup
-        report_data = [
-            {"label": "Total Attendance", "total": analysis_data.get("total_attendance", 0), "average": analysis_data.get("averages", {}).get("attendance", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "New People", "total": analysis_data.get("total_new_people", 0), "average": analysis_data.get("averages", {}).get("new_people", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "New Christians", "total": analysis_data.get("total_new_christians", 0), "average": analysis_data.get("averages", {}).get("new_christians", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "Youth", "total": analysis_data.get("total_youth", 0), "average": analysis_data.get("averages", {}).get("youth", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "Kids", "total": analysis_data.get("total_kids", 0), "average": analysis_data.get("averages", {}).get("kids", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "Connect Groups", "total": analysis_data.get("total_connect_groups", 0), "average": analysis_data.get("averages", {}).get("connect_groups", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+            # Create spoken summary 
+            spoken_summary = f"I couldn't find any weekend stats for {display_campus_name(campus)} campus in the last 7 days. You may need to enter the stats first or check if the campus name is correct."
+
+        # Create comprehensive report with all available stats
+        report = []
+        stat_mappings = [
+            ("total_attendance", "Total Attendance", "attendance"),
+            ("total_first_time_visitors", "First Time Visitors", "first_time_visitors"),
+            ("total_information_gathered", "Information Gathered", "information_gathered"),
+            ("total_new_christians", "New Christians", "new_christians"),
+            ("total_rededications", "Rededications", "rededications"),
+            ("total_youth_attendance", "Youth Attendance", "youth_attendance"),
+            ("total_youth_salvations", "Youth Salvations", "youth_salvations"),
+            ("total_youth_new_people", "Youth New People", "youth_new_people"),
+            ("total_kids_attendance", "Kids Attendance", "kids_attendance"),
+            ("total_kids_leaders", "Kids Leaders", "kids_leaders"),
+            ("total_new_kids", "New Kids", "new_kids"),
+            ("total_new_kids_salvations", "New Kids Salvations", "new_kids_salvations"),
+            ("total_connect_groups", "Connect Groups", "connect_groups"),
+            ("total_dream_team", "Dream Team", "dream_team"),
+            ("total_tithe", "Tithe", "tithe"),
+            ("total_baptisms", "Baptisms", "baptisms"),
+            ("total_child_dedications", "Child Dedications", "child_dedications"),
+            ("total_new_people", "New People", "new_people"),  # Keep for backward compatibility
         ]
-        
+
+        for stat_key, label, avg_key in stat_mappings:
+            total = analysis_data.get(stat_key, 0)
+            average = analysis_data.get("averages", {}).get(avg_key, 0)
+            count = analysis_data.get("total_entries", 0)
+
+            # Only include stats that have data or are important to show
+            if total > 0 or label in ["Total Attendance", "New Christians", "Youth Attendance", "Kids Attendance", "Connect Groups", "Dream Team"]:
+                report.append({
+                    "label": label,
+                    "total": total,
+                    "average": average,
+                    "count": count,
+                    "year": start_date.year
+                })
         return {
             "question": question,
-            "campus": campus_display,
+            "campus": display_campus_name(campus),
             "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-            "answer": summary,
-            "text": summary,
+            "summary": detailed_summary,
             "stats": analysis_data,
+            "report": report,
+            "text": spoken_summary,
+            "popup": True
+        }
+    else:
+        # Cross-campus weekend review
+        logger.info(f"[WEEKEND_REVIEW] Processing cross-campus weekend review")
+        report = generate_cross_campus_report('weekly', "")
+        logger.info(f"[WEEKEND_REVIEW] Cross-campus report: {report}")
+        stats = report.get('stats', {})
+
+        # Create detailed summary for display
+        detailed_summary = (
+            f"Futures Church Weekend Review\n"
+            f"Total Attendance: {stats.get('attendance', {}).get('total', 0):,}\n"
+            f"Average Attendance: {stats.get('attendance', {}).get('average', 0):,.1f}\n"
+            f"New People: {stats.get('new_people', {}).get('total', 0):,}\n"
+            f"New Christians: {stats.get('new_christians', {}).get('total', 0):,}\n"
+            f"Youth: {stats.get('youth', {}).get('total', 0):,}\n"
+            f"Kids: {stats.get('kids', {}).get('total', 0):,}\n"
+            f"Connect Groups: {stats.get('connect_groups', {}).get('total', 0):,}"
+        )
+
+        # Create spoken summary
+        spoken_summary = f"Here's your weekend review for Futures Church across all campuses."
+        return {
+            "question": question,
+            "campus": "Futures Church (All Campuses)",
+            "date_range": report.get('date_range', ''),
+            "summary": detailed_summary,
+            "stats": stats,
+            "report": report,
+            "text": spoken_summary,
+            "popup": True
+        }
+
+def answer_cross_campus_review(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Church-wide review for a reporting period"""
+    question = parse.text
+    review_type = parse.details["review_type"]
+    logger.info(f"[QUERY] Detected cross-campus review: {review_type}")
+    report = generate_cross_campus_report(review_type, "")
+    stats = report.get('stats', {})
+
+    # Create comprehensive summary
+    summary = f"Futures Church {review_type.title()} Report\n"
+    summary += f"Total Attendance: {stats.get('attendance', {}).get('total', 0):,}\n"
+    summary += f"Average Attendance: {stats.get('attendance', {}).get('average', 0):,.1f}\n"
+    summary += f"New People: {stats.get('new_people', {}).get('total', 0):,}\n"
+    summary += f"New Christians: {stats.get('new_christians', {}).get('total', 0):,}\n"
+    summary += f"Youth: {stats.get('youth', {}).get('total', 0):,}\n"
+    summary += f"Kids: {stats.get('kids', {}).get('total', 0):,}\n"
+    summary += f"Connect Groups: {stats.get('connect_groups', {}).get('total', 0):,}"
+
+    # Convert to report format for popup
+    report_data = [
+        {"label": "Total Attendance", "total": stats.get('attendance', {}).get('total', 0), "average": stats.get('attendance', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+        {"label": "New People", "total": stats.get('new_people', {}).get('total', 0), "average": stats.get('new_people', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+        {"label": "New Christians", "total": stats.get('new_christians', {}).get('total', 0), "average": stats.get('new_christians', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+        {"label": "Youth", "total": stats.get('youth', {}).get('total', 0), "average": stats.get('youth', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+        {"label": "Kids", "total": stats.get('kids', {}).get('total', 0), "average": stats.get('kids', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+        {"label": "Connect Groups", "total": stats.get('connect_groups', {}).get('total', 0), "average": stats.get('connect_groups', {}).get('average', 0), "count": report.get('entry_count', 0), "year": datetime.now().year},
+    ]
+
+    return {
+        "question": question,
+        "campus": "Futures Church (All Campuses)",
+        "date_range": report.get('date_range', ''),
+        "summary": summary,
+        "stats": stats,
+        "report": report_data,
+        "text": summary,
+        "popup": True
+    }
+
+def answer_stat_query(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Direct answer for one or more named stats"""
+    question = parse.text
+    stat_types = parse.details["stats"]
+
+    # Default campus if none detected
+    if not campus or campus == "all_campuses":
+        campus = "main"
+
+    # Parse date range from question
+    start_date, end_date, date_range_text = parse_date_range(question)
+
+    # Get data
+    rows = []
+    if stats_storage:
+        try:
+            rows = get_sheet_rows()
+        except Exception as e:
+            logger.error(f"Failed to get stats from Google Sheets: {e}")
+            rows = []
+    if not rows:
+        memory = load_conversation_memory()
+        campus_history = memory.get("session_stats", {}).get(campus, [])
+        rows = campus_history
+
+    # Handle cross-campus queries
+    if campus == "all_campuses" or parse.matches(CROSS_CAMPUS_QUESTION_PATTERN):
+        # Cross-campus simple stat query
+        table = get_stats_table(rows)
+        selection = table.select(start_date=start_date, end_date=end_date, include_undated=True)
+        campus_display = "Futures Church (All Campuses)"
+
+        # Calculate cross-campus totals
+        total_attendance = table.total('Total Attendance', selection)
+        total_new_people = table.total('New People', selection)
+        total_new_christians = table.total('New Christians', selection)
+        total_youth = table.total('Youth Attendance', selection)
+        total_kids = table.total('Kids Total', selection)
+        total_connect_groups = table.total('Connect Groups', selection)
+
+        # Calculate averages
+        valid_entries = int(np.count_nonzero(table.stat('Total Attendance')[selection] > 0))
+        avg_attendance = total_attendance / valid_entries if valid_entries > 0 else 0
+        avg_new_people = total_new_people / valid_entries if valid_entries > 0 else 0
+        avg_new_christians = total_new_christians / valid_entries if valid_entries > 0 else 0
+        avg_youth = total_youth / valid_entries if valid_entries > 0 else 0
+        avg_kids = total_kids / valid_entries if valid_entries > 0 else 0
+        avg_connect_groups = total_connect_groups / valid_entries if valid_entries > 0 else 0
+
+        cross_campus_data = {
+            'total_attendance': total_attendance,
+            'total_new_people': total_new_people,
+            'total_new_christians': total_new_christians,
+            'total_youth': total_youth,
+            'total_kids': total_kids,
+            'total_connect_groups': total_connect_groups,
+            'averages': {
+                'attendance': avg_attendance,
+                'new_people': avg_new_people,
+                'new_christians': avg_new_christians,
+                'youth': avg_youth,
+                'kids': avg_kids,
+                'connect_groups': avg_connect_groups
+            }
+        }
+
+        answer = generate_simple_stat_answer(stat_types[0], cross_campus_data, campus_display, f" {date_range_text}")
+
+        # Create targeted report data for popup - only show the requested stat(s)
+        report_data = create_targeted_report_data(stat_types, cross_campus_data, start_date.year, valid_entries)
+
+        return {
+            "question": question,
+            "campus": campus_display,
+            "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+            "answer": answer,
+            "text": answer,
+            "stats": cross_campus_data,
             "report": report_data,
             "popup": True
         }
+    else:
+        # Single campus simple stat query
+        analysis_data = calculate_stats_for_year_range(rows, campus, start_date.year, end_date.year if end_date.year != start_date.year else None,
+                                                       start_date=start_date, end_date=end_date)
+        answer = generate_simple_stat_answer(stat_types[0], analysis_data, display_campus_name(campus), f" {date_range_text}")
+
+        # Create targeted report data for popup - only show the requested stat(s)
+        report_data = create_targeted_report_data(stat_types, analysis_data, start_date.year, analysis_data.get("total_entries", 0))
 
-    # 7. AI INSIGHTS for complex questions
-    if any(word in question_lower for word in ['trend', 'trends', 'pattern', 'growth', 'improve', 'attention', 'working', 'analysis', 'insight', 'why', 'how are we', 'what areas']):
-        logger.info(f"[QUERY] Detected AI insights query")
-        
-        if not campus or campus == "all_campuses":
-            campus = "main"
-        
-        start_date, end_date, date_range_text = parse_date_range(question)
-        
-        # Get and filter data
-        rows = []
-        if sheet:
-            try:
-                rows = sheet.get_all_records()
-            except Exception as e:
-                logger.error(f"Failed to get stats from Google Sheets: {e}")
-                rows = []
-        if not rows:
-            memory = load_conversation_memory()
-            campus_history = memory.get("session_stats", {}).get(campus, [])
-            rows = campus_history
-        
-        campus_normalized = normalize_campus(campus)
-        filtered_rows = []
-        for row in rows:
-            row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-            if row_campus == campus_normalized or campus_normalized in row_campus:
-                timestamp_str = row.get("Timestamp", "")
-                if timestamp_str:
-                    try:
-                        if "T" in timestamp_str:
-                            row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                        else:
-                            row_date = parse_any_date(timestamp_str)
-                        if start_date <= row_date <= end_date:
-                            filtered_rows.append(row)
-                    except Exception:
-                        continue
-        
-        analysis_data = calculate_stats_for_year_range(filtered_rows, campus, start_date.year, end_date.year if end_date.year != start_date.year else None)
-        ai_insights = generate_ai_insights(question, campus, analysis_data, filtered_rows)
-        
-        # Create report data for popup
-        report_data = [
-            {"label": "Total Attendance", "total": analysis_data.get("total_attendance", 0), "average": analysis_data.get("averages", {}).get("attendance", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "New People", "total": analysis_data.get("total_new_people", 0), "average": analysis_data.get("averages", {}).get("new_people", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "New Christians", "total": analysis_data.get("total_new_christians", 0), "average": analysis_data.get("averages", {}).get("new_christians", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "Youth", "total": analysis_data.get("total_youth", 0), "average": analysis_data.get("averages", {}).get("youth", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "Kids", "total": analysis_data.get("total_kids", 0), "average": analysis_data.get("averages", {}).get("kids", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-            {"label": "Connect Groups", "total": analysis_data.get("total_connect_groups", 0), "average": analysis_data.get("averages", {}).get("connect_groups", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
-        ]
-        
         return {
             "question": question,
             "campus": display_campus_name(campus),
             "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-            "answer": ai_insights,
-            "text": ai_insights,
-            "insights": [ai_insights],
+            "answer": answer,
+            "text": answer,
             "stats": analysis_data,
             "report": report_data,
             "popup": True
         }
 
-    # 8. FALLBACK: Default response for unrecognized queries
+def answer_general_query(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Every headline stat for a campus over the asked period"""
+    question = parse.text
+    logger.info(f"[QUERY] Detected general/big picture query")
+
+    # Default to current year if no specific period mentioned
+    if not campus or campus == "all_campuses":
+        campus = "main"
+
+    start_date, end_date, date_range_text = parse_date_range(question)
+
+    # Get data and calculate comprehensive stats
+    rows = []
+    if stats_storage:
+        try:
+            rows = get_sheet_rows()
+        except Exception as e:
+            logger.error(f"Failed to get stats from Google Sheets: {e}")
+            rows = []
+    if not rows:
+        memory = load_conversation_memory()
+        campus_history = memory.get("session_stats", {}).get(campus, [])
+        rows = campus_history
+
+    # Filter by campus and date
+    analysis_data = calculate_stats_for_year_range(rows, campus, start_date.year, end_date.year if end_date.year != start_date.year else None,
+                                                   start_date=start_date, end_date=end_date)
+
+    # Create comprehensive summary
+    campus_display = display_campus_name(campus)
+    summary = f"{campus_display} Church Stats ({date_range_text})\n\n"
+    summary += f"📊 Attendance: {analysis_data.get('total_attendance', 0):,} total (avg: {analysis_data.get('averages', {}).get('attendance', 0):.1f})\n"
+    summary += f"👥 New People: {analysis_data.get('total_new_people', 0):,} total (avg: {analysis_data.get('averages', {}).get('new_people', 0):.1f})\n"
+    summary += f"✝️ New Christians: {analysis_data.get('total_new_christians', 0):,} total (avg: {analysis_data.get('averages', {}).get('new_christians', 0):.1f})\n"
+    summary += f"🎯 Youth: {analysis_data.get('total_youth', 0):,} total (avg: {analysis_data.get('averages', {}).get('youth', 0):.1f})\n"
+    summary += f"👶 Kids: {analysis_data.get('total_kids', 0):,} total (avg: {analysis_data.get('averages', {}).get('kids', 0):.1f})\n"
+    summary += f"🤝 Connect Groups: {analysis_data.get('total_connect_groups', 0):,} total (avg: {analysis_data.get('averages', {}).get('connect_groups', 0):.1f})"
+
+    # Create report data for popup
+    report_data = [
+        {"label": "Total Attendance", "total": analysis_data.get("total_attendance", 0), "average": analysis_data.get("averages", {}).get("attendance", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "New People", "total": analysis_data.get("total_new_people", 0), "average": analysis_data.get("averages", {}).get("new_people", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "New Christians", "total": analysis_data.get("total_new_christians", 0), "average": analysis_data.get("averages", {}).get("new_christians", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "Youth", "total": analysis_data.get("total_youth", 0), "average": analysis_data.get("averages", {}).get("youth", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "Kids", "total": analysis_data.get("total_kids", 0), "average": analysis_data.get("averages", {}).get("kids", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "Connect Groups", "total": analysis_data.get("total_connect_groups", 0), "average": analysis_data.get("averages", {}).get("connect_groups", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+    ]
+
+    return {
+        "question": question,
+        "campus": campus_display,
+        "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+        "answer": summary,
+        "text": summary,
+        "stats": analysis_data,
+        "report": report_data,
+        "popup": True
+    }
+
+def answer_insights_query(parse: "UtteranceParse", campus: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Claude insights on a campus's trends, with the numbers behind them"""
+    question = parse.text
+    logger.info(f"[QUERY] Detected AI insights query")
+
+    if not campus or campus == "all_campuses":
+        campus = "main"
+
+    start_date, end_date, date_range_text = parse_date_range(question)
+
+    # Get and filter data
+    rows = []
+    if stats_storage:
+        try:
+            rows = get_sheet_rows()
+        except Exception as e:
+            logger.error(f"Failed to get stats from Google Sheets: {e}")
+            rows = []
+    if not rows:
+        memory = load_conversation_memory()
+        campus_history = memory.get("session_stats", {}).get(campus, [])
+        rows = campus_history
+
+    table = get_stats_table(rows)
+    filtered_rows = table.take(table.select(campus, start_date, end_date))
+
+    analysis_data = calculate_stats_for_year_range(rows, campus, start_date.year, end_date.year if end_date.year != start_date.year else None,
+                                                   start_date=start_date, end_date=end_date)
+    insights_job = None
+    if data.get("defer_insights"):
+        # Hand the Claude call to the background pool; the caller polls for the text
+        insights_job = submit_insight_job(generate_ai_insights, question, campus, analysis_data, filtered_rows,
+                                          owner=data.get("insights_owner"), with_audio=True)
+        ai_insights = f"Here are the numbers for {display_campus_name(campus)}. I'm putting together some insights now."
+    else:
+        ai_insights = generate_ai_insights(question, campus, analysis_data, filtered_rows)
+
+    # Create report data for popup
+    report_data = [
+        {"label": "Total Attendance", "total": analysis_data.get("total_attendance", 0), "average": analysis_data.get("averages", {}).get("attendance", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "New People", "total": analysis_data.get("total_new_people", 0), "average": analysis_data.get("averages", {}).get("new_people", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "New Christians", "total": analysis_data.get("total_new_christians", 0), "average": analysis_data.get("averages", {}).get("new_christians", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "Youth", "total": analysis_data.get("total_youth", 0), "average": analysis_data.get("averages", {}).get("youth", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "Kids", "total": analysis_data.get("total_kids", 0), "average": analysis_data.get("averages", {}).get("kids", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+        {"label": "Connect Groups", "total": analysis_data.get("total_connect_groups", 0), "average": analysis_data.get("averages", {}).get("connect_groups", 0), "count": analysis_data.get("total_entries", 0), "year": start_date.year},
+    ]
+
+    return {
+        "question": question,
+        "campus": display_campus_name(campus),
+        "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+        "answer": ai_insights,
+        "text": ai_insights,
+        "insights": [ai_insights],
+        "stats": analysis_data,
+        "report": report_data,
+        "popup": True,
+        **(insight_job_links(insights_job) if insights_job else {})
+    }
+
+def query_data_internal(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Internal function to query data - handles all types of stat queries with popup support"""
+    question = str(data.get("question", "")).strip()
+    if not question:
+        return {"error": "Missing question"}
+
+    # Reuse process_voice's parse when it was made from this exact question
+    parse = data.get("parse")
+    if not isinstance(parse, UtteranceParse) or parse.text != question:
+        parse = parse_utterance(question)
+    campus = parse.campus
+    
+    # Smart campus defaulting based on user role when no campus is mentioned
+    if not campus:
+        if current_user.is_authenticated:
+            if current_user.role == 'campus_pastor':
+                # Campus pastors get their assigned campus by default
+                campus = getattr(current_user, 'campus', 'main')
+                logger.info(f"[QUERY] No campus mentioned - using campus pastor's campus: {campus}")
+            elif current_user.role in ['senior_pastor', 'lead_pastor', 'admin']:
+                # Senior leadership gets all campuses by default
+                campus = 'all_campuses'
+                logger.info(f"[QUERY] No campus mentioned - using all campuses for senior leadership")
+            else:
+                # Other roles default to main or all_campuses
+                campus = 'all_campuses'
+                logger.info(f"[QUERY] No campus mentioned - defaulting to all campuses")
+        else:
+            campus = 'all_campuses'
+    else:
+        logger.info(f"[QUERY] Campus detected from question: {campus}")
+    
+    logger.info(f"[QUERY] Processing question: '{question}' | Final Campus: {campus}")
+    
+    # Hand off to the answer for the question's intent (see QUERY_INTENTS for the order)
+    handler = QUERY_HANDLERS.get(parse.intent)
+    if handler:
+        return answer_query(parse, campus, data, handler)
+
+    # FALLBACK: Default response for unrecognized queries
     logger.info(f"[QUERY] No specific pattern matched, using fallback")
     return {
         "error": f"I'm not sure how to answer '{question}'. Try asking for specific stats like 'How many people attended this month?' or 'Show me the annual report for South campus'."
@@ -2185,19 +4117,12 @@ Give them friendly, helpful insights. Focus on:
 - What they're really asking about
 - What their data shows
 - How this info can help them
-- What positive things you notice
-
-Be warm and specific. Use their data to give meaningful insights. Keep it under 120 words and sound conversational."""
-
-    try:
-        response = claude.messages.create(
-            model="claude-3-haiku-20240307",
-            max_tokens=300,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        response_text = response.content[0].text.strip() if hasattr(response.content[0], 'text') else str(response.content[0])
-        return response_text
+- What positive things you notice
+
+Be warm and specific. Use their data to give meaningful insights. Keep it under 120 words and sound conversational."""
+
+    try:
+        return cached_claude_completion(prompt, model="claude-3-haiku-20240307", max_tokens=300, temperature=0.7)
         
     except Exception as e:
         logger.error(f"Claude API error in generate_ai_insights: {e}")
@@ -2205,192 +4130,23 @@ Be warm and specific. Use their data to give meaningful insights. Keep it under
 
 def detect_review_type(question: str) -> tuple:
     """Detect the type of review requested and extract relevant parameters"""
-    import re
-    q = question.lower()
-    
-    # Quarterly review detection (Q1, Q2, Q3, Q4)
-    quarterly_patterns = [
-        r'\bq1\b', r'\bq2\b', r'\bq3\b', r'\bq4\b',
-        r'\bquarter 1\b', r'\bquarter 2\b', r'\bquarter 3\b', r'\bquarter 4\b',
-        r'\bfirst quarter\b', r'\bsecond quarter\b', r'\bthird quarter\b', r'\bfourth quarter\b',
-        r'\bq1 review\b', r'\bq2 review\b', r'\bq3 review\b', r'\bq4 review\b',
-        r'\bquarterly review\b', r'\bquarter review\b'
-    ]
-    
-    for pattern in quarterly_patterns:
-        if re.search(pattern, q):
-            # Extract quarter number
-            if 'q1' in q or 'quarter 1' in q or 'first quarter' in q:
-                quarter = 1
-            elif 'q2' in q or 'quarter 2' in q or 'second quarter' in q:
-                quarter = 2
-            elif 'q3' in q or 'quarter 3' in q or 'third quarter' in q:
-                quarter = 3
-            elif 'q4' in q or 'quarter 4' in q or 'fourth quarter' in q:
-                quarter = 4
-            else:
-                quarter = 1  # Default to Q1
-            
-            # Extract year
-            import re
-            years = re.findall(r'\b(20\d{2})\b', question)
-            year = int(years[0]) if years else datetime.now().year
-            
-            return "quarterly", quarter, year
-    
-    # Monthly review detection
-    monthly_patterns = [
-        r'\bmonthly review\b', r'\bmonth review\b', r'\bmonthly report\b', r'\bmonth report\b',
-        r'\bmonthly summary\b', r'\bmonth summary\b', r'\bmonthly stats\b', r'\bmonth stats\b',
-        r'\bmonthly statistics\b', r'\bmonth statistics\b', r'\bmonthly numbers\b', r'\bmonth numbers\b',
-        r'\bmonthly data\b', r'\bmonth data\b', r'\bmonthly recap\b', r'\bmonth recap\b',
-        r'\bmonthly overview\b', r'\bmonth overview\b', r'\bmonthly dashboard\b', r'\bmonth dashboard\b',
-        r'\bjanuary review\b', r'\bfebruary review\b', r'\bmarch review\b', r'\bapril review\b',
-        r'\bmay review\b', r'\bjune review\b', r'\bjuly review\b', r'\baugust review\b',
-        r'\bseptember review\b', r'\boctober review\b', r'\bnovember review\b', r'\bdecember review\b',
-        r'\bjanuary report\b', r'\bfebruary report\b', r'\bmarch report\b', r'\bapril report\b',
-        r'\bmay report\b', r'\bjune report\b', r'\bjuly report\b', r'\baugust report\b',
-        r'\bseptember report\b', r'\boctober report\b', r'\bnovember report\b', r'\bdecember report\b'
-    ]
-    
-    for pattern in monthly_patterns:
-        if re.search(pattern, q):
-            # Extract month number
-            months = {
-                'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-                'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-                'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
-                'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-            }
-            
-            month = None
-            for month_name, month_num in months.items():
-                if month_name in q or month_name[:3] in q:
-                    month = month_num
-                    break
-            
-            # If no specific month found, default to current month
-            if month is None:
-                month = datetime.now().month
-                
-            # Extract year
-            years = re.findall(r'\b(20\d{2})\b', question)
-            year = int(years[0]) if years else datetime.now().year
-            
-            return "monthly", month, year
-
-    # Mid-year review detection
-    mid_year_patterns = [
-        r'\bmid.?year\b', r'\bmidyear\b', r'\bmid.?year review\b', r'\bmidyear review\b',
-        r'\bmid.?year report\b', r'\bmidyear report\b', r'\bmid.?year summary\b', r'\bmidyear summary\b',
-        r'\bmid.?year stats\b', r'\bmidyear stats\b', r'\bmid.?year statistics\b', r'\bmidyear statistics\b',
-        r'\bmid.?year numbers\b', r'\bmidyear numbers\b', r'\bmid.?year data\b', r'\bmidyear data\b',
-        r'\bmid.?year recap\b', r'\bmidyear recap\b', r'\bmid.?year overview\b', r'\bmidyear overview\b',
-        r'\bmid.?year dashboard\b', r'\bmidyear dashboard\b', r'\bmid.?year snapshot\b', r'\bmidyear snapshot\b',
-        r'\bmid.?year full report\b', r'\bmidyear full report\b', r'\bmid.?year full review\b', r'\bmidyear full review\b',
-        r'\bmid.?year full summary\b', r'\bmidyear full summary\b', r'\bmid.?year stat report\b', r'\bmidyear stat report\b',
-        r'\bmid.?year stat summary\b', r'\bmidyear stat summary\b', r'\bmid.?year stat overview\b', r'\bmidyear stat overview\b',
-        r'\bmid.?year stat recap\b', r'\bmidyear stat recap\b', r'\bmid.?year stats summary\b', r'\bmidyear stats summary\b',
-        r'\bmid.?year stats overview\b', r'\bmidyear stats overview\b', r'\bmid.?year stats recap\b', r'\bmidyear stats recap\b'
-    ]
-    
-    for pattern in mid_year_patterns:
-        if re.search(pattern, q):
-            # Extract year
-            import re
-            years = re.findall(r'\b(20\d{2})\b', question)
-            year = int(years[0]) if years else datetime.now().year
-            
-            return "mid_year", None, year
-    
-    # Annual review detection (default)
-    annual_patterns = [
-        'review', 'annual review', 'anual review', 'report', 'summary', 'dashboard', 'snapshot', 'full report', 'overview', 'recap',
-        'stats summary', 'stat summary', 'stat report', 'stat overview', 'stat recap',
-        'year in review', 'yearly review', 'yearly report', 'year-end review', 'end of year report', 'end of year review',
-        'give me a review', 'give me an annual review', 'can i get a review', 'can i get an annual review', 'show me a review', 'show me an annual review',
-        'show me the annual report', 'show me the report', 'show me the summary', 'show me the dashboard', 'show me the stats summary',
-        'generate a report', 'generate an annual report', 'generate a summary', 'generate an annual summary',
-        'full stats', 'all stats', 'all statistics', 'all numbers', 'all data', 'all metrics',
-        'recap of the year', 'recap for the year', 'recap', 'stat recap', 'stats recap',
-        'big picture', 'big picture stats', 'big picture summary', 'big picture report',
-        'comprehensive report', 'comprehensive review', 'comprehensive summary',
-        'church report', 'church review', 'church summary',
-        'annual stats', 'annual statistics', 'annual numbers', 'annual data',
-        'give me a summary', 'can i get a summary', 'show me a summary',
-        'give me a dashboard', 'can i get a dashboard', 'show me a dashboard',
-        'give me a snapshot', 'can i get a snapshot', 'show me a snapshot',
-        'give me an overview', 'can i get an overview', 'show me an overview',
-        'give me a full report', 'can i get a full report', 'show me a full report',
-        'give me a full review', 'can i get a full review', 'show me a full review',
-        'give me a full summary', 'can i get a full summary', 'show me a full summary',
-        'give me a stat report', 'can i get a stat report', 'show me a stat report',
-        'give me a stat summary', 'can i get a stat summary', 'show me a stat summary',
-        'give me a stat overview', 'can i get a stat overview', 'show me a stat overview',
-        'give me a stat recap', 'can i get a stat recap', 'show me a stat recap',
-        'give me a stats summary', 'can i get a stats summary', 'show me a stats summary',
-        'give me a stats overview', 'can i get a stats overview', 'show me a stats overview',
-        'give me a stats recap', 'can i get a stats recap', 'show me a stats recap',
-        'give me an annual stats', 'can i get annual stats', 'show me annual stats',
-        'give me an annual statistics', 'can i get annual statistics', 'show me annual statistics',
-        'give me an annual numbers', 'can i get annual numbers', 'show me annual numbers',
-        'give me an annual data', 'can i get annual data', 'show me annual data',
-        'give me an annual summary', 'can i get annual summary', 'show me annual summary',
-        'give me an annual report', 'can i get annual report', 'show me annual report',
-        'give me an annual review', 'can i get annual review', 'show me annual review',
-        'give me an anual review', 'can i get an anual review', 'show me an anual review',
-        'give me an anual report', 'can i get an anual report', 'show me an anual report',
-        'give me an anual summary', 'can i get an anual summary', 'show me an anual summary',
-        'give me an anual stats', 'can i get an anual stats', 'show me an anual stats',
-        'give me an anual statistics', 'can i get an anual statistics', 'show me an anual statistics',
-        'give me an anual numbers', 'can i get an anual numbers', 'show me an anual numbers',
-        'give me an anual data', 'can i get an anual data', 'show me an anual data'
-    ]
-    
-    for pattern in annual_patterns:
-        if pattern in q:
-            # Extract year
-            import re
-            years = re.findall(r'\b(20\d{2})\b', question)
-            year = int(years[0]) if years else datetime.now().year
-            
-            return "annual", None, year
-    
-    return None, None, None
+    return review_type_of(parse_utterance(question))
 
 def is_review_intent(question: str) -> bool:
     """Check if the question is asking for a review (but not a comparison or weekend review)"""
-    # First check if this is a comparison request - if so, it's not a review intent
-    is_comparison, _, _, _ = detect_comparison_request(question)
-    if is_comparison:
-        return False
-    
-    # Check if this is a weekend review - if so, it's not a general review intent
-    question_lower = question.lower()
-    if any(phrase in question_lower for phrase in WEEKEND_REVIEW_PHRASES):
-        return False
-    
-    # Then check for review intent
-    review_type, _, _ = detect_review_type(question)
-    return review_type is not None
+    parse = parse_utterance(question)
+    return _detect_period_comparison(parse) is None and _detect_review(parse) is not None
 
-def generate_quarterly_report(campus: str, year: int, quarter: int) -> dict:
-    """Generate a quarterly report for a specific quarter and year"""
-    # Define quarter date ranges
-    quarter_ranges = {
-        1: (datetime(year, 1, 1), datetime(year, 3, 31)),
-        2: (datetime(year, 4, 1), datetime(year, 6, 30)),
-        3: (datetime(year, 7, 1), datetime(year, 9, 30)),
-        4: (datetime(year, 10, 1), datetime(year, 12, 31))
-    }
-    
-    start_date, end_date = quarter_ranges[quarter]
-    
-    # Get rows data
+def summarize_report_period(campus: str, start_date: datetime, end_date: datetime,
+                            include_undated: bool = False) -> tuple:
+    """Report totals for the days of a period, from the sheet rollup or session memory.
+
+    Returns the campus name used (memory may store it title-cased) and the totals.
+    """
     rows = []
-    if sheet:
+    if stats_storage:
         try:
-            rows = sheet.get_all_records()
+            rows = get_sheet_rows()
         except Exception as e:
             logger.error(f"Failed to get stats from Google Sheets: {e}")
             rows = []
@@ -2405,91 +4161,24 @@ def generate_quarterly_report(campus: str, year: int, quarter: int) -> dict:
                 campus = campus_capitalized
         rows = campus_history
     
-    # Filter rows by campus and date range
-    filtered_rows = []
-    campus_normalized = normalize_campus(campus)
+    rollup = get_stats_table(rows).rollup()
+    return campus, rollup.report_totals(campus, start_date, end_date, include_undated)
+
+def generate_quarterly_report(campus: str, year: int, quarter: int) -> dict:
+    """Generate a quarterly report for a specific quarter and year"""
+    # Define quarter date ranges
+    quarter_ranges = {
+        1: (datetime(year, 1, 1), datetime(year, 3, 31)),
+        2: (datetime(year, 4, 1), datetime(year, 6, 30)),
+        3: (datetime(year, 7, 1), datetime(year, 9, 30)),
+        4: (datetime(year, 10, 1), datetime(year, 12, 31))
+    }
     
-    for row in rows:
-        row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-        if row_campus == campus_normalized or campus_normalized in row_campus:
-            timestamp_str = row.get("Timestamp", "")
-            if timestamp_str:
-                try:
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    if start_date <= row_date <= end_date:
-                        filtered_rows.append(row)
-                except Exception:
-                    continue
+    start_date, end_date = quarter_ranges[quarter]
     
-    # Calculate stats for the quarter
-    total_attendance = 0
-    total_new_people = 0
-    total_new_christians = 0
-    total_youth = 0
-    total_kids = 0
-    total_connect_groups = 0
-    entry_count = 0
-    
-    # Track values for average calculation
-    attendance_values = []
-    new_people_values = []
-    new_christians_values = []
-    youth_values = []
-    kids_values = []
-    connect_groups_values = []
-    
-    for entry in filtered_rows:
-        if isinstance(entry, dict):
-            def safe_int_stat(val):
-                try:
-                    if val is None or val == '':
-                        return 0
-                    return int(str(val).replace(',', '').strip())
-                except Exception:
-                    return 0
-            attendance_val = safe_int_stat(entry.get('Total Attendance'))
-            new_people_val = safe_int_stat(entry.get('New People'))
-            new_christians_val = safe_int_stat(entry.get('New Christians'))
-            youth_val = safe_int_stat(entry.get('Youth Attendance'))
-            kids_val = safe_int_stat(entry.get('Kids Total'))
-            connect_groups_val = safe_int_stat(entry.get('Connect Groups'))
-            
-            # Only count entries with at least one stat
-            if any([attendance_val, new_people_val, new_christians_val, youth_val, kids_val, connect_groups_val]):
-                entry_count += 1
-            
-            # Add to totals
-            total_attendance += attendance_val
-            total_new_people += new_people_val
-            total_new_christians += new_christians_val
-            total_youth += youth_val
-            total_kids += kids_val
-            total_connect_groups += connect_groups_val
-            
-            # Add to lists for averages (only if > 0)
-            if attendance_val > 0:
-                attendance_values.append(attendance_val)
-            if new_people_val > 0:
-                new_people_values.append(new_people_val)
-            if new_christians_val > 0:
-                new_christians_values.append(new_christians_val)
-            if youth_val > 0:
-                youth_values.append(youth_val)
-            if kids_val > 0:
-                kids_values.append(kids_val)
-            if connect_groups_val > 0:
-                connect_groups_values.append(connect_groups_val)
-    
-    # Calculate averages
-    avg_attendance = sum(attendance_values) / len(attendance_values) if attendance_values else 0
-    avg_new_people = sum(new_people_values) / len(new_people_values) if new_people_values else 0
-    avg_new_christians = sum(new_christians_values) / len(new_christians_values) if new_christians_values else 0
-    avg_youth = sum(youth_values) / len(youth_values) if youth_values else 0
-    avg_kids = sum(kids_values) / len(kids_values) if kids_values else 0
-    avg_connect_groups = sum(connect_groups_values) / len(connect_groups_values) if connect_groups_values else 0
+    # Totals and averages of the days in the period
+    campus, period = summarize_report_period(campus, start_date, end_date)
+    entry_count = period['entry_count']
     
     # Create results in the same format as annual report
     results = []
@@ -2503,27 +4192,8 @@ def generate_quarterly_report(campus: str, year: int, quarter: int) -> dict:
     ]
     
     for stat_type, stat_label, avg_key in stat_types:
-        if stat_type == 'attendance':
-            total = total_attendance
-            avg = avg_attendance
-        elif stat_type == 'new_people':
-            total = total_new_people
-            avg = avg_new_people
-        elif stat_type == 'new_christians':
-            total = total_new_christians
-            avg = avg_new_christians
-        elif stat_type == 'youth':
-            total = total_youth
-            avg = avg_youth
-        elif stat_type == 'kids':
-            total = total_kids
-            avg = avg_kids
-        elif stat_type == 'connect_groups':
-            total = total_connect_groups
-            avg = avg_connect_groups
-        else:
-            total = 0
-            avg = 0
+        total = period['totals'][stat_type]
+        avg = period['averages'][stat_type]
         
         results.append({
             "stat": stat_type,
@@ -2558,113 +4228,9 @@ def generate_monthly_report(campus: str, year: int, month: int) -> dict:
         start_date = datetime(year, month, 1)
         end_date = datetime(year, month + 1, 1) - timedelta(days=1)
     
-    # Get rows data
-    rows = []
-    if sheet:
-        try:
-            rows = sheet.get_all_records()
-        except Exception as e:
-            logger.error(f"Failed to get stats from Google Sheets: {e}")
-            rows = []
-    
-    if not rows:
-        memory = load_conversation_memory()
-        campus_history = memory.get("session_stats", {}).get(campus, [])
-        if not campus_history:
-            campus_capitalized = campus.title()
-            campus_history = memory.get("session_stats", {}).get(campus_capitalized, [])
-            if campus_history:
-                campus = campus_capitalized
-        rows = campus_history
-    
-    # Filter rows by campus and date range
-    filtered_rows = []
-    campus_normalized = normalize_campus(campus)
-    
-    for row in rows:
-        row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-        if row_campus == campus_normalized or campus_normalized in row_campus:
-            timestamp_str = row.get("Timestamp", "")
-            if timestamp_str:
-                try:
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    if start_date <= row_date <= end_date:
-                        filtered_rows.append(row)
-                except Exception:
-                    filtered_rows.append(row)
-            else:
-                filtered_rows.append(row)
-    
-    # Calculate stats
-    total_attendance = 0
-    total_new_people = 0
-    total_new_christians = 0
-    total_youth = 0
-    total_kids = 0
-    total_connect_groups = 0
-    entry_count = 0
-    
-    # Track values for average calculation
-    attendance_values = []
-    new_people_values = []
-    new_christians_values = []
-    youth_values = []
-    kids_values = []
-    connect_groups_values = []
-    
-    for entry in filtered_rows:
-        if isinstance(entry, dict):
-            def safe_int_stat(val):
-                try:
-                    if val is None or val == '':
-                        return 0
-                    return int(str(val).replace(',', '').strip())
-                except Exception:
-                    return 0
-            
-            attendance_val = safe_int_stat(entry.get('Total Attendance'))
-            new_people_val = safe_int_stat(entry.get('New People'))
-            new_christians_val = safe_int_stat(entry.get('New Christians'))
-            youth_val = safe_int_stat(entry.get('Youth Attendance'))
-            kids_val = safe_int_stat(entry.get('Kids Total'))
-            connect_groups_val = safe_int_stat(entry.get('Connect Groups'))
-            
-            # Only count entries with at least one stat
-            if any([attendance_val, new_people_val, new_christians_val, youth_val, kids_val, connect_groups_val]):
-                entry_count += 1
-            
-            # Add to totals
-            total_attendance += attendance_val
-            total_new_people += new_people_val
-            total_new_christians += new_christians_val
-            total_youth += youth_val
-            total_kids += kids_val
-            total_connect_groups += connect_groups_val
-            
-            # Add to lists for averages (only if > 0)
-            if attendance_val > 0:
-                attendance_values.append(attendance_val)
-            if new_people_val > 0:
-                new_people_values.append(new_people_val)
-            if new_christians_val > 0:
-                new_christians_values.append(new_christians_val)
-            if youth_val > 0:
-                youth_values.append(youth_val)
-            if kids_val > 0:
-                kids_values.append(kids_val)
-            if connect_groups_val > 0:
-                connect_groups_values.append(connect_groups_val)
-    
-    # Calculate averages
-    avg_attendance = sum(attendance_values) / len(attendance_values) if attendance_values else 0
-    avg_new_people = sum(new_people_values) / len(new_people_values) if new_people_values else 0
-    avg_new_christians = sum(new_christians_values) / len(new_christians_values) if new_christians_values else 0
-    avg_youth = sum(youth_values) / len(youth_values) if youth_values else 0
-    avg_kids = sum(kids_values) / len(kids_values) if kids_values else 0
-    avg_connect_groups = sum(connect_groups_values) / len(connect_groups_values) if connect_groups_values else 0
+    # Totals and averages of the days in the period
+    campus, period = summarize_report_period(campus, start_date, end_date, include_undated=True)
+    entry_count = period['entry_count']
     
     # Create results in the same format as annual report
     results = []
@@ -2683,27 +4249,8 @@ def generate_monthly_report(campus: str, year: int, month: int) -> dict:
     ]
     
     for stat_type, stat_label, _ in stat_types:
-        if stat_type == 'attendance':
-            total = total_attendance
-            avg = avg_attendance
-        elif stat_type == 'new_people':
-            total = total_new_people
-            avg = avg_new_people
-        elif stat_type == 'new_christians':
-            total = total_new_christians
-            avg = avg_new_christians
-        elif stat_type == 'youth':
-            total = total_youth
-            avg = avg_youth
-        elif stat_type == 'kids':
-            total = total_kids
-            avg = avg_kids
-        elif stat_type == 'connect_groups':
-            total = total_connect_groups
-            avg = avg_connect_groups
-        else:
-            total = 0
-            avg = 0
+        total = period['totals'][stat_type]
+        avg = period['averages'][stat_type]
         
         results.append({
             "stat": stat_type,
@@ -2734,110 +4281,9 @@ def generate_mid_year_report(campus: str, year: int) -> dict:
     start_date = datetime(year, 1, 1)
     end_date = datetime(year, 6, 30)
     
-    # Get rows data
-    rows = []
-    if sheet:
-        try:
-            rows = sheet.get_all_records()
-        except Exception as e:
-            logger.error(f"Failed to get stats from Google Sheets: {e}")
-            rows = []
-    
-    if not rows:
-        memory = load_conversation_memory()
-        campus_history = memory.get("session_stats", {}).get(campus, [])
-        if not campus_history:
-            campus_capitalized = campus.title()
-            campus_history = memory.get("session_stats", {}).get(campus_capitalized, [])
-            if campus_history:
-                campus = campus_capitalized
-        rows = campus_history
-    
-    # Filter rows by campus and date range
-    filtered_rows = []
-    campus_normalized = normalize_campus(campus)
-    
-    for row in rows:
-        row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-        if row_campus == campus_normalized or campus_normalized in row_campus:
-            timestamp_str = row.get("Timestamp", "")
-            if timestamp_str:
-                try:
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    if start_date <= row_date <= end_date:
-                        filtered_rows.append(row)
-                except Exception:
-                    continue
-    
-    # Calculate stats for the mid-year period
-    total_attendance = 0
-    total_new_people = 0
-    total_new_christians = 0
-    total_youth = 0
-    total_kids = 0
-    total_connect_groups = 0
-    entry_count = 0
-    
-    # Track values for average calculation
-    attendance_values = []
-    new_people_values = []
-    new_christians_values = []
-    youth_values = []
-    kids_values = []
-    connect_groups_values = []
-    
-    for entry in filtered_rows:
-        if isinstance(entry, dict):
-            def safe_int_stat(val):
-                try:
-                    if val is None or val == '':
-                        return 0
-                    return int(str(val).replace(',', '').strip())
-                except Exception:
-                    return 0
-            attendance_val = safe_int_stat(entry.get('Total Attendance'))
-            new_people_val = safe_int_stat(entry.get('New People'))
-            new_christians_val = safe_int_stat(entry.get('New Christians'))
-            youth_val = safe_int_stat(entry.get('Youth Attendance'))
-            kids_val = safe_int_stat(entry.get('Kids Total'))
-            connect_groups_val = safe_int_stat(entry.get('Connect Groups'))
-            
-            # Only count entries with at least one stat
-            if any([attendance_val, new_people_val, new_christians_val, youth_val, kids_val, connect_groups_val]):
-                entry_count += 1
-            
-            # Add to totals
-            total_attendance += attendance_val
-            total_new_people += new_people_val
-            total_new_christians += new_christians_val
-            total_youth += youth_val
-            total_kids += kids_val
-            total_connect_groups += connect_groups_val
-            
-            # Add to lists for averages (only if > 0)
-            if attendance_val > 0:
-                attendance_values.append(attendance_val)
-            if new_people_val > 0:
-                new_people_values.append(new_people_val)
-            if new_christians_val > 0:
-                new_christians_values.append(new_christians_val)
-            if youth_val > 0:
-                youth_values.append(youth_val)
-            if kids_val > 0:
-                kids_values.append(kids_val)
-            if connect_groups_val > 0:
-                connect_groups_values.append(connect_groups_val)
-    
-    # Calculate averages
-    avg_attendance = sum(attendance_values) / len(attendance_values) if attendance_values else 0
-    avg_new_people = sum(new_people_values) / len(new_people_values) if new_people_values else 0
-    avg_new_christians = sum(new_christians_values) / len(new_christians_values) if new_christians_values else 0
-    avg_youth = sum(youth_values) / len(youth_values) if youth_values else 0
-    avg_kids = sum(kids_values) / len(kids_values) if kids_values else 0
-    avg_connect_groups = sum(connect_groups_values) / len(connect_groups_values) if connect_groups_values else 0
+    # Totals and averages of the days in the period
+    campus, period = summarize_report_period(campus, start_date, end_date)
+    entry_count = period['entry_count']
     
     # Create results in the same format as annual report
     results = []
@@ -2851,27 +4297,8 @@ def generate_mid_year_report(campus: str, year: int) -> dict:
     ]
     
     for stat_type, stat_label, avg_key in stat_types:
-        if stat_type == 'attendance':
-            total = total_attendance
-            avg = avg_attendance
-        elif stat_type == 'new_people':
-            total = total_new_people
-            avg = avg_new_people
-        elif stat_type == 'new_christians':
-            total = total_new_christians
-            avg = avg_new_christians
-        elif stat_type == 'youth':
-            total = total_youth
-            avg = avg_youth
-        elif stat_type == 'kids':
-            total = total_kids
-            avg = avg_kids
-        elif stat_type == 'connect_groups':
-            total = total_connect_groups
-            avg = avg_connect_groups
-        else:
-            total = 0
-            avg = 0
+        total = period['totals'][stat_type]
+        avg = period['averages'][stat_type]
         
         results.append({
             "stat": stat_type,
@@ -2917,23 +4344,23 @@ def generate_full_stat_report(campus: str, years: list) -> dict:
         ('new_people', 'New People', 'new_people'),  # Keep for backward compatibility
     ]
     results = []
+    rows = []
+    if stats_storage:
+        try:
+            rows = get_sheet_rows()
+        except Exception as e:
+            logger.error(f"Failed to get stats from Google Sheets: {e}")
+            rows = []
+    if not rows:
+        memory = load_conversation_memory()
+        campus_history = memory.get("session_stats", {}).get(campus, [])
+        if not campus_history:
+            campus_capitalized = campus.title()
+            campus_history = memory.get("session_stats", {}).get(campus_capitalized, [])
+            if campus_history:
+                campus = campus_capitalized
+        rows = campus_history
     for year in years:
-        rows = []
-        if sheet:
-            try:
-                rows = sheet.get_all_records()
-            except Exception as e:
-                logger.error(f"Failed to get stats from Google Sheets: {e}")
-                rows = []
-        if not rows:
-            memory = load_conversation_memory()
-            campus_history = memory.get("session_stats", {}).get(campus, [])
-            if not campus_history:
-                campus_capitalized = campus.title()
-                campus_history = memory.get("session_stats", {}).get(campus_capitalized, [])
-                if campus_history:
-                    campus = campus_capitalized
-            rows = campus_history
         year_stats = calculate_stats_for_year_range(rows, campus, year)
         for stat_type, stat_label, avg_key in stat_types:
             # Get total and average from the calculated stats
@@ -2992,29 +4419,7 @@ def generate_spoken_report_summary(results: list, campus: str, years: list) -> s
 
 def detect_specific_stat_in_comparison(question: str) -> Optional[str]:
     """Detect which specific stat is being compared in the question"""
-    question_lower = question.lower()
-    
-    # Map of stat keywords to stat types
-    stat_keywords = {
-        'attendance': ['attendance', 'total attendance', 'total', 'people'],
-        'new_people': ['new people', 'newpeople', 'np', 'new', 'visitors'],
-        'new_christians': ['new christians', 'christians', 'souls', 'salvations', 'conversions'],
-        'youth': ['youth', 'youth attendance', 'teens', 'teenagers'],
-        'kids': ['kids', 'children', 'kids total', 'children total'],
-        'connect_groups': ['connect groups', 'connectgroups', 'groups', 'small groups', 'cell groups'],
-        'dream_team': ['volunteers', 'dream team', 'serving', 'team']
-    }
-    
-    # Check for specific stat mentions
-    for stat_type, keywords in stat_keywords.items():
-        for keyword in keywords:
-            if keyword in question_lower:
-                logger.info(f"[COMPARE] Detected specific stat: {stat_type} (keyword: {keyword})")
-                return stat_type
-    
-    # If no specific stat detected, return None (will show all stats)
-    logger.info(f"[COMPARE] No specific stat detected, will show all stats")
-    return None
+    return parse_utterance(question).compared_stat
 
 def generate_targeted_comparison_report(campus: str, year: int, period_type: str, period_value: Optional[int], specific_stat: str) -> dict:
     """Generate a targeted report with only the specific stat for comparison"""
@@ -3205,140 +4610,26 @@ def handle_period_comparison_request(question: str, campus: str, years: list, pe
 
 def calculate_stats_from_filtered_rows(filtered_rows: List[dict]) -> dict:
     """Calculate stats from already filtered rows without additional filtering"""
-    # Initialize all stat totals
-    stats = {
-        'attendance': 0,
-        'first_time_visitors': 0,
-        'information_gathered': 0,
-        'new_christians': 0,
-        'rededications': 0,
-        'youth_attendance': 0,
-        'youth_salvations': 0,
-        'youth_new_people': 0,
-        'kids_attendance': 0,
-        'kids_leaders': 0,
-        'new_kids': 0,
-        'new_kids_salvations': 0,
-        'connect_groups': 0,
-        'dream_team': 0,
-        'tithe': 0,
-        'baptisms': 0,
-        'child_dedications': 0,
-        'new_people': 0  # Keep for backward compatibility
-    }
-    
-    # Track values for average calculation
-    averages = {}
-    entry_count = 0
-    
-    for entry in filtered_rows:
-        if isinstance(entry, dict):
-            def safe_int_stat(val):
-                try:
-                    if val is None or val == '':
-                        return 0
-                    return int(str(val).replace(',', '').strip())
-                except Exception:
-                    return 0
-            
-            # Extract all available stats with flexible field name matching
-            def get_stat_value(field_names):
-                """Get stat value from multiple possible field names"""
-                for field_name in field_names:
-                    value = entry.get(field_name)
-                    if value is not None and value != '':
-                        return safe_int_stat(value)
-                return 0
-            
-            stat_values = {
-                'attendance': get_stat_value(['Total Attendance']),
-                'first_time_visitors': get_stat_value(['First Time Visitors']),
-                'information_gathered': get_stat_value(['Information Gathered']),
-                'new_christians': get_stat_value(['First Time Christians', 'New Christians']),
-                'rededications': get_stat_value(['Rededications']),
-                'youth_attendance': get_stat_value(['Youth Attendance']),
-                'youth_salvations': get_stat_value(['Youth Salvations']),
-                'youth_new_people': get_stat_value(['Youth New People']),
-                'kids_attendance': get_stat_value(['Kids Attendance', 'Kids Total']),
-                'kids_leaders': get_stat_value(['Kids Leaders']),
-                'new_kids': get_stat_value(['New Kids']),
-                'new_kids_salvations': get_stat_value(['New Kids Salvations']),
-                'connect_groups': get_stat_value(['Connect Groups']),
-                'dream_team': get_stat_value(['Dream Team']),
-                'tithe': get_stat_value(['Tithe']),
-                'baptisms': get_stat_value(['Baptisms']),
-                'child_dedications': get_stat_value(['Child Dedications']),
-                'new_people': get_stat_value(['New People'])  # Keep for backward compatibility
-            }
-            
-            # Only count entries with at least one stat
-            if any(stat_values.values()):
-                entry_count += 1
-            
-            # Add to totals
-            for stat_name, value in stat_values.items():
-                stats[f'total_{stat_name}'] = stats.get(f'total_{stat_name}', 0) + value
-                
-                # Track for averages (only if > 0)
-                if value > 0:
-                    if stat_name not in averages:
-                        averages[stat_name] = []
-                    averages[stat_name].append(value)
-    
-    # Calculate averages
-    avg_stats = {}
-    for stat_name, values in averages.items():
-        if values:
-            avg_stats[stat_name] = round(sum(values) / len(values), 1)
-        else:
-            avg_stats[stat_name] = 0
-    
-    return {
-        "total_entries": entry_count,
-        **stats,
-        "averages": avg_stats
-    }
+    table = get_stats_table(filtered_rows)
+    return table.summarize(table.all_rows())
 
-def calculate_stats_for_year_range(rows: List[dict], campus: str, start_year: int, end_year: Optional[int] = None) -> dict:
-    """Calculate stats for a specific year range"""
+def calculate_stats_for_year_range(rows: List[dict], campus: str, start_year: int, end_year: Optional[int] = None,
+                                   start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> dict:
+    """Calculate stats for a specific year range, optionally narrowed to [start_date, end_date]"""
     if end_year is None:
         end_year = start_year
     
-    start_date = datetime(start_year, 1, 1)
-    end_date = datetime(end_year, 12, 31)
+    year_start = datetime(start_year, 1, 1)
+    year_end = datetime(end_year, 12, 31)
     
-    # Normalize campus name for comparison
-    campus_normalized = normalize_campus(campus)
-    filtered_rows = []
-    unique_campuses = set()
-    
-    for row in rows:
-        row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-        unique_campuses.add(row_campus)
-        if row_campus == campus_normalized or campus_normalized in row_campus:
-            print(f"MATCHED ROW for {campus}: {row}")  # DEBUG: Show matched rows
-            # Apply date filtering
-            try:
-                timestamp_str = row.get("Timestamp", "")
-                if timestamp_str:
-                    # Handle different timestamp formats
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    # Check if row date is within the specified range
-                    if start_date <= row_date <= end_date:
-                        filtered_rows.append(row)
-                else:
-                    # If no timestamp, include the row (fallback)
-                    filtered_rows.append(row)
-            except Exception as e:
-                logger.warning(f"Could not parse timestamp for row: {e}")
-                filtered_rows.append(row)
-    print(f"[DEBUG] Unique campuses in data: {sorted(unique_campuses)}")
-    
-    # Use the comprehensive calculate_stats_from_filtered_rows function
-    stats = calculate_stats_from_filtered_rows(filtered_rows)
+    table = get_stats_table(rows)
+    print(f"[DEBUG] Unique campuses in data: {sorted(table.campus_names)}")
+    if start_date is None and end_date is None:
+        # Whole years merge from the daily rollup; if no timestamp, include the row (fallback)
+        stats = table.rollup().summarize(campus, year_start, year_end, include_undated=True)
+    else:
+        selection = table.select(campus, max(year_start, start_date or year_start), min(year_end, end_date or year_end))
+        stats = table.summarize(selection)
     stats["year"] = start_year
     return stats
 
@@ -3411,11 +4702,11 @@ def extract_stat_from_row(entry, stat_type):
 def get_weekly_campus_comparison_data():
     """Get weekly comparison data across all campuses for senior leaders/admins (always last 7 days)"""
     try:
-        if not sheet:
+        if not stats_storage:
             return []
         
         # Get all records
-        rows = sheet.get_all_records()
+        rows = get_sheet_rows()
         if not rows:
             return []
         
@@ -3632,11 +4923,11 @@ def get_dashboard_data(campus, date_filter='last_30_days', custom_start_date='',
     U: Child Dedications
     """
     try:
-        if not sheet:
+        if not stats_storage:
             return {"error": "Google Sheets not connected"}
         
         # Get all records
-        rows = sheet.get_all_records()
+        rows = get_sheet_rows()
         if not rows:
             return {"stats": {}, "recent_entries": [], "trends": {}}
         
@@ -3934,9 +5225,9 @@ def get_dashboard_data(campus, date_filter='last_7_days', custom_start_date='',
     try:
         # Get data from Google Sheets
         rows = []
-        if sheet:
+        if stats_storage:
             try:
-                rows = sheet.get_all_records()
+                rows = get_sheet_rows()
             except Exception as e:
                 logger.error(f"Failed to get stats from Google Sheets: {e}")
                 rows = []
@@ -3964,95 +5255,60 @@ def get_dashboard_data(campus, date_filter='last_7_days', custom_start_date='',
             start_date = end_date - timedelta(days=30)  # Default to 30 days
         
         # Filter rows by campus and date range
-        filtered_rows = []
-        campus_normalized = normalize_campus(campus) if campus != 'all_campuses' else None
-        
-        for row in rows:
-            try:
-                # Check campus filter
-                if campus_normalized:
-                    row_campus = normalize_campus(row.get("Campus") or row.get("campus") or "")
-                    if row_campus != campus_normalized and campus_normalized not in row_campus:
-                        continue
-                
-                # Check date filter
-                timestamp_str = row.get("Timestamp", "")
-                if timestamp_str:
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        row_date = parse_any_date(timestamp_str)
-                    if start_date <= row_date <= end_date:
-                        filtered_rows.append(row)
-                else:
-                    filtered_rows.append(row)  # Include rows without timestamps
-            except Exception as e:
-                logger.warning(f"Error processing row: {e}")
-                continue
+        table = get_stats_table(rows)
+        selection = table.select(campus if campus != 'all_campuses' else None, start_date, end_date, include_undated=True)
         
         # Calculate stats using correct Google Sheets headers
-        total_attendance = sum(safe_int(row.get('Total Attendance', 0)) for row in filtered_rows)
+        def total(field):
+            return table.total(field, selection)
+        
+        total_attendance = total('Total Attendance')
         
         # New People = First Time Visitors + Visitors
-        total_new_people = sum(
-            safe_int(row.get('First Time Visitors', 0)) + safe_int(row.get('Visitors', 0)) 
-            for row in filtered_rows
-        )
+        total_new_people = total('First Time Visitors') + total('Visitors')
         
         # New Christians = First Time Christians + Rededications
-        total_new_christians = sum(
-            safe_int(row.get('First Time Christians', 0)) + safe_int(row.get('Rededications', 0))
-            for row in filtered_rows
-        )
+        total_new_christians = total('First Time Christians') + total('Rededications')
         
-        total_youth = sum(safe_int(row.get('Youth Attendance', 0)) for row in filtered_rows)
-        total_kids = sum(safe_int(row.get('Kids Attendance', 0)) for row in filtered_rows)
-        total_connect_groups = sum(safe_int(row.get('Connect Groups', 0)) for row in filtered_rows)
-        total_dream_team = sum(safe_int(row.get('Dream Team', 0)) for row in filtered_rows)
-        total_tithe = sum(safe_int(row.get('Tithe', 0)) for row in filtered_rows)
+        total_youth = total('Youth Attendance')
+        total_kids = total('Kids Attendance')
+        total_connect_groups = total('Connect Groups')
+        total_dream_team = total('Dream Team')
+        total_tithe = total('Tithe')
         
         # Calculate averages
-        valid_entries = len([row for row in filtered_rows if safe_int(row.get('Total Attendance', 0)) > 0])
+        valid_entries = int(np.count_nonzero(table.stat('Total Attendance')[selection] > 0))
         avg_attendance = total_attendance / valid_entries if valid_entries > 0 else 0
         avg_new_people = total_new_people / valid_entries if valid_entries > 0 else 0
         avg_new_christians = total_new_christians / valid_entries if valid_entries > 0 else 0
         avg_youth = total_youth / valid_entries if valid_entries > 0 else 0
         avg_kids = total_kids / valid_entries if valid_entries > 0 else 0
         avg_connect_groups = total_connect_groups / valid_entries if valid_entries > 0 else 0
-        avg_dream_team = total_dream_team / valid_entries if valid_entries > 0 else 0
-        
-        # Prepare chart data (last 10 entries for trends)
-        chart_rows = sorted(filtered_rows, key=lambda x: x.get('Timestamp', ''))[-10:]
-        attendance_labels = []
-        attendance_values = []
-        
-        for row in chart_rows:
-            try:
-                timestamp_str = row.get("Timestamp", "")
-                if timestamp_str:
-                    if "T" in timestamp_str:
-                        date_obj = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        date_obj = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    attendance_labels.append(date_obj.strftime('%m/%d'))
-                else:
-                    attendance_labels.append('Unknown')
-                attendance_values.append(safe_int(row.get('Total Attendance', 0)))
-            except Exception:
-                continue
+        avg_dream_team = total_dream_team / valid_entries if valid_entries > 0 else 0
+        
+        # Prepare chart data (last 10 entries for trends)
+        chart_indices = selection[-10:]
+        attendance_labels = []
+        attendance_values = []
+        
+        attendance_column = table.stat('Total Attendance')
+        for i in chart_indices:
+            row_timestamp = table.timestamps[i]
+            attendance_labels.append(row_timestamp.strftime('%m/%d') if row_timestamp else 'Unknown')
+            attendance_values.append(int(attendance_column[i]))
         
         # Calculate detailed breakdown stats for modals using correct headers
-        total_first_time_visitors = sum(safe_int(row.get('First Time Visitors', 0)) for row in filtered_rows)
-        total_visitors = sum(safe_int(row.get('Visitors', 0)) for row in filtered_rows)
-        total_first_time_christians = sum(safe_int(row.get('First Time Christians', 0)) for row in filtered_rows)
-        total_rededications = sum(safe_int(row.get('Rededications', 0)) for row in filtered_rows)
-        total_youth_attendance = sum(safe_int(row.get('Youth Attendance', 0)) for row in filtered_rows)
-        total_youth_salvations = sum(safe_int(row.get('Youth Salvations', 0)) for row in filtered_rows)
-        total_youth_new_people = sum(safe_int(row.get('Youth New People', 0)) for row in filtered_rows)
-        total_kids_attendance = sum(safe_int(row.get('Kids Attendance', 0)) for row in filtered_rows)
-        total_kids_leaders = sum(safe_int(row.get('Kids Leaders', 0)) for row in filtered_rows)
-        total_new_kids = sum(safe_int(row.get('New Kids', 0)) for row in filtered_rows)
-        total_new_kids_salvations = sum(safe_int(row.get('New Kids Salvations', 0)) for row in filtered_rows)
+        total_first_time_visitors = total('First Time Visitors')
+        total_visitors = total('Visitors')
+        total_first_time_christians = total('First Time Christians')
+        total_rededications = total('Rededications')
+        total_youth_attendance = total('Youth Attendance')
+        total_youth_salvations = total('Youth Salvations')
+        total_youth_new_people = total('Youth New People')
+        total_kids_attendance = total('Kids Attendance')
+        total_kids_leaders = total('Kids Leaders')
+        total_new_kids = total('New Kids')
+        total_new_kids_salvations = total('New Kids Salvations')
 
         return {
             'stats': {
@@ -4102,11 +5358,11 @@ def get_dashboard_data(campus, date_filter='last_7_days', custom_start_date='',
 def get_campus_comparison_data(campus_filter=None):
     """Get comparison data across campuses for leadership insights"""
     try:
-        if not sheet:
+        if not stats_storage:
             return []
         
         # sheet is already a worksheet object, not a spreadsheet
-        data = sheet.get_all_records()
+        data = get_sheet_rows()
         
         if not data:
             return []
@@ -4123,99 +5379,51 @@ def get_campus_comparison_data(campus_filter=None):
                        'mount_barker', 'victor_harbour', 'copper_coast']
         
         campus_stats = []
+        table = get_stats_table(data)
+        
+        def total(field, selection):
+            return table.total(field, selection)
         
         for campus in campuses:
             # Filter data for this campus and date range
-            campus_data = []
-            for row in data:
-                try:
-                    date_str = row.get('Date', '')
-                    if not date_str:
-                        continue
-                    
-                    # Try multiple date formats
-                    row_date = None
-                    date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S']
-                    
-                    for date_format in date_formats:
-                        try:
-                            row_date = datetime.strptime(date_str, date_format)
-                            break
-                        except ValueError:
-                            continue
-                    
-                    if row_date and start_date <= row_date <= end_date and row.get('Campus', '').lower() == campus.lower():
-                        campus_data.append(row)
-                except (ValueError, TypeError):
-                    continue
+            campus_data = table.select(campus, start_date, end_date, by='Date', exact_campus=True)
             
-            if campus_data:
+            if len(campus_data):
+                record_count = len(campus_data)
+                
                 # Calculate basic stats for this campus using correct headers
-                total_attendance = sum(safe_int(row.get('Total Attendance', 0)) for row in campus_data)
+                total_attendance = total('Total Attendance', campus_data)
                 
                 # New People = First Time Visitors + Visitors  
-                total_new_people = sum(
-                    safe_int(row.get('First Time Visitors', 0)) + safe_int(row.get('Visitors', 0))
-                    for row in campus_data
-                )
+                total_new_people = total('First Time Visitors', campus_data) + total('Visitors', campus_data)
                 
                 # New Christians = First Time Christians + Rededications
-                total_new_christians = sum(
-                    safe_int(row.get('First Time Christians', 0)) + safe_int(row.get('Rededications', 0))
-                    for row in campus_data
-                )
+                total_new_christians = total('First Time Christians', campus_data) + total('Rededications', campus_data)
                 
-                total_youth = sum(safe_int(row.get('Youth Attendance', 0)) for row in campus_data)
-                total_kids = sum(safe_int(row.get('Kids Attendance', 0)) for row in campus_data)
+                total_youth = total('Youth Attendance', campus_data)
+                total_kids = total('Kids Attendance', campus_data)
                 
-                avg_attendance = total_attendance / len(campus_data) if campus_data else 0
-                avg_new_people = total_new_people / len(campus_data) if campus_data else 0
-                avg_new_christians = total_new_christians / len(campus_data) if campus_data else 0
+                avg_attendance = total_attendance / record_count
+                avg_new_people = total_new_people / record_count
+                avg_new_christians = total_new_christians / record_count
                 
                 # Calculate growth rates compared to previous period
                 prev_start = start_date - timedelta(days=30)
-                prev_data = []
-                for row in data:
-                    try:
-                        date_str = row.get('Date', '')
-                        if not date_str:
-                            continue
-                        
-                        # Try multiple date formats
-                        row_date = None
-                        date_formats = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S']
-                        
-                        for date_format in date_formats:
-                            try:
-                                row_date = datetime.strptime(date_str, date_format)
-                                break
-                            except ValueError:
-                                continue
-                        
-                        if row_date and prev_start <= row_date < start_date and row.get('Campus', '').lower() == campus.lower():
-                            prev_data.append(row)
-                    except (ValueError, TypeError):
-                        continue
+                prev_data = table.select(campus, prev_start, start_date, by='Date', exact_campus=True, end_inclusive=False)
                 
                 # Calculate growth percentages
                 attendance_growth = 0
                 new_people_growth = 0
                 new_christians_growth = 0
                 
-                if prev_data:
-                    prev_avg_attendance = sum(safe_int(row.get('Total Attendance', 0)) for row in prev_data) / len(prev_data)
+                if len(prev_data):
+                    prev_avg_attendance = total('Total Attendance', prev_data) / len(prev_data)
                     
                     # Calculate previous period averages with correct headers
-                    prev_total_new_people = sum(
-                        safe_int(row.get('First Time Visitors', 0)) + safe_int(row.get('Visitors', 0))
-                        for row in prev_data
-                    )
+                    prev_total_new_people = total('First Time Visitors', prev_data) + total('Visitors', prev_data)
                     prev_avg_new_people = prev_total_new_people / len(prev_data)
                     
-                    prev_total_new_christians = sum(
-                        safe_int(row.get('First Time Christians', 0)) + safe_int(row.get('Rededications', 0))
-                        for row in prev_data
-                    )
+                    prev_total_new_christians = total('First Time Christians', prev_data) + total('Rededications', prev_data)
                     prev_avg_new_christians = prev_total_new_christians / len(prev_data)
                     
                     if prev_avg_attendance > 0:
@@ -4233,12 +5441,12 @@ def get_campus_comparison_data(campus_filter=None):
                     'attendance': round(avg_attendance, 1),
                     'new_people': round(avg_new_people, 1),
                     'new_christians': round(avg_new_christians, 1),
-                    'youth': round(total_youth / len(campus_data), 1) if campus_data else 0,
-                    'kids': round(total_kids / len(campus_data), 1) if campus_data else 0,
+                    'youth': round(total_youth / record_count, 1),
+                    'kids': round(total_kids / record_count, 1),
                     'attendance_growth': round(attendance_growth, 1),
                     'new_people_growth': round(new_people_growth, 1),
                     'new_christians_growth': round(new_christians_growth, 1),
-                    'total_records': len(campus_data),
+                    'total_records': record_count,
                     'conversion_rate': round((avg_new_christians / max(avg_new_people, 1)) * 100, 1)
                 })
         
@@ -4354,9 +5562,9 @@ def get_weekly_campus_comparison_data():
     try:
         # Get data from Google Sheets
         rows = []
-        if sheet:
+        if stats_storage:
             try:
-                rows = sheet.get_all_records()
+                rows = get_sheet_rows()
             except Exception as e:
                 logger.error(f"Failed to get stats from Google Sheets: {e}")
                 rows = []
@@ -4368,33 +5576,25 @@ def get_weekly_campus_comparison_data():
         end_date = datetime.now()
         start_date = end_date - timedelta(days=7)
         
-        # Group by campus
+        # Group this week's rows by campus
+        table = get_stats_table(rows)
+        attendance = table.stat('Total Attendance')
+        new_people = table.stat('New People')
+        new_christians = table.stat('New Christians')
         campus_data = {}
-        for row in rows:
-            try:
-                # Check if row is within current week
-                timestamp_str = row.get("Timestamp", "")
-                if timestamp_str:
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    
-                    if start_date <= row_date <= end_date:
-                        campus = row.get("Campus", "").lower()
-                        if campus not in campus_data:
-                            campus_data[campus] = {
-                                'campus': campus,
-                                'attendance': 0,
-                                'new_people': 0,
-                                'new_christians': 0
-                            }
-                        
-                        campus_data[campus]['attendance'] += safe_int(row.get('Total Attendance', 0))
-                        campus_data[campus]['new_people'] += safe_int(row.get('New People', 0))
-                        campus_data[campus]['new_christians'] += safe_int(row.get('New Christians', 0))
-            except Exception:
-                continue
+        for i in table.select(start_date=start_date, end_date=end_date):
+            campus = str(table.rows[i].get("Campus", "")).lower()
+            if campus not in campus_data:
+                campus_data[campus] = {
+                    'campus': campus,
+                    'attendance': 0,
+                    'new_people': 0,
+                    'new_christians': 0
+                }
+            
+            campus_data[campus]['attendance'] += int(attendance[i])
+            campus_data[campus]['new_people'] += int(new_people[i])
+            campus_data[campus]['new_christians'] += int(new_christians[i])
         
         # Convert to list and sort by attendance
         comparison_list = list(campus_data.values())
@@ -4425,38 +5625,27 @@ def get_weekly_campus_comparison_data():
 def get_existing_tithe_data(selected_date):
     """Get existing tithe data for the selected date"""
     try:
-        if not sheet:
+        if not stats_storage:
             return {}
         
         # Get all rows from the sheet
-        rows = sheet.get_all_records()
+        rows = get_sheet_rows()
         existing_data = {}
         
         # Parse the selected date
-        target_date = datetime.strptime(selected_date, '%Y-%m-%d').date()
-        
-        for row in rows:
-            date_str = row.get("Date", "")
-            if date_str:
-                try:
-                    # Parse the date from the row
-                    if "T" in date_str:
-                        row_date = datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
-                    else:
-                        row_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                    
-                    # If dates match, collect tithe data
-                    if row_date == target_date:
-                        campus = row.get('Campus', '')
-                        tithe_amount = row.get('Tithe', 0)
-                        if campus and tithe_amount:
-                            existing_data[campus.lower()] = {
-                                'amount': safe_int(tithe_amount),
-                                'row_index': rows.index(row) + 2  # +2 because sheets are 1-indexed and have header
-                            }
-                except Exception as e:
-                    logger.warning(f"Error parsing date {date_str}: {e}")
-                    continue
+        day_start = datetime.strptime(selected_date, '%Y-%m-%d')
+        table = get_stats_table(rows)
+        
+        # Collect tithe data for rows on that date (later rows win)
+        for i in sorted(table.select(start_date=day_start, end_date=day_start + timedelta(days=1), by='Date', end_inclusive=False)):
+            row = table.rows[i]
+            campus = row.get('Campus', '')
+            tithe_amount = row.get('Tithe', 0)
+            if campus and tithe_amount:
+                existing_data[campus.lower()] = {
+                    'amount': safe_int(tithe_amount),
+                    'row_index': int(i) + 2  # +2 because sheets are 1-indexed and have header
+                }
         
         return existing_data
         
@@ -4506,33 +5695,16 @@ def submit_tithe_data():
 def update_tithe_for_campus(campus_id, date_str, tithe_amount):
     """Update or add tithe data for a specific campus and date"""
     try:
-        if not sheet:
+        if not stats_storage:
             return {'success': False, 'message': 'Sheet not available'}
         
-        # Get all rows
-        rows = sheet.get_all_records()
-        target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        
         # Look for existing row for this campus and date
-        existing_row_index = None
-        for i, row in enumerate(rows):
-            date_str_row = row.get("Date", "")
-            if date_str_row:
-                try:
-                    if "T" in date_str_row:
-                        row_date = datetime.fromisoformat(date_str_row.replace('Z', '+00:00')).date()
-                    else:
-                        row_date = datetime.strptime(date_str_row, "%Y-%m-%d").date()
-                    
-                    if row_date == target_date and row.get('Campus', '').lower() == campus_id.lower():
-                        existing_row_index = i + 2  # +2 for 1-indexed and header
-                        break
-                except:
-                    continue
+        existing_key = stats_storage.find_row(campus_id, date_str)
         
-        if existing_row_index:
+        if existing_key is not None:
             # Update existing row - just update the Tithe column (Column S)
-            sheet.update(f'S{existing_row_index}', [[tithe_amount]])
+            stats_storage.update_value(existing_key, 'Tithe', tithe_amount)
+            invalidate_sheet_rows()
             logger.info(f"Updated tithe for {campus_id} on {date_str}: ${tithe_amount}")
             return {'success': True, 'message': f'Updated existing entry for {campus_id}'}
         else:
@@ -4561,7 +5733,7 @@ def update_tithe_for_campus(campus_id, date_str, tithe_amount):
                 ''   # U: Child Dedications
             ]
             
-            sheet.append_row(new_row)
+            stats_storage.log_rows([new_row])
             logger.info(f"Created new tithe entry for {campus_id} on {date_str}: ${tithe_amount}")
             return {'success': True, 'message': f'Created new entry for {campus_id}'}
             
@@ -4761,8 +5933,8 @@ def debug_users():
             })
         
         return jsonify({
-            "users_file_path": os.path.join(os.path.dirname(__file__), 'users.json'),
-            "users_file_exists": os.path.exists(os.path.join(os.path.dirname(__file__), 'users.json')),
+            "users_file_path": USERS_FILE,
+            "users_file_exists": os.path.exists(USERS_FILE),
             "users_count": len(users_list),
             "users": users_list
         })
@@ -4773,8 +5945,43 @@ def debug_users():
 def serve_audio(filename):
     """Serve generated audio files"""
     # Use absolute path to temp_audio directory in backend folder
-    temp_audio_dir = os.path.join(os.path.dirname(__file__), "temp_audio")
-    return send_from_directory(temp_audio_dir, filename)
+    if re.fullmatch(r'tts_[0-9a-f]{64}\.mp3', filename):
+        # The response may have gone out before its audio finished synthesizing
+        if not wait_for_audio(filename) and audio_generation_failed(filename):
+            return jsonify({"error": "Audio generation failed"}), 502
+    return send_from_directory(TEMP_AUDIO_DIR, filename)
+
+@app.route('/api/insights/<job_id>', methods=['GET'])
+@login_required
+def get_insight_job(job_id):
+    """Poll the state of a background insight job"""
+    job = load_insight_job(job_id)
+    if not job or job.get("owner") != current_user.id:
+        return jsonify({"error": "Insight job not found"}), 404
+    return jsonify(job)
+
+@app.route('/api/insights/<job_id>/stream', methods=['GET'])
+@login_required
+def stream_insight_job(job_id):
+    """Server-sent events for a background insight job, ending when it finishes"""
+    job = load_insight_job(job_id)
+    if not job or job.get("owner") != current_user.id:
+        return jsonify({"error": "Insight job not found"}), 404
+
+    def events():
+        current = job
+        deadline = time.time() + 120
+        while current and current["status"] == "pending" and time.time() < deadline:
+            yield ": waiting\n\n"
+            time.sleep(0.5)
+            current = load_insight_job(job_id)
+        if not current or current["status"] == "pending":
+            yield f"event: timeout\ndata: {json.dumps({'id': job_id})}\n\n"
+        else:
+            yield f"event: {current['status']}\ndata: {json.dumps(current)}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/<path:path>')
 def catch_all(path):
@@ -4791,12 +5998,67 @@ def catch_all(path):
 #     # The query page is now handled by the React app
 #     pass
 
+# Worker warm-up
+# Connects the lazy clients and loads the stats snapshot off the request path, so
+# the first real request doesn't pay for them. /ready answers 503 until it has
+# finished (successfully or not); /health answers as soon as the app is imported.
+_warm_up = {"pid": None, "started_at": None, "seconds": None, "errors": {}}
+_warm_up_lock = threading.Lock()
+IMPORT_SECONDS = None  # set at the end of the module
+
+def warm_up():
+    """Connect Sheets and Claude and build the stats table; errors are recorded, not raised."""
+    started = time.monotonic()
+    errors = {}
+    for client in (sheet, claude):
+        if client.configured:
+            try:
+                client.get()
+            except Exception as e:
+                errors[client.name] = str(e)
+    if stats_storage:
+        try:
+            get_stats_table(get_sheet_rows())
+        except Exception as e:
+            errors["stats"] = str(e)
+    _warm_up["errors"] = errors
+    _warm_up["seconds"] = round(time.monotonic() - started, 3)
+    logger.info(f"Warm-up finished in {_warm_up['seconds']}s" + (f" with errors: {errors}" if errors else ""))
+
+def start_warm_up():
+    """Run warm_up() in a background thread, once per process."""
+    with _warm_up_lock:
+        if _warm_up["pid"] == os.getpid():
+            return
+        _warm_up.update(pid=os.getpid(), started_at=time.monotonic(), seconds=None, errors={})
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+def is_ready() -> bool:
+    return _warm_up["pid"] == os.getpid() and _warm_up["seconds"] is not None
+
+@app.route('/ready')
+def readiness_check():
+    """Readiness probe: 200 once this worker has warmed up, 503 before"""
+    ready = is_ready()
+    return jsonify({
+        "ready": ready,
+        "pid": os.getpid(),
+        "snapshot_version": shared_snapshot.version,
+        "import_seconds": IMPORT_SECONDS,
+        "warm_up_seconds": _warm_up["seconds"] if ready else None,
+        "errors": _warm_up["errors"] if ready else {},
+        "sheets": sheet.status(),
+        "claude": claude.status(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }), 200 if ready else 503
+
 @app.route('/api/health')
 def health_check():
     return jsonify({
         "status": "ok",
-        "sheets_connected": sheet is not None,
-        "claude_connected": claude is not None,
+        "ready": is_ready(),
+        "sheets_connected": sheet.connected,
+        "claude_connected": claude.connected,
         "timestamp": datetime.now(timezone.utc).isoformat()
     })
 
@@ -4864,7 +6126,7 @@ def get_stats():
     if not current_user.has_permission('recall_stats'):
         return jsonify({"error": "You do not have permission to recall statistics data"}), 403
     
-    if not sheet:
+    if not stats_storage:
         return jsonify({"error": "Google Sheets not connected"}), 500
     try:
         campus_filter = request.args.get('campus', '').strip()
@@ -4877,7 +6139,7 @@ def get_stats():
                 }), 403
             # Force campus filter to user's campus
             campus_filter = current_user.campus
-        rows = sheet.get_all_records()
+        rows = get_sheet_rows()
         logger.info(f"Retrieved {len(rows)} total rows from Google Sheets")
         # Load any link-logged rows from memory (if you store them)
         # If you have a function to get link-logged rows, add them to rows here
@@ -5006,12 +6268,16 @@ def process_voice():
 
     text = str(data.get("text", "")).strip()
     campus = str(data.get("campus", "")).strip()
+    # Return straight away and deliver Claude insights through /api/insights/<id>;
+    # clients that want to wait for them inline send async_insights: false
+    async_insights = data.get("async_insights", True) is not False
 
     if not text:
         return jsonify({"error": "Missing text"}), 400
 
     # Always detect campus from text first, then fall back to provided campus
-    detected_campus = detect_campus(text)
+    parse = parse_utterance(text)
+    detected_campus = parse.campus
     if detected_campus:  # If we detected a specific campus
         campus = detected_campus
         logger.info(f"Detected campus from text: {campus}")
@@ -5039,88 +6305,8 @@ def process_voice():
     
     logger.info(f"Final campus: {campus}")
     
-    # Enhanced query detection with better natural language understanding
-    import re
-    text_lower = text.lower()
-    
-    # Query intent patterns (questions, requests for information)
-    query_patterns = [
-        r'\b(?:what|how|when|where|why|which|who)\b',
-        r'\b(?:tell me|show me|give me|can you|could you|would you)\b',
-        r'\b(?:what is|what was|what are|what were)\b',
-        r'\b(?:how many|how much|how often|how long)\b',
-        r'\b(?:average|total|sum|count|number)\b',
-        r'\b(?:compare|comparison|versus|vs)\b',
-        r'\b(?:trend|trends|pattern|growth|change)\b',
-        r'\b(?:report|summary|overview|recap|review)\b',
-        r'\b(?:this week|this month|this year|last week|last month|last year)\b',
-        r'\b(?:quarterly|monthly|annual|yearly)\b',
-        r'\b(?:best|worst|highest|lowest|top|bottom)\b',
-        r'\b(?:percentage|percent|%)\b',
-        r'\b(?:increase|decrease|up|down|better|worse)\b'
-    ]
-    
-    # Stat logging patterns (specific numbers being reported)
-    stat_patterns = [
-        r'\d+\s+(?:people|attendance|total|had|got|there were)',
-        r'\d+\s+(?:first\s+time|first-time|first\s+timers?|new\s+people|newcomers?)',
-        r'\d+\s+(?:visitors?|guests?)',
-        r'\d+\s+(?:info\s+gathered|information\s+gathered|details\s+gathered|cards\s+back|contact\s+cards)',
-        r'\d+\s+(?:salvations?|decisions?|got\s+saved|conversions?)',
-        r'\d+\s+(?:rededication|re-dedication)',
-        r'\d+\s+(?:youth|teens?)',
-        r'\d+\s+(?:kids|children)',
-        r'\d+\s+(?:connect\s+groups?|small\s+groups?|groups?)',
-        r'\d+\s+(?:dream\s+team|volunteers?|team\s+members?)',
-        r'\d+\s+(?:baptisms?|baptized|baptismal)',
-        r'\d+\s+(?:child\s+dedications?|baby\s+dedications?|dedications?)'
-    ]
-    
-    is_stat_logging = any(re.search(pattern, text.lower()) for pattern in stat_patterns)
-        
-    # Load conversation memory
-    memory = load_conversation_memory()
-    
-    # Check if this is a query request vs stat logging
-    text_lower = text.lower()
-    import re
-    
-    # FIRST: Check for clear query patterns (these take priority)
-    query_keywords = [
-        'how many', 'what is', 'what was', "what's", 'tell me', 'give me', 'show me',
-        'average', 'last week', 'this week', 'last month', 'this month', 'count', 'query', 'data', 
-        'has had', 'had this year', 'had this month', 'had last', 'compare', 'comparison', 
-        'vs', 'versus', 'between', 'year over year', 'review', 'annual review', 
-        'mid year review', 'mid-year review', 'midyear'
-    ]
-    
-    contains_year = bool(re.search(r'\b20\d{2}\b', text_lower))
-    contains_quarter = any(q in text_lower for q in ['q1', 'q2', 'q3', 'q4', 'quarter 1', 'quarter 2', 'quarter 3', 'quarter 4', 'first quarter', 'second quarter', 'third quarter', 'fourth quarter'])
-    
-    # Enhanced query detection with better natural language understanding
-    is_query = False
-    
-    # Check for query patterns with improved detection
-    query_indicators = [
-        # Question words
-        any(word in text_lower for word in ['what', 'how', 'when', 'where', 'why', 'which', 'who']),
-        # Request words
-        any(phrase in text_lower for phrase in ['tell me', 'show me', 'give me', 'can you', 'could you', 'would you']),
-        # Information seeking
-        any(phrase in text_lower for phrase in ['what is', 'what was', 'what are', 'what were', 'how many', 'how much']),
-        # Analysis words
-        any(word in text_lower for word in ['average', 'total', 'sum', 'count', 'number', 'compare', 'comparison']),
-        # Time references
-        any(phrase in text_lower for phrase in ['this week', 'this month', 'this year', 'last week', 'last month', 'last year']),
-        # Report words
-        any(word in text_lower for word in ['report', 'summary', 'overview', 'recap', 'review', 'trend', 'trends']),
-        # Year/quarter references
-        contains_year or contains_quarter,
-        # Starts with question words
-        text_lower.startswith(('what', 'how', 'show', 'give', 'tell', 'can you', 'could you'))
-    ]
-    
-    is_query = any(query_indicators)
+    # Query vs stat logging, from the compiled query cues (see classify_query)
+    is_query = parse.is_query
     
     # Validate campus exists if provided (AFTER query detection)
     if campus and campus.lower() != 'all_campuses':  # Skip validation for all_campuses
@@ -5139,70 +6325,6 @@ def process_voice():
             logger.warning(f"Could not validate campus access: {str(e)}")
             # Continue processing if campus validation fails (for backward compatibility)
 
-    # Load conversation memory
-    memory = load_conversation_memory()
-    
-    # Check if this is a query request vs stat logging
-    text_lower = text.lower()
-    import re
-    
-    # FIRST: Check for clear query patterns (these take priority)
-    query_keywords = [
-        'how many', 'what is', 'what was', "what's", 'tell me', 'give me', 'show me',
-        'average', 'last week', 'this week', 'last month', 'this month', 'count', 'query', 'data', 
-        'has had', 'had this year', 'had this month', 'had last', 'compare', 'comparison', 
-        'vs', 'versus', 'between', 'year over year', 'review', 'annual review', 
-        'mid year review', 'mid-year review', 'midyear'
-    ]
-    
-    contains_year = bool(re.search(r'\b20\d{2}\b', text_lower))
-    contains_quarter = any(q in text_lower for q in ['q1', 'q2', 'q3', 'q4', 'quarter 1', 'quarter 2', 'quarter 3', 'quarter 4', 'first quarter', 'second quarter', 'third quarter', 'fourth quarter'])
-    
-    # Enhanced query detection with better natural language understanding
-    is_query = False
-    
-    # Check for query patterns with improved detection
-    query_indicators = [
-        # Question words
-        any(word in text_lower for word in ['what', 'how', 'when', 'where', 'why', 'which', 'who']),
-        # Request words
-        any(phrase in text_lower for phrase in ['tell me', 'show me', 'give me', 'can you', 'could you', 'would you']),
-        # Information seeking
-        any(phrase in text_lower for phrase in ['what is', 'what was', 'what are', 'what were', 'how many', 'how much']),
-        # Analysis words
-        any(word in text_lower for word in ['average', 'total', 'sum', 'count', 'number', 'compare', 'comparison']),
-        # Time references
-        any(phrase in text_lower for phrase in ['this week', 'this month', 'this year', 'last week', 'last month', 'last year']),
-        # Report words
-        any(word in text_lower for word in ['report', 'summary', 'overview', 'recap', 'review', 'trend', 'trends']),
-        # Year/quarter references
-        contains_year or contains_quarter,
-        # Starts with question words
-        text_lower.startswith(('what', 'how', 'show', 'give', 'tell', 'can you', 'could you'))
-    ]
-    
-    is_query = any(query_indicators)
-    
-    # If it's not clearly a query, check for stat logging patterns
-    if not is_query:
-        stat_logging_patterns = [
-            r'\d+\s+(?:people|attendance|total|had|got|there were)',
-            r'\d+\s+(?:new(?:\s+people|visitors?|guests?)?|np)',
-            r'\d+\s+(?:salvations|new\s+christians|decisions|baptisms?|nc)',
-            r'\d+\s+(?:youth(?:\s+group|\s+ministry)?|teens?|yout)',
-            r'\d+\s+(?:kids|children|kids\s+ministry|nursery)',
-            r'\d+\s+(?:connect\s+groups?|small\s+groups?|connects?|life\s+groups?)',
-            r'\$?\d+(?:,\d{3})*(?:\.\d{2})?\s+(?:tithe|offering|giving|in\s+tithe)',
-            r'\d+\s+(?:volunteers?|team\s+members?|servers?)'
-        ]
-        
-        # Only treat as stat logging if it contains actual numbers and no query keywords
-        contains_stat_logging = any(re.search(pattern, text_lower) for pattern in stat_logging_patterns)
-        
-        # Final check: if it has stat logging patterns but also query words, it's a query
-        if contains_stat_logging and any(word in text_lower for word in query_keywords):
-            is_query = True
-    
     # Handle case where no campus is detected
     if campus is None or campus == "None" or campus == "null":
         # For queries, apply smart defaulting based on user role
@@ -5236,7 +6358,7 @@ def process_voice():
             # Generate audio with ElevenLabs if available
             audio_url = None
             if elevenlabs_api_key:
-                audio_url = generate_audio_with_elevenlabs(error_text)
+                audio_url = start_audio_generation(error_text)
             
             return jsonify({
                 "error": "You do not have permission to query statistics data",
@@ -5251,7 +6373,7 @@ def process_voice():
             
         # For campus pastors, validate they can only access their campus data
         if current_user.role == 'campus_pastor':
-            detected_campus = detect_campus(text)
+            detected_campus = parse.campus
             if detected_campus and detected_campus != 'all_campuses':
                 if not current_user.has_permission('recall_stats', detected_campus):
                     error_text = f"I'm sorry, you can only access data for {safe_campus_name(current_user.campus)[1]} campus."
@@ -5259,7 +6381,7 @@ def process_voice():
                     # Generate audio with ElevenLabs if available
                     audio_url = None
                     if elevenlabs_api_key:
-                        audio_url = generate_audio_with_elevenlabs(error_text)
+                        audio_url = start_audio_generation(error_text)
                     
                     return jsonify({
                         "error": f"You can only access data for {safe_campus_name(current_user.campus)[1]} campus",
@@ -5285,7 +6407,7 @@ def process_voice():
             # Generate audio with ElevenLabs if available
             audio_url = None
             if elevenlabs_api_key:
-                audio_url = generate_audio_with_elevenlabs(error_text)
+                audio_url = start_audio_generation(error_text)
             
             return jsonify({
                 "error": "You do not have permission to log statistics",
@@ -5301,7 +6423,10 @@ def process_voice():
     # Process based on operation type
     if is_query:
         # Call the query endpoint internally
-        query_data = {"question": text}
+        query_data = {"question": text, "parse": parse}
+        if async_insights:
+            query_data["defer_insights"] = True
+            query_data["insights_owner"] = current_user.id
         query_response = query_data_internal(query_data)
         if not query_response:
             return jsonify({"error": "No response from query_data_internal"}), 500
@@ -5312,10 +6437,10 @@ def process_voice():
             # Use the actual report text if available, otherwise fallback
             response_text = query_response.get("text", query_response.get("answer", "I couldn't find that information."))
         
-        # Generate audio with ElevenLabs if available
+        # Generate audio with ElevenLabs if available (a background insight job brings its own)
         audio_url = None
-        if elevenlabs_api_key:
-            audio_url = generate_audio_with_elevenlabs(response_text)
+        if elevenlabs_api_key and "insights_job" not in query_response:
+            audio_url = start_audio_generation(response_text)
         
         # Format response for frontend - preserve all query fields and force popup
         response = {
@@ -5361,67 +6486,45 @@ def process_voice():
             response["period_type"] = query_response["period_type"]
         if "period_value" in query_response:
             response["period_value"] = query_response["period_value"]
+        if "insights_job" in query_response:
+            response.update(insight_job_links(query_response["insights_job"]))
         
         return jsonify(response)
     
     # Extract stats with enhanced context
     result = extract_stats_with_context(text, campus)
     
-    # Generate insights with memory
-    insights = generate_encouragement_with_memory(text, campus, memory)
+    # Generate insights with memory (only the last few entries for this campus are used)
+    memory = {campus: conversation_memory.recent(campus, 3)}
+    insights_job = None
+    # Stat logging gets a canned confirmation; only replies that call Claude are deferred
+    if async_insights and claude and encouragement_kind(text) != "stat_logging":
+        insights_job = submit_insight_job(generate_encouragement_with_memory, text, campus, memory,
+                                          owner=current_user.id, with_audio=True)
+        insights = ["Thanks for inputting those stats!"]
+    else:
+        insights = generate_encouragement_with_memory(text, campus, memory)
+    
+    # Start speaking the reply now, in parallel with the memory save and Sheets write
+    response_text = insights[0] if insights else "Thanks for inputting those stats!"
+    audio_url = None
+    if elevenlabs_api_key and not insights_job:
+        audio_url = start_audio_generation(response_text)
     
     # Detect missing stats
-    missing_stats = detect_missing_stats(text, campus)
+    missing_stats = detect_missing_stats(text, campus, extracted=result)
     
     # Update memory
-    if campus not in memory:
-        memory[campus] = []
-    memory[campus].append(result)
-    save_conversation_memory(memory)
+    conversation_memory.append(campus, result)
 
     # Log to Google Sheet if available
-    if sheet:
+    if stats_storage:
         try:
-            now = datetime.now(timezone.utc)
-            timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Calculate Sunday date (the Sunday that just passed)
-            today = datetime.now()
-            days_since_sunday = (today.weekday() + 1) % 7
-            sunday_date = (today - timedelta(days=days_since_sunday)).strftime('%Y-%m-%d')
-            
-            date = sunday_date
-            
-            # Create row in exact column order matching full structure:
-            # A=Timestamp, B=Date, C=Campus, D=Total Attendance, E=First Time Visitors, F=Visitors, G=Information Gathered,
-            # H=First Time Christians, I=Rededications, J=Youth Attendance, K=Youth Salvations, L=Youth New People,
-            # M=Kids Attendance, N=Kids Leaders, O=New Kids, P=New Kids Salvations, Q=Connect Groups, R=Dream Team, S=Tithe, T=Baptisms, U=Child Dedications
-            row = [
-                timestamp,  # A - Timestamp
-                date,  # B - Date (Sunday date)
-                result.get("Campus", display_campus_name(campus)),  # C - Campus
-                result.get("Total Attendance", ""),  # D - Total Attendance
-                result.get("First Time Visitors", ""),  # E - First Time Visitors
-                result.get("Visitors", ""),  # F - Visitors
-                result.get("Information Gathered", ""),  # G - Information Gathered
-                result.get("First Time Christians", ""),  # H - First Time Christians
-                result.get("Rededications", ""),  # I - Rededications
-                result.get("Youth Attendance", ""),  # J - Youth Attendance
-                result.get("Youth Salvations", ""),  # K - Youth Salvations
-                result.get("Youth New People", ""),  # L - Youth New People
-                result.get("Kids Attendance", ""),  # M - Kids Attendance
-                result.get("Kids Leaders", ""),  # N - Kids Leaders
-                result.get("New Kids", ""),  # O - New Kids
-                result.get("New Kids Salvations", ""),  # P - New Kids Salvations
-                result.get("Connect Groups", ""),  # Q - Connect Groups
-                result.get("Dream Team", ""),  # R - Dream Team
-                result.get("Tithe", ""),  # S - Tithe
-                result.get("Baptisms", ""),  # T - Baptisms
-                result.get("Child Dedications", "")  # U - Child Dedications
-            ]
-            sheet.append_row(row)
+            # Row in the A-U column order, dated the Sunday that just passed;
+            # the write-behind queue sends it to the sheet
+            stats_storage.log_rows([build_sheet_row(result, campus)])
         except Exception as e:
-            logger.error(f"Failed to log to Google Sheets: {e}")
+            logger.error(f"Failed to queue row for Google Sheets: {e}")
 
     # Always return campus and stats in a way the frontend expects
     # Convert result to frontend-expected format
@@ -5442,14 +6545,6 @@ def process_voice():
     logger.info(f"Extracted stats: {result}")
     logger.info(f"Frontend stats: {frontend_stats}")
     
-    # Generate response text
-    response_text = insights[0] if insights else "Thanks for inputting those stats!"
-    
-    # Generate audio with ElevenLabs if available
-    audio_url = None
-    if elevenlabs_api_key:
-        audio_url = generate_audio_with_elevenlabs(response_text)
-    
     return jsonify({
         "text": response_text,
         "campus": display_campus_name(campus),
@@ -5457,18 +6552,17 @@ def process_voice():
         "missing_stats": missing_stats,
         "suggestions": missing_stats,
         "insights": insights,
-        "audio_url": audio_url
+        "audio_url": audio_url,
+        **(insight_job_links(insights_job) if insights_job else {})
     })
 
 @app.route('/api/memory/<campus>')
 def get_campus_memory(campus: str):
     """Get conversation memory for a specific campus"""
-    memory = load_conversation_memory()
-    campus_history = memory.get(campus, [])
     return jsonify({
         "campus": campus,
-        "history": campus_history[-10:],  # Last 10 entries
-        "total_entries": len(campus_history)
+        "history": conversation_memory.recent(campus, 10),  # Last 10 entries
+        "total_entries": conversation_memory.count(campus)
     })
 
 @app.route('/api/campuses')
@@ -5751,9 +6845,9 @@ def bulk_review():
         
         # Get rows data
         rows = []
-        if sheet:
+        if stats_storage:
             try:
-                rows = sheet.get_all_records()
+                rows = get_sheet_rows()
             except Exception as e:
                 logger.error(f"Failed to get stats from Google Sheets: {e}")
                 rows = []
@@ -5877,27 +6971,56 @@ def greeting_audio():
     logger.info("Greeting audio endpoint called")
     greeting_text = "Connected to Futures Link, how can I help you today?"
     
-    # Use absolute path for temp_audio directory
-    temp_audio_dir = os.path.join(os.path.dirname(__file__), "temp_audio")
-    audio_filename = os.path.join(temp_audio_dir, "greeting_elevenlabs.mp3")
-    
     try:
-        if not os.path.exists(audio_filename):
-            logger.info("Greeting audio file does not exist, generating with ElevenLabs...")
-            os.makedirs(temp_audio_dir, exist_ok=True)
-            audio_url = generate_audio_with_elevenlabs(greeting_text, filename=audio_filename)
-            if not audio_url or not os.path.exists(audio_filename):
-                logger.error("Failed to generate greeting audio file with ElevenLabs.")
-                return jsonify({"error": "Failed to generate greeting audio file."}), 500
-            logger.info(f"Greeting audio file generated: {audio_filename}")
-        else:
-            logger.info(f"Greeting audio file already exists: {audio_filename}")
-        logger.info(f"Serving greeting audio file: {audio_filename}")
-        return send_from_directory(temp_audio_dir, 'greeting_elevenlabs.mp3')
+        audio_url = generate_audio_with_elevenlabs(greeting_text)
+        if not audio_url:
+            logger.error("Failed to generate greeting audio file with ElevenLabs.")
+            return jsonify({"error": "Failed to generate greeting audio file."}), 500
+        logger.info(f"Serving greeting audio file: {audio_url}")
+        return send_from_directory(TEMP_AUDIO_DIR, tts_cache_filename(greeting_text))
     except Exception as e:
         logger.error(f"Error in greeting_audio route: {e}")
         return jsonify({"error": str(e)}), 500
 
+# Stat logging helpers shared by quick input and batch logging
+# Quick input form field -> the phrase the stat patterns recognise
+QUICK_INPUT_STAT_NAMES = {
+    'Sunday Total': 'total_attendance',
+    'New People': 'new_people',
+    'Salvations': 'new_christians',
+    'Kids Total': 'kids_total',
+    'New Kids': 'kids_new_people',
+    'Kids Salvations': 'kids_salvations',
+    'Youth Total': 'youth_attendance',
+    'Youth NP': 'youth_new_people',
+    'Youth Salvations': 'youth_salvations',
+    'Connect Groups': 'connect_groups',
+    'Baptisms': 'baptisms'
+}
+BATCH_LOG_MAX_RECORDS = int(os.getenv("BATCH_LOG_MAX_RECORDS", "100"))
+
+def quick_stats_to_text(stats: Dict[str, Any]) -> str:
+    """Quick input form values as text the existing stat extraction understands"""
+    stat_text_parts = []
+    for stat_name, value in stats.items():
+        value = str(value).strip() if value is not None else ''
+        if value:
+            mapped_stat = QUICK_INPUT_STAT_NAMES.get(stat_name, stat_name.lower().replace(' ', '_'))
+            stat_text_parts.append(f"{value} {mapped_stat}")
+    return ', '.join(stat_text_parts)
+
+def last_sunday_date() -> str:
+    """The Sunday that just passed (today on a Sunday), as YYYY-MM-DD"""
+    today = datetime.now()
+    days_since_sunday = (today.weekday() + 1) % 7
+    return (today - timedelta(days=days_since_sunday)).strftime('%Y-%m-%d')
+
+def build_sheet_row(result: Dict[str, Any], campus: str, date_str: Optional[str] = None) -> list:
+    """Stats sheet row (columns A-U, see SHEET_COLUMNS) for extracted stats"""
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    return ([timestamp, date_str or last_sunday_date(), result.get("Campus", display_campus_name(campus))]
+            + [result.get(field, "") for field in SHEET_COLUMNS[3:]])
+
 @app.route('/api/quick_input', methods=['POST'])
 @login_required
 def quick_input():
@@ -5922,32 +7045,13 @@ def quick_input():
             return jsonify({"error": "You don't have permission to log stats"}), 403
         
         # Convert stats to the format expected by the existing system
-        stat_text_parts = []
-        for stat_name, value in stats.items():
-            if value and value.strip():
-                # Convert stat names to match the expected format
-                stat_mapping = {
-                    'Sunday Total': 'total_attendance',
-                    'New People': 'new_people', 
-                    'Salvations': 'new_christians',
-                    'Kids Total': 'kids_total',
-                    'New Kids': 'kids_new_people',
-                    'Kids Salvations': 'kids_salvations',
-                    'Youth Total': 'youth_attendance',
-                    'Youth NP': 'youth_new_people',
-                    'Youth Salvations': 'youth_salvations',
-                    'Connect Groups': 'connect_groups',
-                    'Baptisms': 'baptisms'
-                }
-                
-                mapped_stat = stat_mapping.get(stat_name, stat_name.lower().replace(' ', '_'))
-                stat_text_parts.append(f"{value} {mapped_stat}")
+        stat_text = quick_stats_to_text(stats)
         
-        if not stat_text_parts:
+        if not stat_text:
             return jsonify({"error": "No stats provided"}), 400
         
         # Create the text input that the existing system can process
-        stat_text = f"{', '.join(stat_text_parts)} for {campus} campus on {date_str}"
+        stat_text = f"{stat_text} for {campus} campus on {date_str}"
         
         # Process the stats using the existing voice processing logic
         result = extract_stats_with_context(stat_text, campus)
@@ -5955,33 +7059,11 @@ def quick_input():
         if not result:
             return jsonify({"error": "Failed to process stats"}), 500
         
-        # Save to Google Sheets using existing logic
+        # Save to the Stats sheet in the same layout as voice logging
         try:
-            # Get the Google Sheets worksheet
-            worksheet = gc.open_by_key(google_sheets_id).worksheet('Church_Stats')
-            
-            # Prepare the row data
-            row_data = {
-                'Campus': campus,
-                'Date': date_str,
-                'Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'Raw_Text': stat_text,
-                'User': current_user.username
-            }
-            
-            # Add the extracted stats
-            for key, value in result.items():
-                if value and value != 0:
-                    row_data[key] = value
-            
-            # Convert to list format for Google Sheets
-            headers = worksheet.row_values(1)
-            row_values = []
-            for header in headers:
-                row_values.append(row_data.get(header, ''))
-            
-            # Append the row
-            worksheet.append_row(row_values)
+            if not stats_storage:
+                raise RuntimeError("Google Sheets not available")
+            stats_storage.log_rows([build_sheet_row(result, campus, date_str)])
             
             # Generate response text
             total_stats = len([v for v in result.values() if v and v != 0])
@@ -6003,6 +7085,94 @@ def quick_input():
         logger.error(f"Quick input error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
+def prepare_batch_record(record: Any, campus_ids: Dict[str, str]) -> Dict[str, Any]:
+    """Validate one batch log record and extract its stats; raises ValueError when unusable."""
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+    campus_name = str(record.get('campus', '')).strip()
+    if not campus_name:
+        raise ValueError("Campus is required")
+    campus = campus_ids.get(campus_name.lower().replace(' ', '_').replace('-', '_'))
+    if not campus:
+        raise ValueError(f"Invalid campus: {campus_name}")
+    if not current_user.has_permission('log_stats', campus):
+        raise ValueError(f"You don't have permission to log stats for {display_campus_name(campus)}")
+
+    date_str = str(record.get('date') or '').strip() or last_sunday_date()
+    try:
+        datetime.strptime(date_str, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid date: {date_str} (expected YYYY-MM-DD)")
+
+    # A spoken/typed utterance, or quick input form values
+    text = str(record.get('text') or '').strip()
+    if not text and isinstance(record.get('stats'), dict):
+        text = quick_stats_to_text(record['stats'])
+    if not text:
+        raise ValueError("No stats provided")
+
+    result = extract_stats_with_context(text, campus)
+    stats = {field: result[field] for field in SHEET_COLUMNS[3:] if result.get(field)}
+    if not stats:
+        raise ValueError("No stats recognised")
+    return {"campus": campus, "date": date_str, "stats": stats, "row": build_sheet_row(result, campus, date_str)}
+
+@app.route('/api/batch_log', methods=['POST'])
+@login_required
+def batch_log():
+    """Log many campus/date stat records, sent to Sheets in one batched write.
+
+    Body: {"records": [{"campus": "south", "date": "YYYY-MM-DD", "text": "..." | "stats": {...}}, ...]}.
+    Date defaults to the Sunday just passed. Each record gets its own result; valid
+    records are written even when others are rejected.
+    """
+    data = request.get_json(silent=True) or {}
+    records = data.get('records')
+    if not isinstance(records, list) or not records:
+        return jsonify({"error": "records must be a non-empty list"}), 400
+    if len(records) > BATCH_LOG_MAX_RECORDS:
+        return jsonify({"error": f"At most {BATCH_LOG_MAX_RECORDS} records per batch"}), 400
+    if not current_user.has_permission('log_stats'):
+        return jsonify({"error": "You don't have permission to log stats"}), 403
+    if not stats_storage:
+        return jsonify({"error": "Google Sheets not available"}), 503
+
+    campus_ids = {c['id'].lower(): c['id'] for c in get_campuses_for_user().get('campuses', [])
+                  if c['id'] != 'all_campuses'}
+    results = []
+    accepted = []
+    seen = set()
+    for index, record in enumerate(records):
+        try:
+            prepared = prepare_batch_record(record, campus_ids)
+            if (prepared['campus'], prepared['date']) in seen:
+                raise ValueError(f"Duplicate record for {display_campus_name(prepared['campus'])} on {prepared['date']}")
+            seen.add((prepared['campus'], prepared['date']))
+        except ValueError as e:
+            results.append({"index": index, "status": "error", "error": str(e)})
+            continue
+        results.append({"index": index, "status": "ok", "campus": prepared['campus'],
+                        "date": prepared['date'], "stats": prepared['stats']})
+        accepted.append(prepared['row'])
+
+    if accepted:
+        try:
+            stats_storage.log_rows(accepted)
+        except Exception as e:
+            logger.error(f"Batch log failed to queue {len(accepted)} rows: {e}")
+            for result in results:
+                if result['status'] == 'ok':
+                    result['status'] = 'failed'
+                    result['error'] = "Failed to save to database"
+            return jsonify({"success": False, "written": 0, "results": results}), 500
+        logger.info(f"Batch logged {len(accepted)} of {len(records)} records")
+
+    return jsonify({
+        "success": len(accepted) == len(records),
+        "written": len(accepted),
+        "results": results
+    }), 200 if accepted else 400
+
 @app.route('/api/generate_audio', methods=['POST'])
 @login_required
 def generate_audio():
@@ -6014,28 +7184,12 @@ def generate_audio():
         if not text:
             return jsonify({"error": "No text provided"}), 400
         
-        # Create temp_audio directory if it doesn't exist
-        temp_audio_dir = os.path.join(os.path.dirname(__file__), "temp_audio")
-        if not os.path.exists(temp_audio_dir):
-            os.makedirs(temp_audio_dir)
-        
-        # Generate unique filename based on text hash
-        import hashlib
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:8]
-        audio_filename = os.path.join(temp_audio_dir, f"query_{text_hash}.mp3")
-        
-        # Check if audio file already exists
-        if os.path.exists(audio_filename):
-            return jsonify({
-                "audio_url": f"/temp_audio/query_{text_hash}.mp3"
-            })
-        
-        # Generate new audio
-        audio_url = generate_audio_with_elevenlabs(text, filename=audio_filename)
+        # Cached by a hash of the text and voice settings
+        audio_url = generate_audio_with_elevenlabs(text)
         
         if audio_url:
             return jsonify({
-                "audio_url": f"/temp_audio/query_{text_hash}.mp3"
+                "audio_url": audio_url
             })
         else:
             return jsonify({"error": "Failed to generate audio"}), 500
@@ -6052,11 +7206,11 @@ def generate_audio():
 def get_sheets_headers():
     """Debug endpoint to check Google Sheets headers"""
     try:
-        if not sheet:
+        if not stats_storage:
             return jsonify({'error': 'Google Sheets not available'}), 500
         
         # Get first row to see headers
-        data = sheet.get_all_records()
+        data = get_sheet_rows()
         if data and len(data) > 0:
             first_row = data[0]
             headers = list(first_row.keys())
@@ -6088,32 +7242,119 @@ def demo_status():
     """Check all services for demo readiness"""
     status = {
         "backend": "running",
-        "claude": claude is not None,
+        "claude": bool(claude),
         "elevenlabs": elevenlabs_api_key is not None,
-        "google_sheets": sheet is not None,
+        "google_sheets": bool(sheet),
         "greeting_audio": "ready",
+        "circuits": {breaker.name: breaker.state for breaker in (sheets_breaker, elevenlabs_breaker)},
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
     try:
         greeting_text = "Connected to Futures Link, how can I help you today?"
         
-        # Use absolute path for temp_audio directory
-        temp_audio_dir = os.path.join(os.path.dirname(__file__), "temp_audio")
-        audio_filename = os.path.join(temp_audio_dir, "greeting_elevenlabs.mp3")
-        
-        if not os.path.exists(audio_filename):
-            if elevenlabs_api_key:
-                os.makedirs(temp_audio_dir, exist_ok=True)
-                audio_url = generate_audio_with_elevenlabs(greeting_text, filename=audio_filename)
-                status["greeting_audio"] = "generated" if audio_url else "failed"
-            else:
-                status["greeting_audio"] = "no_elevenlabs_key"
-        else:
+        if os.path.exists(os.path.join(TEMP_AUDIO_DIR, tts_cache_filename(greeting_text))):
             status["greeting_audio"] = "cached"
+        elif elevenlabs_api_key:
+            audio_url = generate_audio_with_elevenlabs(greeting_text)
+            status["greeting_audio"] = "generated" if audio_url else "failed"
+        else:
+            status["greeting_audio"] = "no_elevenlabs_key"
+        status["tts_cache"] = get_tts_cache_stats()
+        status["query_cache"] = query_answer_cache.stats()
+        status["insight_cache"] = completion_cache.stats()
+        status["dashboard_cache"] = dashboard_cache.stats()
+        status["sheet_queue"] = sheet_write_queue.stats()
+        status["stats_storage"] = stats_storage.name if stats_storage else None
+        status["snapshot_version"] = shared_snapshot.version
+        if stats_storage and stats_storage.reader:
+            status["sheet_reads"] = stats_storage.reader.stats()
     except Exception as e:
         status["greeting_audio"] = f"error: {str(e)}"
     return jsonify(status)
 
+# Dashboard result cache
+# The dashboard asks for the same (campus, date filter, custom range) on every
+# page load, filter toggle and auto-refresh. Results are kept per key along with
+# the snapshot version they were computed from. Within DASHBOARD_CACHE_TTL, and
+# while the version is unchanged, an entry is served as is; once expired or
+# outdated it is still served for up to DASHBOARD_CACHE_STALE seconds while one
+# background thread recomputes it (stale-while-revalidate). Responses carry an
+# ETag, so a browser revalidating a result it already has gets an empty 304.
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "30"))
+DASHBOARD_CACHE_STALE = float(os.getenv("DASHBOARD_CACHE_STALE", "300"))
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "128"))
+
+class DashboardCache:
+    """Bounded LRU of serialized dashboard results with stale-while-revalidate"""
+
+    def __init__(self, max_entries: int, ttl: float, stale: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale = stale
+        self._entries = {}  # key -> (body, etag, version, stored_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def _compute(self, key: tuple) -> tuple:
+        campus, date_filter, custom_start_date, custom_end_date, _ = key
+        if stats_storage:
+            try:
+                # Refresh the snapshot first so the version read below is the one used
+                get_sheet_rows()
+            except Exception:
+                pass
+        version = get_sheet_rows_version()
+        data = get_dashboard_data(campus, date_filter, custom_start_date, custom_end_date)
+        body = app.json.dumps(data)
+        etag = hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+        if "error" not in data:
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = (body, etag, version, time.monotonic())
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+        return body, etag
+
+    def _revalidate(self, key: tuple):
+        try:
+            self._compute(key)
+        except Exception as e:
+            logger.error(f"Dashboard cache refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, key: tuple) -> tuple:
+        """(body, etag) for key, from the cache when possible."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                body, etag, version, stored_at = entry
+                age = time.monotonic() - stored_at
+                if age < self.ttl + self.stale:
+                    self._entries[key] = entry  # most recently used
+                    if age < self.ttl and version == get_sheet_rows_version():
+                        self.hits += 1
+                        return body, etag
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._revalidate, args=(key,), name="dashboard-refresh",
+                                         daemon=True).start()
+                    return body, etag
+            self.misses += 1
+        return self._compute(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "stale_hits": self.stale_hits,
+                    "misses": self.misses, "refreshing": len(self._refreshing)}
+
+dashboard_cache = DashboardCache(DASHBOARD_CACHE_MAX_ENTRIES, DASHBOARD_CACHE_TTL, DASHBOARD_CACHE_STALE)
+
 @app.route('/api/dashboard/data')
 @login_required
 def get_dashboard_api_data():
@@ -6124,11 +7365,16 @@ def get_dashboard_api_data():
         custom_start_date = request.args.get('custom_start_date', '')
         custom_end_date = request.args.get('custom_end_date', '')
         
-        # Get dashboard data using existing function with custom date support
-        dashboard_data = get_dashboard_data(campus, date_filter, custom_start_date, custom_end_date)
+        # Rolling date filters end today, so the day is part of the key
+        key = (campus, date_filter, custom_start_date, custom_end_date, datetime.now().date())
+        body, etag = dashboard_cache.get(key)
         
-        # Return JSON response
-        return jsonify(dashboard_data)
+        response = app.response_class(body, mimetype=app.json.mimetype)
+        response.set_etag(etag)
+        # Let the browser keep the result but check with us (cheaply, via If-None-Match) before using it
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Dashboard API error: {e}")
         return jsonify({"error": "Failed to load dashboard data"}), 500
@@ -6255,96 +7501,11 @@ def safe_campus_name(campus_attr) -> tuple:
 
 def detect_simple_stat_query(question: str) -> Optional[tuple]:
     """Detect if this is a simple stat query that should get a direct answer"""
-    question_lower = question.lower()
-    
-    # Simple stat keywords
-    stat_keywords = {
-        'attendance': ['attendance', 'total attendance', 'total', 'people', 'how many people'],
-        'new_people': ['new people', 'newpeople', 'np', 'new', 'visitors', 'how many new people'],
-        'new_christians': ['new christians', 'christians', 'souls', 'salvations', 'conversions', 'how many new christians'],
-        'youth': ['youth attendance', 'youth', 'teens', 'teenagers', 'how many youth'],
-        'kids': ['kids total', 'kids', 'children', 'children total', 'how many kids'],
-        'connect_groups': ['connect groups', 'connectgroups', 'groups', 'small groups', 'cell groups', 'how many connect groups']
-    }
-    
-    # Flatten and sort keywords by length (longest first)
-    keyword_to_stat = []
-    for stat_type, keywords in stat_keywords.items():
-        for keyword in keywords:
-            keyword_to_stat.append((keyword, stat_type))
-    keyword_to_stat.sort(key=lambda x: -len(x[0]))
-    
-    # Simple question patterns that indicate direct stat requests
-    simple_patterns = [
-        r'how many\s+\w+',
-        r'what is the\s+\w+',
-        r'what\'s the\s+\w+',
-        r'give me the\s+\w+',
-        r'tell me the\s+\w+',
-        r'what was the\s+\w+',
-        r'how much\s+\w+',
-        r'total\s+\w+',
-        r'average\s+\w+',
-        r'what was the average\s+\w+',
-        r'what is the average\s+\w+',
-        r"what's the average\s+\w+"
-    ]
-    
-    import re
-    
-    # Check for simple patterns first (including average patterns)
-    for pattern in simple_patterns:
-        if re.search(pattern, question_lower):
-            # Find which stat they're asking about (longest keyword first)
-            for keyword, stat_type in keyword_to_stat:
-                if keyword in question_lower:
-                    return (stat_type, keyword)
-    
-    # Check for direct stat keywords without complex analysis words
-    analysis_words = ['trend', 'trends', 'pattern', 'growth', 'improve', 'attention', 'working', 'compare', 'vs', 'versus', 'against', 'difference', 'analysis', 'insight', 'why', 'how are we', 'what areas', 'review', 'report']
-    
-    has_analysis_words = any(word in question_lower for word in analysis_words)
-    
-    if not has_analysis_words:
-        # Check for simple stat requests (longest keyword first)
-        for keyword, stat_type in keyword_to_stat:
-            if keyword in question_lower:
-                return (stat_type, keyword)
-    
-    return None
+    return parse_utterance(question).stat_query
 
 def detect_multiple_stats(question: str) -> list:
     """Detect multiple stat requests like 'np and nc' or 'new people and new christians'"""
-    question_lower = question.lower()
-    
-    stat_keywords = {
-        'attendance': ['attendance', 'people attended', 'how many people', 'total attendance', 'people came', 'came to church'],
-        'new_people': ['new people', 'new visitors', 'visitors', 'first time', 'np', 'new guests'],
-        'new_christians': ['new christians', 'salvations', 'souls', 'decisions', 'gave their lives', 'nc', 'new believers'],
-        'youth': ['youth', 'teens', 'teenagers', 'young people', 'youth ministry', 'youth group'],
-        'kids': ['kids', 'children', 'little ones', 'nursery', 'kids ministry'],
-        'connect_groups': ['connect groups', 'connectgroups', 'groups', 'small groups', 'cell groups', 'how many connect groups']
-    }
-    
-    detected_stats = []
-    
-    # Check for each stat type in the question
-    for stat_type, keywords in stat_keywords.items():
-        for keyword in keywords:
-            if keyword in question_lower:
-                if stat_type not in detected_stats:
-                    detected_stats.append(stat_type)
-                break
-    
-    # Special handling for common abbreviations combinations
-    if 'np and nc' in question_lower or 'new people and new christians' in question_lower:
-        detected_stats = ['new_people', 'new_christians']
-    elif 'youth and kids' in question_lower:
-        detected_stats = ['youth', 'kids']
-    elif 'attendance and new people' in question_lower:
-        detected_stats = ['attendance', 'new_people']
-    
-    return detected_stats
+    return parse_utterance(question).stats
 
 def create_targeted_report_data(stat_types, analysis_data: dict, year: int, count: int) -> list:
     """Create report data showing only the requested stat(s) instead of all stats"""
@@ -6468,49 +7629,16 @@ def generate_simple_stat_answer(stat_type: str, analysis_data: dict, campus: str
 
 def detect_cross_campus_review(question: str) -> Optional[tuple]:
     """Detect if this is a cross-campus review request"""
-    question_lower = question.lower()
-    
-    # Cross-campus review indicators
-    cross_campus_indicators = [
-        'all campuses', 'all campus', 'every campus', 'across all', 'all sites', 'every site',
-        'church wide', 'churchwide', 'whole church', 'entire church', 'all locations',
-        'futures church', 'across futures', 'church total', 'total church'
-    ]
-    
-    has_cross_campus = any(indicator in question_lower for indicator in cross_campus_indicators)
-    
-    if not has_cross_campus:
-        return None
-    
-    # Check for review types (order matters: most specific first)
-    review_indicators = [
-        ('weekly', [
-            'this week', 'this weekend', 'weekend', 'sunday', 'this sunday', 'weekly',
-            'weekend review', 'sunday review', 'weekend report', 'sunday report'
-        ]),
-        ('mid_year', ['mid year', 'mid-year', 'midyear', 'mid year review', 'mid-year review']),
-        ('quarterly', ['quarter', 'q1', 'q2', 'q3', 'q4', 'first quarter', 'second quarter', 'third quarter', 'fourth quarter']),
-        ('monthly', ['this month', 'month', 'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october', 'november', 'december']),
-        ('annual', ['annual', 'year', 'yearly', 'this year', '2024', '2025'])
-    ]
-    
-    for review_type, keywords in review_indicators:
-        if any(keyword in question_lower for keyword in keywords):
-            return (review_type, question_lower)
-    
-    # Default to weekly if 'review' or 'report' is present and no period is specified
-    if 'review' in question_lower or 'report' in question_lower:
-        return ('weekly', question_lower)
-    
-    # Otherwise, default to annual
-    return ('annual', question_lower)
+    parse = parse_utterance(question)
+    details = _detect_cross_campus_review(parse)
+    return (details["review_type"], parse.lower) if details else None
 
 def generate_cross_campus_report(review_type: str, date_range: str) -> dict:
     """Generate a comprehensive cross-campus report with robust filtering and debug output."""
     # Get data from all campuses
-    if sheet:
+    if stats_storage:
         try:
-            rows = sheet.get_all_records()
+            rows = get_sheet_rows()
         except Exception as e:
             logger.error(f"Failed to get stats from Google Sheets: {e}")
             rows = []
@@ -6613,69 +7741,22 @@ def generate_cross_campus_report(review_type: str, date_range: str) -> dict:
 
     print(f"[CROSS-CAMPUS DEBUG] start_date={start_date}, end_date={end_date}, now={now}")
 
-    # Filter rows by date range and valid stats/campus
-    filtered_rows = []
-    debug_included = 0
-    debug_excluded = 0
-    for row in rows:
-        try:
-            timestamp_str = row.get("Timestamp", "")
-            # Parse timestamp robustly
-            row_date = None
-            if timestamp_str:
-                try:
-                    if "T" in timestamp_str:
-                        row_date = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                    else:
-                        try:
-                            row_date = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                        except Exception:
-                            row_date = datetime.strptime(timestamp_str, "%Y-%m-%d")
-                except Exception as e:
-                    logger.warning(f"Could not parse timestamp for row: {e}")
-            if not row_date or not (start_date <= row_date <= end_date):
-                debug_excluded += 1
-                continue
-            campus = row.get("Campus", "").strip()
-            if not campus:
-                debug_excluded += 1
-                continue
-            # At least one stat must be > 0
-            stat_fields = ["Total Attendance", "New People", "New Christians", "First Time Christians", "Youth Attendance", "Kids Total", "Kids Attendance", "Connect Groups", "Tithe"]
-            has_stat = False
-            for field in stat_fields:
-                val = row.get(field, "")
-                try:
-                    if val and int(str(val).replace(",", "").strip()) > 0:
-                        has_stat = True
-                        break
-                except Exception:
-                    continue
-            if not has_stat:
-                debug_excluded += 1
-                continue
-            filtered_rows.append(row)
-            debug_included += 1
-        except Exception as e:
-            logger.warning(f"Error processing row: {e}")
-            debug_excluded += 1
+    # Only rows with a campus and at least one stat > 0 count toward the report
+    table = get_stats_table(rows)
+    if review_type == 'weekly':
+        selection = table.select(start_date=start_date, end_date=end_date)
+        selection = selection[table.cross_campus_eligible[selection]]
+        debug_included = len(selection)
+        analysis_data = table.summarize(selection)
+    else:
+        # Whole months, quarters and years merge from the daily rollup
+        rollup = table.rollup()
+        debug_included = rollup.totals(start_date=start_date, end_date=end_date, layer='cross_campus')['rows']
+        analysis_data = rollup.summarize(start_date=start_date, end_date=end_date, layer='cross_campus')
+    debug_excluded = len(table) - debug_included
     print(f"[CROSS-CAMPUS DEBUG] Included {debug_included} rows, Excluded {debug_excluded} rows for period {period_label}")
-    
-    # DEBUG: Show what data was actually found
-    if filtered_rows:
-        print(f"[CROSS-CAMPUS DEBUG] Found data from these rows:")
-        for i, row in enumerate(filtered_rows[:5]):  # Show first 5 rows
-            campus = row.get("Campus", "Unknown")
-            timestamp = row.get("Timestamp", "Unknown")
-            attendance = row.get("Total Attendance", 0)
-            new_people = row.get("New People", 0)
-            new_christians = row.get("New Christians", 0)
-            youth = row.get("Youth Attendance", 0)
-            kids = row.get("Kids Total", 0)
-            connect_groups = row.get("Connect Groups", 0)
-            print(f"  {i+1}. {campus} ({timestamp}): Att={attendance}, NP={new_people}, NC={new_christians}, Youth={youth}, Kids={kids}, CG={connect_groups}")
-
-    if not filtered_rows:
+
+    if not debug_included:
         return {
             "type": f"Cross-Campus {review_type.title()} Report",
             "campus": "Futures Church (All Campuses)",
@@ -6685,8 +7766,6 @@ def generate_cross_campus_report(review_type: str, date_range: str) -> dict:
             "entry_count": 0
         }
 
-    # Use comprehensive stats calculation
-    analysis_data = calculate_stats_from_filtered_rows(filtered_rows)
     # Create comprehensive stats structure
     comprehensive_stats = {}
     stat_mappings = [
@@ -6796,8 +7875,509 @@ def detect_pastor_name(question: str) -> Optional[str]:
     
     return None
 
-# Patch the review detection logic in query_data_internal
-# ... existing code ...
+# Utterance routing
+# process_voice and query_data_internal used to lowercase the text again and
+# run a long cascade of keyword scans for every request. An utterance is now
+# parsed once: the keyword lists are compiled into single regexes, the campus
+# and years are read up front, and a question's intent is resolved once, in
+# the same precedence order as before, then answered through QUERY_HANDLERS.
+
+def compile_phrases(phrases: List[str]) -> re.Pattern:
+    """One regex matching wherever any of the phrases appears (plain substring match)"""
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases))
+
+# Anything that makes an utterance a question rather than stats being logged
+QUERY_CUE_PATTERN = re.compile(r'\b20\d{2}\b|' + compile_phrases([
+    # Question words
+    'what', 'how', 'when', 'where', 'why', 'which', 'who',
+    # Request words
+    'tell me', 'show me', 'give me', 'can you', 'could you', 'would you',
+    # Information seeking
+    'what is', 'what was', 'what are', 'what were', 'how many', 'how much',
+    # Analysis words
+    'average', 'total', 'sum', 'count', 'number', 'compare', 'comparison',
+    # Time references
+    'this week', 'this month', 'this year', 'last week', 'last month', 'last year',
+    # Report words
+    'report', 'summary', 'overview', 'recap', 'review', 'trend', 'trends',
+    # Quarter references
+    'q1', 'q2', 'q3', 'q4', 'quarter 1', 'quarter 2', 'quarter 3', 'quarter 4',
+    'first quarter', 'second quarter', 'third quarter', 'fourth quarter'
+]).pattern)
+QUERY_OPENINGS = ('what', 'how', 'show', 'give', 'tell', 'can you', 'could you')
+
+# Numbers being reported, and the query words that still win over them
+STAT_LOGGING_PATTERN = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'\d+\s+(?:people|attendance|total|had|got|there were)',
+    r'\d+\s+(?:new(?:\s+people|visitors?|guests?)?|np)',
+    r'\d+\s+(?:salvations|new\s+christians|decisions|baptisms?|nc)',
+    r'\d+\s+(?:youth(?:\s+group|\s+ministry)?|teens?|yout)',
+    r'\d+\s+(?:kids|children|kids\s+ministry|nursery)',
+    r'\d+\s+(?:connect\s+groups?|small\s+groups?|connects?|life\s+groups?)',
+    r'\$?\d+(?:,\d{3})*(?:\.\d{2})?\s+(?:tithe|offering|giving|in\s+tithe)',
+    r'\d+\s+(?:volunteers?|team\s+members?|servers?)'
+]))
+QUERY_KEYWORD_PATTERN = compile_phrases([
+    'how many', 'what is', 'what was', "what's", 'tell me', 'give me', 'show me',
+    'average', 'last week', 'this week', 'last month', 'this month', 'count', 'query', 'data',
+    'has had', 'had this year', 'had this month', 'had last', 'compare', 'comparison',
+    'vs', 'versus', 'between', 'year over year', 'review', 'annual review',
+    'mid year review', 'mid-year review', 'midyear'
+])
+
+CROSS_CAMPUS_QUESTION_PATTERN = compile_phrases(['all campuses', 'futures church', 'church wide', 'across all'])
+WEEKEND_REVIEW_PATTERN = compile_phrases(WEEKEND_REVIEW_PHRASES)
+GENERAL_QUERY_PATTERN = compile_phrases([
+    'summary', 'all numbers', 'big picture', 'overview', 'all stats', 'full stats',
+    'church numbers', 'show me everything', 'what are our numbers', 'church stats'
+])
+INSIGHT_QUERY_PATTERN = compile_phrases([
+    'trend', 'trends', 'pattern', 'growth', 'improve', 'attention', 'working',
+    'analysis', 'insight', 'why', 'how are we', 'what areas'
+])
+
+def classify_query(text_lower: str) -> bool:
+    """Whether a (lowercased) utterance asks for data rather than logging stats"""
+    if QUERY_CUE_PATTERN.search(text_lower) or text_lower.startswith(QUERY_OPENINGS):
+        return True
+    # Stats mixed with query words are still a query
+    return bool(STAT_LOGGING_PATTERN.search(text_lower) and QUERY_KEYWORD_PATTERN.search(text_lower))
+
+# Periods, stats and campuses
+# An utterance's period (years, quarter, months, mid-year), the stats it names
+# and the campuses it mentions are read once, on first use, into its
+# UtteranceParse; the intent detectors below work from those fields and the
+# compiled cue patterns instead of lowercasing and rescanning the text each.
+QUARTER_PATTERN = re.compile(r'\b(?:q([1-4])|quarter ([1-4])|(first|second|third|fourth) quarter)\b')
+QUARTER_ORDINALS = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4}
+MONTH_PATTERN = re.compile(r'\b(?:(jan(?:uary)?)|(feb(?:ruary)?)|(mar(?:ch)?)|(apr(?:il)?)|(may)|(june?)|(july?)|'
+                           r'(aug(?:ust)?)|(sep(?:t(?:ember)?)?)|(oct(?:ober)?)|(nov(?:ember)?)|(dec(?:ember)?))\b')
+MID_YEAR_PATTERN = re.compile(r'\bmid.?year\b')
+
+# Comparisons between periods
+COMPARISON_PATTERN = compile_phrases([
+    'compare', 'comparison', 'vs', 'versus', 'against', 'side by side', 'year over year',
+    'between', 'difference', 'compared to', 'compared with', 'relative to',
+    'year to year', 'growth', 'trend', 'improvement', 'decline', 'increase', 'decrease', 'change'
+])
+CURRENT_YEAR_PATTERN = compile_phrases(['this year', 'current year'])
+MONTHLY_COMPARISON_PATTERN = compile_phrases(['monthly comparison', 'monthly vs', 'month vs', 'month comparison'])
+
+# Comparisons between campuses
+CROSS_LOCATION_PATTERN = compile_phrases([
+    'compare', 'vs', 'versus', 'against', 'between', 'difference', 'how many',
+    'compared to', 'did south have', 'did barker have', 'did paradise have', 'did adelaide have',
+    'did salisbury have', 'south and', 'barker and', 'paradise and', 'adelaide and', 'salisbury and'
+])
+# Common names for campuses beyond their configured phrases
+CAMPUS_NAME_VARIATIONS = {
+    'mount_barker': ['barker', 'mt barker', 'mount barker'],
+    'south': ['south'],
+    'paradise': ['paradise'],
+    'adelaide_city': ['adelaide', 'city', 'cbd'],
+    'salisbury': ['salisbury']
+}
+
+# Reviews of one campus
+QUARTERLY_REVIEW_PATTERN = re.compile(r'\bquarter(?:ly)? review\b')
+MONTHLY_REVIEW_PATTERN = re.compile(
+    r'\b(?:month(?:ly)? (?:review|report|summary|stats|statistics|numbers|data|recap|overview|dashboard)|'
+    r'(?:january|february|march|april|may|june|july|august|september|october|november|december) (?:review|report))\b')
+ANNUAL_REVIEW_PATTERN = compile_phrases([
+    'review', 'report', 'summary', 'dashboard', 'snapshot', 'overview', 'recap',
+    'full stats', 'all stats', 'all statistics', 'all numbers', 'all data', 'all metrics', 'big picture',
+    'annual stats', 'annual statistics', 'annual numbers', 'annual data',
+    'anual stats', 'anual statistics', 'anual numbers', 'anual data'
+])
+
+# Reviews of the whole church
+CROSS_CAMPUS_REVIEW_PATTERN = compile_phrases([
+    'all campuses', 'all campus', 'every campus', 'across all', 'all sites', 'every site',
+    'church wide', 'churchwide', 'whole church', 'entire church', 'all locations',
+    'futures church', 'across futures', 'church total', 'total church'
+])
+WEEKLY_REVIEW_PATTERN = compile_phrases(['this week', 'weekend', 'sunday', 'weekly'])
+
+# Stats asked about: (stat, keywords) in precedence order
+SIMPLE_STAT_KEYWORDS = {
+    'attendance': ['attendance', 'total attendance', 'total', 'people', 'how many people'],
+    'new_people': ['new people', 'newpeople', 'np', 'new', 'visitors', 'how many new people'],
+    'new_christians': ['new christians', 'christians', 'souls', 'salvations', 'conversions', 'how many new christians'],
+    'youth': ['youth attendance', 'youth', 'teens', 'teenagers', 'how many youth'],
+    'kids': ['kids total', 'kids', 'children', 'children total', 'how many kids'],
+    'connect_groups': ['connect groups', 'connectgroups', 'groups', 'small groups', 'cell groups', 'how many connect groups']
+}
+# Longest keyword first; at each position the lookahead takes the longest keyword starting there
+SIMPLE_STAT_KEYWORD_ORDER = sorted(((keyword, stat) for stat, keywords in SIMPLE_STAT_KEYWORDS.items() for keyword in keywords),
+                                   key=lambda item: -len(item[0]))
+SIMPLE_STAT_KEYWORD_RANK = {}
+for _rank, (_keyword, _stat) in enumerate(SIMPLE_STAT_KEYWORD_ORDER):
+    SIMPLE_STAT_KEYWORD_RANK.setdefault(_keyword, (_rank, _stat))
+SIMPLE_STAT_KEYWORD_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword, _ in SIMPLE_STAT_KEYWORD_ORDER) + '))')
+SIMPLE_STAT_QUESTION_PATTERN = re.compile('|'.join([
+    r'how many\s+\w+', r'what is the\s+\w+', r"what's the\s+\w+", r'give me the\s+\w+',
+    r'tell me the\s+\w+', r'what was the\s+\w+', r'how much\s+\w+', r'total\s+\w+', r'average\s+\w+'
+]))
+STAT_ANALYSIS_PATTERN = compile_phrases([
+    'trend', 'trends', 'pattern', 'growth', 'improve', 'attention', 'working', 'compare', 'vs', 'versus',
+    'against', 'difference', 'analysis', 'insight', 'why', 'how are we', 'what areas', 'review', 'report'
+])
+MULTIPLE_STAT_PATTERNS = [(stat, compile_phrases(keywords)) for stat, keywords in [
+    ('attendance', ['attendance', 'people attended', 'how many people', 'total attendance', 'people came', 'came to church']),
+    ('new_people', ['new people', 'new visitors', 'visitors', 'first time', 'np', 'new guests']),
+    ('new_christians', ['new christians', 'salvations', 'souls', 'decisions', 'gave their lives', 'nc', 'new believers']),
+    ('youth', ['youth', 'teens', 'teenagers', 'young people', 'youth ministry', 'youth group']),
+    ('kids', ['kids', 'children', 'little ones', 'nursery', 'kids ministry']),
+    ('connect_groups', ['connect groups', 'connectgroups', 'groups', 'small groups', 'cell groups', 'how many connect groups'])
+]]
+# Common pairs, which replace whatever else was picked up
+STAT_PAIR_PATTERNS = [
+    (compile_phrases(['np and nc', 'new people and new christians']), ['new_people', 'new_christians']),
+    (compile_phrases(['youth and kids']), ['youth', 'kids']),
+    (compile_phrases(['attendance and new people']), ['attendance', 'new_people'])
+]
+COMPARED_STAT_PATTERNS = [(stat, compile_phrases(keywords)) for stat, keywords in [
+    ('attendance', ['attendance', 'total', 'people']),
+    ('new_people', ['new people', 'newpeople', 'np', 'new', 'visitors']),
+    ('new_christians', ['christians', 'souls', 'salvations', 'conversions']),
+    ('youth', ['youth', 'teens', 'teenagers']),
+    ('kids', ['kids', 'children']),
+    ('connect_groups', ['connect groups', 'connectgroups', 'groups']),
+    ('dream_team', ['volunteers', 'dream team', 'serving', 'team'])
+]]
+
+class UtteranceParse:
+    """A voice utterance analysed once: campus, period, stats, query or logging, and intent"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.campus = detect_campus(text)
+        self.years = [int(year) for year in re.findall(r'\b(20\d{2})\b', text)]
+        self.is_query = classify_query(self.lower)
+        self._intent = None
+        self._details = None
+
+    def matches(self, pattern: re.Pattern) -> bool:
+        return pattern.search(self.lower) is not None
+
+    @cached_property
+    def quarter(self) -> Optional[int]:
+        """First quarter mentioned (q2, quarter 2, second quarter)"""
+        found = QUARTER_PATTERN.search(self.lower)
+        if not found:
+            return None
+        number, spelled, ordinal = found.groups()
+        return int(number or spelled) if (number or spelled) else QUARTER_ORDINALS[ordinal]
+
+    @cached_property
+    def months(self) -> List[int]:
+        """Months mentioned by name or abbreviation, in calendar order"""
+        return sorted({found.lastindex for found in MONTH_PATTERN.finditer(self.lower)})
+
+    @cached_property
+    def mid_year(self) -> bool:
+        return self.matches(MID_YEAR_PATTERN)
+
+    @cached_property
+    def weekend(self) -> bool:
+        """Asks how the church went at the weekend"""
+        return self.matches(WEEKEND_REVIEW_PATTERN)
+
+    @cached_property
+    def stats(self) -> List[str]:
+        """Every stat named, for questions about several at once"""
+        for pattern, pair in STAT_PAIR_PATTERNS:
+            if pattern.search(self.lower):
+                return list(pair)
+        return [stat for stat, pattern in MULTIPLE_STAT_PATTERNS if pattern.search(self.lower)]
+
+    @cached_property
+    def stat_query(self) -> Optional[tuple]:
+        """(stat, keyword) for a direct question about one stat, by its longest keyword"""
+        ranks = [SIMPLE_STAT_KEYWORD_RANK[found.group(1)] for found in SIMPLE_STAT_KEYWORD_PATTERN.finditer(self.lower)]
+        if not ranks:
+            return None
+        # Analysis questions ("why is growth down") only count when phrased as a direct question
+        if self.matches(STAT_ANALYSIS_PATTERN) and not self.matches(SIMPLE_STAT_QUESTION_PATTERN):
+            return None
+        rank, stat = min(ranks)
+        return stat, SIMPLE_STAT_KEYWORD_ORDER[rank][0]
+
+    @cached_property
+    def compared_stat(self) -> Optional[str]:
+        """The one stat a comparison is about, or None for all of them"""
+        for stat, pattern in COMPARED_STAT_PATTERNS:
+            if pattern.search(self.lower):
+                logger.info(f"[COMPARE] Detected specific stat: {stat}")
+                return stat
+        return None
+
+    @cached_property
+    def campus_mentions(self) -> Dict[str, bool]:
+        """Campus id -> True if named or matched by a configured phrase, False if only by a common variation"""
+        mentions = {campus_id: True for campus_id in get_campus_matcher().mentioned(self.lower)}
+        for campus_id, variations in CAMPUS_NAME_VARIATIONS.items():
+            if campus_id not in mentions and any(variation in self.lower for variation in variations):
+                mentions[campus_id] = False
+        return mentions
+
+    def _route(self):
+        # First intent in QUERY_INTENTS order whose detector claims the question
+        for intent, detect in QUERY_INTENTS:
+            details = detect(self)
+            if details is not None:
+                self._intent, self._details = intent, details
+                return
+        self._intent, self._details = 'fallback', {}
+
+    @property
+    def intent(self) -> str:
+        if self._intent is None:
+            self._route()
+        return self._intent
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        if self._intent is None:
+            self._route()
+        return self._details
+
+def parse_utterance(text: str) -> UtteranceParse:
+    """Parse an utterance for routing; the query intent is only resolved when asked for"""
+    return UtteranceParse(text)
+
+def compared_years(years: List[int]) -> List[int]:
+    """The two years a period comparison covers: the two named, the one named and the year before, or last year and this"""
+    if len(years) >= 2:
+        return years[:2]
+    year = years[0] if years else datetime.now().year
+    return [year - 1, year]
+
+def review_type_of(parse: UtteranceParse) -> tuple:
+    """(review type, quarter or month, year) of a review request, or (None, None, None)"""
+    year = parse.years[0] if parse.years else datetime.now().year
+    if parse.quarter or parse.matches(QUARTERLY_REVIEW_PATTERN):
+        return "quarterly", parse.quarter or 1, year
+    if parse.matches(MONTHLY_REVIEW_PATTERN):
+        return "monthly", parse.months[0] if parse.months else datetime.now().month, year
+    if parse.mid_year:
+        return "mid_year", None, year
+    if parse.matches(ANNUAL_REVIEW_PATTERN):
+        return "annual", None, year
+    return None, None, None
+
+# Intent detectors return the details their answer needs, or None
+def _detect_cross_location(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    if not current_user.is_authenticated or not current_user.has_permission('cross_location_comparison'):
+        return None
+    if not parse.matches(CROSS_LOCATION_PATTERN):
+        return None
+    available = [campus['id'] for campus in get_campuses_for_user().get('campuses', []) if campus['id'] != 'all_campuses']
+    mentions = parse.campus_mentions
+    # Named campuses in the user's order, then those only found by a common variation
+    campuses = ([campus_id for campus_id in available if mentions.get(campus_id)]
+                + [campus_id for campus_id in CAMPUS_NAME_VARIATIONS
+                   if campus_id in available and mentions.get(campus_id) is False])
+    if len(campuses) < 2:
+        return None
+    year = parse.years[0] if parse.years else datetime.now().year
+    logger.info(f"[CROSS_LOCATION] Detected cross-location comparison: campuses={campuses}, year={year}")
+    return {"campuses": campuses, "year": year, "stat": parse.compared_stat}
+
+def _detect_period_comparison(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    # "this year" on its own is never a comparison
+    if not parse.matches(COMPARISON_PATTERN) or parse.matches(CURRENT_YEAR_PATTERN):
+        return None
+    if parse.mid_year:
+        period_type, period_value = 'mid_year', None
+    elif parse.quarter:
+        period_type, period_value = 'quarterly', parse.quarter
+    elif parse.months or parse.matches(MONTHLY_COMPARISON_PATTERN):
+        period_type, period_value = 'monthly', parse.months[0] if parse.months else datetime.now().month
+    else:
+        # An annual comparison covers every year named
+        years = parse.years if len(parse.years) >= 2 else compared_years(parse.years)
+        return {"years": years, "period_type": 'annual', "period_value": None}
+    return {"years": compared_years(parse.years), "period_type": period_type, "period_value": period_value}
+
+def _detect_review(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    # Same as is_review_intent; comparisons were already ruled out above
+    if parse.weekend:
+        return None
+    review = review_type_of(parse)
+    return {"review": review} if review[0] is not None else None
+
+def _detect_weekend_review(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    return {} if parse.weekend else None
+
+def _detect_cross_campus_review(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    if not parse.matches(CROSS_CAMPUS_REVIEW_PATTERN):
+        return None
+    if parse.matches(WEEKLY_REVIEW_PATTERN):
+        review_type = 'weekly'
+    elif parse.mid_year:
+        review_type = 'mid_year'
+    elif parse.quarter or 'quarter' in parse.lower:
+        review_type = 'quarterly'
+    elif parse.months or 'month' in parse.lower:
+        review_type = 'monthly'
+    elif parse.years or 'year' in parse.lower or 'annual' in parse.lower:
+        review_type = 'annual'
+    elif 'review' in parse.lower or 'report' in parse.lower:
+        # A review with no period is of the last week
+        review_type = 'weekly'
+    else:
+        review_type = 'annual'
+    return {"review_type": review_type}
+
+def _detect_stat_query(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    # Several stats ("np and nc") take priority over a single one
+    multiple_stats = parse.stats
+    if multiple_stats:
+        logger.info(f"[QUERY] Detected multiple stat query: {multiple_stats}")
+        return {"stats": multiple_stats, "keyword": "multiple stats"}
+    if parse.stat_query:
+        stat_type, keyword = parse.stat_query
+        logger.info(f"[QUERY] Detected simple stat query: {stat_type} (keyword: {keyword})")
+        return {"stats": [stat_type], "keyword": keyword}
+    return None
+
+def _detect_general_query(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    return {} if parse.matches(GENERAL_QUERY_PATTERN) else None
+
+def _detect_insights_query(parse: UtteranceParse) -> Optional[Dict[str, Any]]:
+    return {} if parse.matches(INSIGHT_QUERY_PATTERN) else None
+
+# Order matters: the first intent to claim a question answers it
+QUERY_INTENTS = [
+    ('cross_location_comparison', _detect_cross_location),
+    ('period_comparison', _detect_period_comparison),
+    ('review', _detect_review),
+    ('weekend_review', _detect_weekend_review),
+    ('cross_campus_review', _detect_cross_campus_review),
+    ('stat_query', _detect_stat_query),
+    ('general_query', _detect_general_query),
+    ('insights_query', _detect_insights_query),
+]
+
+QUERY_HANDLERS = {
+    'cross_location_comparison': answer_cross_location_comparison,
+    'period_comparison': answer_period_comparison,
+    'review': answer_review,
+    'weekend_review': answer_weekend_review,
+    'cross_campus_review': answer_cross_campus_review,
+    'stat_query': answer_stat_query,
+    'general_query': answer_general_query,
+    'insights_query': answer_insights_query,
+}
+
+# Query answer cache
+# Leaders ask the same questions every Sunday. Answers are kept per intent,
+# campus, normalised question, asker's role and day for QUERY_CACHE_TTL seconds.
+# A sheet refresh that changes the data drops every answer; rows logged through
+# the app only drop the answers for that campus (and church-wide answers) whose
+# period could include them.
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "600"))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "256"))
+# Intents whose answer only covers the resolved campus
+CAMPUS_SCOPED_INTENTS = {'period_comparison', 'review', 'stat_query', 'general_query', 'insights_query'}
+# Intents whose answer only covers parse_date_range(question)
+DATED_INTENTS = {'stat_query', 'general_query', 'insights_query'}
+
+class QueryAnswerCache:
+    """Bounded LRU of query answers with campus/period-aware invalidation"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = {}  # key -> (answer, stored_at, campus or None, (start, end) or None)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> tuple:
+        """A copy of the cached answer (or None) and the token to pass to put()."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                self._entries[key] = entry  # most recently used
+                self.hits += 1
+                return copy.deepcopy(entry[0]), self._generation
+            self.misses += 1
+            return None, self._generation
+
+    def put(self, key: tuple, answer: Dict[str, Any], generation: int,
+            campus: Optional[str] = None, period: Optional[tuple] = None):
+        """Store an answer unless the data changed since get() handed out generation."""
+        answer = copy.deepcopy(answer)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            self._entries[key] = (answer, time.monotonic(), campus, period)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def invalidate_rows(self, rows: List[dict]):
+        """Drop answers that rows just logged for a campus could change."""
+        logged = []
+        for row in rows:
+            dates = [parse_any_date(row[column]) for column in ('Timestamp', 'Date') if row.get(column)]
+            logged.append((normalize_campus(row.get('Campus', '')), dates))
+        with self._lock:
+            # Answers still being computed may have read the old rows
+            self._generation += 1
+            stale = [key for key, (_, _, campus, period) in self._entries.items()
+                     if any(self._affects(campus, period, row_campus, dates) for row_campus, dates in logged)]
+            for key in stale:
+                del self._entries[key]
+
+    @staticmethod
+    def _affects(campus: Optional[str], period: Optional[tuple], row_campus: str, dates: List[datetime]) -> bool:
+        if campus and row_campus and campus not in row_campus and row_campus not in campus:
+            return False
+        if period is None or not dates:
+            return True
+        # A day either side covers timestamps written in UTC
+        start, end = period[0] - timedelta(days=1), period[1] + timedelta(days=1)
+        return any(start <= date.replace(tzinfo=None) <= end for date in dates)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+query_answer_cache = QueryAnswerCache(QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_TTL)
+
+def normalize_question(text_lower: str) -> str:
+    """Question text as a cache key: single spaces, no trailing punctuation"""
+    return ' '.join(text_lower.split()).rstrip('?.! ')
+
+def answer_query(parse: UtteranceParse, campus: str, data: Dict[str, Any], handler) -> Dict[str, Any]:
+    """Answer a question through its handler, reusing the answer to a repeated question."""
+    if data.get("defer_insights") and parse.intent == 'insights_query':
+        # The answer carries an insight job that only its owner may read
+        return handler(parse, campus, data)
+    user_scope = (current_user.role, getattr(current_user, 'campus', None)) if current_user.is_authenticated else None
+    key = (parse.intent, campus, normalize_question(parse.lower), user_scope, datetime.now().date())
+    answer, generation = query_answer_cache.get(key)
+    if answer is not None:
+        logger.info(f"[QUERY] Answer cache hit: {parse.intent} for {campus}")
+        return answer
+    answer = handler(parse, campus, data)
+    if "error" not in answer and "insights_job" not in answer:
+        church_wide = (parse.intent not in CAMPUS_SCOPED_INTENTS or campus == 'all_campuses'
+                       or parse.matches(CROSS_CAMPUS_QUESTION_PATTERN))
+        period = parse_date_range(parse.text)[:2] if parse.intent in DATED_INTENTS else None
+        query_answer_cache.put(key, answer, generation, None if church_wide else normalize_campus(campus), period)
+    return answer
 
 @app.route('/heartbeat')
 def heartbeat():
@@ -6807,7 +8387,14 @@ def heartbeat():
 def journey():
     return render_template('journey.html')
 
+if APP_PRELOAD:
+    preload_sheet_rows()
+
+IMPORT_SECONDS = round(time.monotonic() - IMPORT_STARTED_AT, 3)
+logger.info(f"app.py imported in {IMPORT_SECONDS}s")
+
 if __name__ == '__main__':
+    start_warm_up()
     print("Starting app.py")
     print("App running on: http://localhost:5002")
     app.run(debug=False, port=5002)
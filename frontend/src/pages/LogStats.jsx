@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { MicrophoneIcon, PaperAirplaneIcon, XMarkIcon, PlayIcon, SpeakerWaveIcon, PlusIcon, CalendarIcon } from '@heroicons/react/24/outline';
 import DynamicBackground from '../components/DynamicBackground';
+import { followInsightJob } from '../utils/insights';
 import ThreeParticleEffect from '../components/ThreeParticleEffect';
 
 const LogStats = () => {
@@ -36,6 +37,9 @@ const LogStats = () => {
   const [isHovered, setIsHovered] = useState(false);
   const audioRef = useRef(null);
   const recognitionRef = useRef(null);
+  const stopInsightRef = useRef(() => {});
+  // Stop following an insight job when leaving the page
+  useEffect(() => () => stopInsightRef.current(), []);
 
   useEffect(() => {
     // Load campuses
@@ -129,6 +133,7 @@ const LogStats = () => {
     if (!transcript.trim()) return;
     
     setIsProcessing(true);
+    stopInsightRef.current();
     try {
       const response = await fetch('/api/process_voice', {
         method: 'POST',
@@ -177,6 +182,16 @@ const LogStats = () => {
           setAudioUrl(data.audio_url);
         }
         
+        // Replace the quick acknowledgement with the encouragement once it's written
+        stopInsightRef.current = followInsightJob(data, (job) => {
+          if (job.text) {
+            setResponse(job.text);
+          }
+          if (job.audio_url) {
+            setAudioUrl(job.audio_url);
+          }
+        });
+        
         // Handle logged stats
         if (data.stats) {
           setLoggedStats(data.stats);
@@ -217,16 +232,50 @@ const LogStats = () => {
     }
   };
 
+  const generateAudio = async (text) => {
+    try {
+      const response = await fetch('/api/generate_audio', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        credentials: 'include',
+        body: JSON.stringify({ text }),
+      });
+
+      const data = await response.json();
+      if (data.audio_url) {
+        setAudioUrl(data.audio_url);
+      }
+      return data.audio_url || null;
+    } catch (error) {
+      console.error('Error generating audio:', error);
+      return null;
+    }
+  };
+
+  // text is what the audio says: if the file fails to load (its synthesis
+  // failed), it is generated again once through /api/generate_audio
+  const playAudioUrl = (url, text) => {
+    setIsPlayingAudio(true);
+    const audio = new Audio(url);
+    audio.onended = () => setIsPlayingAudio(false);
+    audio.onerror = async () => {
+      setIsPlayingAudio(false);
+      const retryUrl = text ? await generateAudio(text) : null;
+      if (retryUrl) {
+        playAudioUrl(retryUrl, null);
+      }
+    };
+    audio.play().catch(err => {
+      console.error('Error playing audio:', err);
+      setIsPlayingAudio(false);
+    });
+  };
+
   const playAudio = () => {
     if (audioUrl) {
-      setIsPlayingAudio(true);
-      const audio = new Audio(audioUrl);
-      audio.onended = () => setIsPlayingAudio(false);
-      audio.onerror = () => setIsPlayingAudio(false);
-      audio.play().catch(err => {
-        console.error('Error playing audio:', err);
-        setIsPlayingAudio(false);
-      });
+      playAudioUrl(audioUrl, response);
     }
   };
 
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { MicrophoneIcon, PaperAirplaneIcon } from '@heroicons/react/24/outline';
 import DynamicBackground from '../components/DynamicBackground';
+import { followInsightJob } from '../utils/insights';
 import ThreeParticleEffect from '../components/ThreeParticleEffect';
 
 const Pulse = () => {
@@ -15,6 +16,9 @@ const Pulse = () => {
   const [campuses, setCampuses] = useState([]);
   const [selectedCampus, setSelectedCampus] = useState('all_campuses');
   const recognitionRef = useRef(null);
+  const stopInsightRef = useRef(() => {});
+  // Stop following an insight job when leaving the page
+  useEffect(() => () => stopInsightRef.current(), []);
 
   // Fetch campuses
   useEffect(() => {
@@ -79,6 +83,7 @@ const Pulse = () => {
     if (!query.trim()) return;
 
     setIsProcessing(true);
+    stopInsightRef.current();
     try {
       const response = await fetch('/api/process_voice', {
         method: 'POST',
@@ -99,6 +104,14 @@ const Pulse = () => {
         setAudioUrl(data.audio_url);
       }
 
+      // The insight is still being written: swap it in when it's ready
+      stopInsightRef.current = followInsightJob(data, (job) => {
+        setResponse(prev => prev && { ...prev, text: job.text, answer: job.text, insights: job.insights });
+        if (job.audio_url) {
+          setAudioUrl(job.audio_url);
+        }
+      });
+
       setShowPopup(true);
     } catch (error) {
       console.error('Error processing query:', error);
@@ -124,21 +137,35 @@ const Pulse = () => {
       if (data.audio_url) {
         setAudioUrl(data.audio_url);
       }
+      return data.audio_url || null;
     } catch (error) {
       console.error('Error generating audio:', error);
+      return null;
     }
   };
 
+  // text is what the audio says: if the file fails to load (its synthesis
+  // failed), it is generated again once through /api/generate_audio
+  const playAudioUrl = (url, text) => {
+    setIsPlaying(true);
+    const audio = new Audio(url);
+    audio.onended = () => setIsPlaying(false);
+    audio.onerror = async () => {
+      setIsPlaying(false);
+      const retryUrl = text ? await generateAudio(text) : null;
+      if (retryUrl) {
+        playAudioUrl(retryUrl, null);
+      }
+    };
+    audio.play().catch(err => {
+      console.error('Error playing audio:', err);
+      setIsPlaying(false);
+    });
+  };
+
   const playAudio = () => {
     if (audioUrl) {
-      setIsPlaying(true);
-      const audio = new Audio(audioUrl);
-      audio.onended = () => setIsPlaying(false);
-      audio.onerror = () => setIsPlaying(false);
-      audio.play().catch(err => {
-        console.error('Error playing audio:', err);
-        setIsPlaying(false);
-      });
+      playAudioUrl(audioUrl, response?.text || response?.answer);
     }
   };
 
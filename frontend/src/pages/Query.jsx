@@ -2,6 +2,7 @@ import React, { useState, useEffect, useRef } from 'react';
 import { MicrophoneIcon, XMarkIcon, PlayIcon, PauseIcon, QuestionMarkCircleIcon, PaperAirplaneIcon } from '@heroicons/react/24/outline';
 import ThreeParticleEffect from '../components/ThreeParticleEffect';
 import DynamicBackground from '../components/DynamicBackground';
+import { followInsightJob } from '../utils/insights';
 
 const Query = () => {
   const [isListening, setIsListening] = useState(false);
@@ -16,7 +17,11 @@ const Query = () => {
   const [showExamples, setShowExamples] = useState(false);
   const [isHovered, setIsHovered] = useState(false);
   const audioRef = useRef(null);
+  const audioTextRef = useRef(null);
   const recognitionRef = useRef(null);
+  const stopInsightRef = useRef(() => {});
+  // Stop following an insight job when leaving the page
+  useEffect(() => () => stopInsightRef.current(), []);
 
   const exampleQueries = [
     "What was the average attendance at South campus last month?",
@@ -116,6 +121,7 @@ const Query = () => {
     setIsProcessing(true);
     setResponse(null);
     setAudioUrl(null);
+    stopInsightRef.current();
 
     try {
       const response = await fetch('/api/process_voice', {
@@ -157,19 +163,37 @@ const Query = () => {
         if (data.audio_url) {
           console.log('Playing audio:', data.audio_url); // Debug log
           setAudioUrl(data.audio_url);
-          playAudio(data.audio_url);
-        } else if (data.text) {
+          playAudio(data.audio_url, data.text);
+        } else if (data.text && !data.insights_job) {
           // Generate audio with ElevenLabs if no audio URL provided
           generateAudio(data.text);
         }
+
+        // The insight is still being written: swap it in (and speak it) when it's ready
+        stopInsightRef.current = followInsightJob(data, (job) => {
+          setResponse(prev => prev && { ...prev, text: job.text, answer: job.text, insights: job.insights });
+          if (job.audio_url) {
+            setAudioUrl(job.audio_url);
+            playAudio(job.audio_url, job.text);
+          } else if (job.text) {
+            generateAudio(job.text);
+          }
+        });
       } else {
         console.log('Regular response - no popup'); // Debug log
         // Regular response
         setResponse(data);
         if (data.audio_url) {
           setAudioUrl(data.audio_url);
-          playAudio(data.audio_url);
+          playAudio(data.audio_url, data.text);
         }
+        stopInsightRef.current = followInsightJob(data, (job) => {
+          setResponse(prev => prev && { ...prev, text: job.text, insights: job.insights });
+          if (job.audio_url) {
+            setAudioUrl(job.audio_url);
+            playAudio(job.audio_url, job.text);
+          }
+        });
       }
     } catch (error) {
       console.error('Error processing query:', error);
@@ -205,8 +229,11 @@ const Query = () => {
     }
   };
 
-  const playAudio = (url) => {
+  // text is what the audio says, so a file that fails to load can be
+  // regenerated once through /api/generate_audio
+  const playAudio = (url, text = null) => {
     console.log('playAudio called with URL:', url); // Debug log
+    audioTextRef.current = text;
     if (audioRef.current) {
       // Ensure the audio URL is properly constructed for the backend
       const fullUrl = url.startsWith('http') ? url : url;
@@ -221,6 +248,16 @@ const Query = () => {
     }
   };
 
+  const handleAudioError = () => {
+    setIsPlaying(false);
+    const text = audioTextRef.current;
+    audioTextRef.current = null;
+    if (text) {
+      console.log('Audio failed to load, generating it again'); // Debug log
+      generateAudio(text);
+    }
+  };
+
   const handleAudioEnded = () => {
     setIsPlaying(false);
   };
@@ -450,7 +487,7 @@ const Query = () => {
               {audioUrl && (
                 <div className="mb-4">
                   <button
-                    onClick={playAudio}
+                    onClick={() => playAudio(audioUrl, response?.text)}
                     disabled={isPlaying}
                     className="bg-blue-500 hover:bg-blue-600 disabled:bg-blue-600 text-white px-4 py-2 rounded-lg flex items-center space-x-2 transition-colors"
                   >
@@ -569,6 +606,7 @@ const Query = () => {
           onEnded={handleAudioEnded}
           onPlay={handleAudioPlay}
           onPause={handleAudioPause}
+          onError={handleAudioError}
           style={{ display: 'none' }}
         />
       </div>
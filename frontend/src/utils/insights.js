@@ -0,0 +1,71 @@
+// Follow a background insight job started by /api/process_voice.
+//
+// The backend answers straight away with the numbers and hands the Claude
+// insight to a background job; the response carries insights_stream_url
+// (server-sent events) and insights_url (polling). onDone receives the finished
+// job ({ text, insights, audio_url }); onError is called if it fails or times out.
+// Returns a function that stops following the job.
+export const followInsightJob = (data, onDone, onError = () => {}) => {
+  if (!data || !data.insights_job) return () => {};
+
+  let stopped = false;
+  let source = null;
+  let timer = null;
+
+  const finish = (job) => {
+    if (stopped) return;
+    stop();
+    if (job && job.status === 'done') {
+      onDone(job);
+    } else {
+      onError(job);
+    }
+  };
+
+  const poll = async (attempt = 0) => {
+    if (stopped) return;
+    try {
+      const response = await fetch(data.insights_url, { credentials: 'include' });
+      const job = response.ok ? await response.json() : null;
+      if (job && job.status === 'pending' && attempt < 120) {
+        timer = setTimeout(() => poll(attempt + 1), 1000);
+        return;
+      }
+      finish(job);
+    } catch (error) {
+      console.error('Error polling insight job:', error);
+      finish(null);
+    }
+  };
+
+  const stop = () => {
+    stopped = true;
+    if (source) source.close();
+    if (timer) clearTimeout(timer);
+  };
+
+  if (window.EventSource && data.insights_stream_url) {
+    source = new EventSource(data.insights_stream_url, { withCredentials: true });
+    const handle = (event) => finish(JSON.parse(event.data));
+    source.addEventListener('done', handle);
+    source.addEventListener('error', (event) => {
+      if (event.data) {
+        handle(event);
+      } else {
+        // Connection problem rather than a failed job: fall back to polling
+        source.close();
+        source = null;
+        poll();
+      }
+    });
+    source.addEventListener('timeout', () => {
+      source.close();
+      source = null;
+      poll();
+    });
+  } else {
+    poll();
+  }
+
+  return stop;
+};
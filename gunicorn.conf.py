@@ -0,0 +1,31 @@
+# gunicorn.conf.py - picked up automatically when gunicorn starts from the repo root
+
+import gc
+import os
+import sys
+
+# Import the app once in the master and fork workers from it, so they share its
+# memory (including the preloaded stats snapshot) instead of each loading it.
+# Set GUNICORN_PRELOAD=0 to import the app in every worker instead.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+if preload_app:
+    # Tells the app not to start background threads in the master
+    os.environ["APP_PRELOAD"] = "1"
+
+
+def when_ready(server):
+    """Before the first fork: move everything loaded so far out of the garbage collector's reach."""
+    if preload_app:
+        # Collections would otherwise touch every object and copy the shared pages into each worker
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    """Start the worker's background threads, then connect services and load stats in the background."""
+    app_module = sys.modules.get("app")
+    if app_module is None:
+        return
+    if preload_app and hasattr(app_module, "start_background_tasks"):
+        app_module.start_background_tasks()
+    if hasattr(app_module, "start_warm_up"):
+        app_module.start_warm_up()
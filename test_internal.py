@@ -85,5 +85,310 @@ def test_cross_location_detection():
     print("\n" + "=" * 50)
     print("Test completed!")
 
+def test_rollup_period_edges():
+    """A mid-week row at the start of a year counts in that year, not the previous one"""
+    from datetime import datetime
+    
+    rows = [{"Timestamp": "2025-01-01 10:00:00", "Date": "2025-01-01", "Campus": "South", "Total Attendance": 100}]
+    table = app.StatsTable(rows)
+    rollup = table.rollup()
+    
+    this_year = rollup.summarize('south', datetime(2025, 1, 1), datetime(2025, 12, 31))
+    last_year = rollup.summarize('south', datetime(2024, 1, 1), datetime(2024, 12, 31))
+    selected = table.summarize(table.select('south', datetime(2025, 1, 1), datetime(2025, 12, 31, 23, 59, 59)))
+    
+    print(f"2025 rollup: {this_year.get('total_attendance', 0)}, 2024 rollup: {last_year.get('total_attendance', 0)}")
+    assert this_year.get('total_attendance', 0) == 100
+    assert last_year.get('total_attendance', 0) == 0
+    assert this_year.get('total_attendance', 0) == selected.get('total_attendance', 0)
+
+def test_role_permission_defaults():
+    """Roles missing from users.json keep the default dashboard and query access"""
+    import json
+    import tempfile
+    
+    roles = {"viewer": {"permissions": {"dashboard_access": "assigned_campus", "query_access": "none"}}}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'users.json')
+        with open(path, 'w') as f:
+            json.dump({"users": {}, "roles": roles}, f)
+        registry = app.UsersRegistry(path)
+        
+        defined = registry.permission_sets('viewer', 'south')
+        undefined = registry.permission_sets('missing_role', 'south')
+    
+    assert 'south' in defined['dashboard_access'] and 'paradise' not in defined['dashboard_access']
+    assert 'south' not in defined['query_access']
+    assert None in undefined['dashboard_access'] and 'paradise' in undefined['dashboard_access']
+    assert None in undefined['query_access']
+    assert 'south' not in undefined['log_stats'] and None not in undefined['recall_stats']
+    assert 'paradise' not in undefined['manage_users']
+
+def test_utterance_parse():
+    """Period, stats and campuses are read into the parse once and drive routing"""
+    parse = app.parse_utterance("compare np and nc at south vs barker in q2 2024 vs 2025")
+    assert parse.quarter == 2 and parse.years == [2024, 2025]
+    assert parse.stats == ['new_people', 'new_christians']
+    assert parse.campus_mentions.get('south') is True and 'mount_barker' in parse.campus_mentions
+    
+    parse = app.parse_utterance("give me a summary 2024 vs 2025")
+    # "summary" isn't March
+    assert parse.months == []
+    assert app.detect_comparison_request(parse.text) == (True, [2024, 2025], 'annual', None)
+    assert app.parse_utterance("april report for south").details["review"][:2] == ('monthly', 4)
+
+class FakeWorksheet:
+    """Stats worksheet in memory, answering ranges the way the Sheets API trims them"""
+    
+    def __init__(self, rows):
+        self.grid = [list(app.SHEET_COLUMNS)] + [list(row) for row in rows]
+    
+    @staticmethod
+    def _trim(values):
+        values = list(values)
+        while values and values[-1] == '':
+            values.pop()
+        return values
+    
+    def get_values(self):
+        return [list(row) for row in self.grid]
+    
+    def get(self, a1):
+        import re
+        if a1 == '1:1':
+            return [self._trim(self.grid[0])]
+        start, end = re.fullmatch(r'A(\d+):[A-Z]+(\d*)', a1).groups()
+        rows = [self._trim(row) for row in self.grid[int(start) - 1:int(end) if end else None]]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+    
+    def batch_get(self, ranges):
+        return [self.get(a1) for a1 in ranges]
+    
+    def append_rows(self, rows):
+        self.grid.extend(list(row) for row in rows)
+
+def test_sheet_delta_reader():
+    """Appends are read as deltas; edits to recent or older rows and deletions force a full read"""
+    def row(i):
+        return ['2025-06-01 10:00:00', '2025-06-01', 'South', str(100 + i)] + [''] * 17
+    
+    def records(sheet):
+        return app.SheetDeltaReader(sheet).read()
+    
+    old_tail, old_block = app.SHEET_VERIFY_TAIL, app.SHEET_VERIFY_BLOCK
+    app.SHEET_VERIFY_TAIL, app.SHEET_VERIFY_BLOCK = 2, 2
+    try:
+        sheet = FakeWorksheet([row(i) for i in range(6)])
+        reader = app.SheetDeltaReader(sheet)
+        reader.read()
+        
+        # Appended rows come from the delta read
+        sheet.grid.append(row(6))
+        assert reader.read() == records(sheet)
+        assert (reader.full_reads, reader.delta_reads) == (1, 1)
+        
+        # An edit in the last rows is seen on the next refresh
+        sheet.grid[-1][18] = '500'
+        assert reader.read() == records(sheet)
+        assert reader.full_reads == 2
+        
+        # An edit to an older row is seen within one sweep of the blocks
+        sheet.grid[4][3] = '999'
+        for _ in range(3):
+            if reader.read() == records(sheet):
+                break
+        assert reader.read() == records(sheet)
+        assert reader.full_reads == 3
+        
+        # This process's own edit, re-read with refresh_row, doesn't force a full read
+        sheet.grid[2][18] = '700'
+        reader.refresh_row(1)
+        for _ in range(3):
+            reader.read()
+        assert reader.read() == records(sheet)
+        assert reader.full_reads == 3
+        
+        # A deleted row shifts the ones after it
+        del sheet.grid[3]
+        assert reader.read() == records(sheet)
+        assert reader.full_reads == 4
+        print(f"Delta reader: {reader.stats()}")
+    finally:
+        app.SHEET_VERIFY_TAIL, app.SHEET_VERIFY_BLOCK = old_tail, old_block
+
+def test_failed_audio_generation():
+    """A failed synthesis is reported by /temp_audio instead of timing out"""
+    import tempfile
+    import time
+    
+    old_dir, old_key, old_generate = app.TEMP_AUDIO_DIR, app.elevenlabs_api_key, app.generate_audio_with_elevenlabs
+    app.TEMP_AUDIO_DIR = tempfile.mkdtemp()
+    app.elevenlabs_api_key = "test-key"
+    app.generate_audio_with_elevenlabs = lambda text: None
+    try:
+        url = app.start_audio_generation("ElevenLabs is down")
+        filename = url.rsplit("/", 1)[1]
+        assert app.wait_for_audio(filename) is False
+        assert app.audio_generation_failed(filename)
+        response = app.app.test_client().get(url)
+        assert response.status_code == 502
+        
+        # A pending marker left behind by a dead worker is not waited on
+        filename = app.tts_cache_filename("worker died")
+        marker = app._tts_pending_marker(filename)
+        open(marker, 'w').close()
+        stale = time.time() - app.TTS_WAIT_TIMEOUT - 1
+        os.utime(marker, (stale, stale))
+        started = time.time()
+        assert app.wait_for_audio(filename) is False
+        assert time.time() - started < 1
+        assert not app.audio_generation_failed(filename)
+    finally:
+        app.TEMP_AUDIO_DIR, app.elevenlabs_api_key, app.generate_audio_with_elevenlabs = old_dir, old_key, old_generate
+
+def test_sheet_write_queue():
+    """Spooled rows are shown until flushed, kept through failures, and never counted twice"""
+    import tempfile
+    import threading
+    import time
+    
+    def row(i):
+        return ['2025-06-01 10:00:00', '2025-06-01', 'South', str(100 + i)] + [''] * 17
+    
+    class FlakySheet(FakeWorksheet):
+        """Fails while down; otherwise holds each append until released"""
+        down = False
+        
+        def __init__(self, rows):
+            super().__init__(rows)
+            self.appended = threading.Event()
+            self.release = threading.Event()
+            self.release.set()
+        
+        def append_rows(self, rows):
+            if self.down:
+                raise ConnectionError("Sheets is down")
+            super().append_rows(rows)
+            self.appended.set()
+            self.release.wait(5)
+    
+    tmp = tempfile.mkdtemp()
+    sheet = FlakySheet([row(i) for i in range(3)])
+    queue = app.SheetWriteQueue(os.path.join(tmp, 'spool.sqlite3'))
+    queue.start = lambda: None  # flushed by hand below
+    saved = (app.sheet, app.stats_storage, app.sheet_write_queue, app.shared_snapshot, dict(app._sheet_rows_cache))
+    app.sheet, app.sheet_write_queue = sheet, queue
+    app.stats_storage = app.SheetStatsStorage(sheet)
+    app.shared_snapshot = app.SharedSnapshot(os.path.join(tmp, 'snapshot.json'))
+    app._sheet_rows_cache.update(rows=None, fetched_at=0.0, local_rows=0)
+    try:
+        assert len(app.get_sheet_rows()) == 3
+        
+        # Logged rows show straight away and stay spooled while Sheets fails
+        app.stats_storage.log_rows([row(3), row(4)])
+        assert len(app.get_sheet_rows()) == 5 and app.has_local_rows()
+        sheet.down = True
+        try:
+            queue.flush_once()
+            assert False, "flush should fail while Sheets is down"
+        except ConnectionError as e:
+            queue._back_off(e)
+        assert queue.depth() == 2 and len(sheet.grid) == 4
+        assert len(app.get_sheet_rows(force_refresh=True)) == 5
+        
+        # Each failure in a row backs off longer, up to the cap
+        delays = []
+        for _ in range(12):
+            queue._back_off(ConnectionError("Sheets is down"))
+            delays.append(queue._retry_at - time.monotonic())
+        assert delays[1] > app.SHEET_FLUSH_INTERVAL * 2 ** 2 * 0.5 - 0.1
+        assert max(delays) <= app.SHEET_FLUSH_MAX_BACKOFF
+        assert queue.stats()["failures"] == 13 and queue.stats()["depth"] == 2
+        
+        # A refresh landing between the append and the spool delete sees each row once
+        sheet.down = False
+        sheet.release.clear()
+        flusher = threading.Thread(target=queue.flush_once)
+        flusher.start()
+        assert sheet.appended.wait(5)
+        refreshed = []
+        reader = threading.Thread(target=lambda: refreshed.append(app.get_sheet_rows(force_refresh=True)))
+        reader.start()
+        time.sleep(0.2)
+        sheet.release.set()
+        flusher.join(5)
+        reader.join(5)
+        assert len(refreshed[0]) == 5
+        assert queue.depth() == 0 and len(sheet.grid) == 6
+        assert len(app.get_sheet_rows()) == 5 and not app.has_local_rows()
+        assert queue.flush_once() == 0
+        
+        # A row spooled after find_row's drain has no sheet position to update yet
+        queue.drain = lambda: None
+        app.stats_storage.log_rows([['2025-06-08 10:00:00', '2025-06-08', 'South', '90'] + [''] * 17])
+        assert app.stats_storage.find_row('south', '2025-06-08') is None
+        assert app.stats_storage.find_row('south', '2025-06-01') == 0
+    finally:
+        app.sheet, app.stats_storage, app.sheet_write_queue, app.shared_snapshot, cache = saved
+        app._sheet_rows_cache.update(cache)
+
+def test_shared_snapshot():
+    """Workers share the snapshot file without holding its lock across reads of the storage"""
+    import tempfile
+    
+    def row(i):
+        return {'Timestamp': '2025-06-01 10:00:00', 'Date': '2025-06-01', 'Campus': 'South', 'Total Attendance': 100 + i}
+    
+    path = os.path.join(tempfile.mkdtemp(), 'snapshot.json')
+    stored = [row(i) for i in range(2500)]
+    reads = []
+    
+    def read_rows():
+        # Other workers can still take the snapshot lock while the storage is read
+        with app.FileLock(f"{path}.lock", blocking=False) as lock:
+            assert lock.acquired
+        reads.append(1)
+        return list(stored)
+    
+    refresher, reader = app.SharedSnapshot(path), app.SharedSnapshot(path)
+    rows = refresher.refresh(read_rows)
+    assert rows == stored and len(reads) == 1 and refresher.version == 1
+    assert rows[1234] == stored[1234] and rows[-1] == stored[-1] and rows[10:13] == stored[10:13]
+    
+    # Another worker serves the file and the columns mapped from the binary snapshot
+    loaded = reader.refresh(read_rows)
+    assert loaded == rows and len(reads) == 1
+    table = reader.load_table(loaded)
+    assert not table.values['Total Attendance'].flags.writeable
+    assert table.total('attendance', table.all_rows()) == sum(r['Total Attendance'] for r in stored)
+    extended = loaded + [row(9999)]
+    assert len(extended) == 2501 and extended[:2500] == loaded and extended[-1] == row(9999)
+    
+    # Re-reading the same rows keeps the snapshot and its version
+    snapshot_id = refresher.snapshot_id
+    refresher.expire()
+    assert refresher.refresh(read_rows, force=True) is None
+    assert len(reads) == 2 and refresher.snapshot_id == snapshot_id and refresher.version == 1
+    assert reader.refresh(read_rows) is None and not reader.changed()
+    
+    # While one worker reads the storage the others keep what they have
+    stored.append(row(2500))
+    refresher.expire()
+    with app.FileLock(f"{path}.refresh.lock"):
+        assert reader.refresh(read_rows) is None
+        assert reader.changed() and len(reads) == 2
+    rows = reader.refresh(read_rows)
+    assert len(rows) == 2501 and reader.version == 2 and len(reads) == 3
+    assert refresher.refresh(read_rows) == rows and not refresher.changed()
+
 if __name__ == "__main__":
-    test_cross_location_detection() 
\ No newline at end of file
+    test_cross_location_detection()
+    test_rollup_period_edges()
+    test_role_permission_defaults()
+    test_utterance_parse()
+    test_sheet_delta_reader() 
+    test_failed_audio_generation()
+    test_sheet_write_queue()
+    test_shared_snapshot()